@@ -1,21 +1,28 @@
 import tkinter as tk
-from tkinter import scrolledtext, messagebox, filedialog
-from datetime import datetime, timedelta
-import threading
+from tkinter import messagebox, filedialog
+from datetime import date, datetime, timedelta
 import os
-import json
 import ttkbootstrap as ttk
-from PIL import Image, ImageTk
 import webbrowser
-import pystray
-from pystray import MenuItem as item
+import atexit
+import shutil
 import sys
-import winshell
-from win32com.client import Dispatch
-from win10toast import ToastNotifier
-import pygame
 import tkinter.font as tkfont
 from pathlib import Path
+from waterreminder.assets import ImageAssets
+from waterreminder.backends import Backends
+from waterreminder.i18n import Catalogs
+from waterreminder.intake_log import format_log_line, open_log_store
+from waterreminder.settings import SettingsStore
+from waterreminder.sound import SoundPlayer
+from waterreminder.view_model import ViewModel
+from waterreminder.notifications import (
+    ConsoleSink, NotificationDispatcher, NotifierSink, SoundSink, WebhookSink
+)
+from waterreminder.metrics import MetricsExporter, ProfilerControl, metrics
+from waterreminder.scheduler import ReminderScheduler, tk_timer
+from waterreminder.timetable import Timetable
+from waterreminder.ui_bridge import UiBridge
 
 # ---------- Paths and sound setup ----------
 
@@ -31,8 +38,6 @@ os.makedirs(SOUND_DIR, exist_ok=True)
 
 log_file = os.path.join(BASE_DIR, "water_intake_log.txt")
 
-pygame.mixer.init()
-
 # ---------- User settings ----------
 
 default_settings = {
@@ -43,25 +48,38 @@ default_settings = {
     "reminder_amount": 0.25,  # in liters
     "start_with_windows": False,
     "sound_file": "cute-gugu-gaga.mp3",
-    "default_language": "en"
+    "default_language": "en",
+    "log_storage": "jsonl",  # "jsonl", "segmented" (one file per day), "binary" or "sqlite"
+    "log_durability": "buffered",  # JSONL only: "buffered", "group" or "fsync"
+    "log_retention_days": 0,  # JSONL only: archive days older than this; 0 = keep all raw
+    "log_archive_compression": "gzip",  # or "zstd" (needs zstandard)
+    "metrics_file": "",  # e.g. "metrics.json" or "metrics.prom"; empty = off
+    "metrics_interval": 60,  # seconds between metrics file writes
+    "reminder_windows": [],  # e.g. ["07:00-12:00", "22:00-06:00"]; empty = start_time-end_time
+    "notification_sinks": ["toast", "sound"],  # also "console", "webhook"
+    "notification_dedup_window": 60,  # seconds; same reminder is never shown twice within it
+    "notification_webhook_url": ""
 }
 
-settings_file = "settings.json"
-if os.path.exists(settings_file):
-    with open(settings_file, "r") as f:
-        user_settings = json.load(f)
-else:
-    user_settings = default_settings.copy()
-
-for k, v in default_settings.items():
-    user_settings.setdefault(k, v)
+settings_file = os.path.join(BASE_DIR, "settings.json")
+# Older versions saved it in the working directory, wherever the app was started from
+legacy_settings_file = os.path.abspath("settings.json")
+if not os.path.exists(settings_file) and os.path.exists(legacy_settings_file):
+    shutil.copyfile(legacy_settings_file, settings_file)
 
-log_file = os.path.join(BASE_DIR, "water_intake_log.txt")
+# Settings the reminder timetable is built from
+SCHEDULE_SETTINGS = ("start_time", "end_time", "interval", "reminder_windows")
 
+# Validated and parsed once; changes are saved atomically after a short delay
+user_settings = SettingsStore(settings_file, default_settings)
+atexit.register(user_settings.close)
 
-def save_user_settings():
-    with open(settings_file, "w") as f:
-        json.dump(user_settings, f)
+log_file = os.path.join(BASE_DIR, "water_intake_log.txt")
+log_store = open_log_store(
+    user_settings["log_storage"], BASE_DIR, user_settings["log_durability"],
+    retention_days=user_settings["log_retention_days"],
+    archive_compression=user_settings["log_archive_compression"]
+)
 
 # ---------- Language Settings ----------
 
@@ -70,7 +88,8 @@ import locale
 LOCALES_DIR = os.path.join(BASE_DIR, "locales")
 
 current_lang = user_settings.get("default_language", "en-US")
-translations = {}
+catalogs = Catalogs(LOCALES_DIR)
+translations = None  # Catalog of the current language
 
 LANG_FILES = {
     "en-US": "en-US.json",
@@ -97,26 +116,13 @@ DISPLAY_TO_CODE = {
 CODE_TO_DISPLAY = {v: k for k, v in DISPLAY_TO_CODE.items()}
 
 def load_language(lang_code):
+    # Catalogs are parsed once and cached, so switching back is free
     global current_lang, translations
-    lang_file = os.path.join(LOCALES_DIR, f"{lang_code}.json")
-    if not os.path.exists(lang_file):
-        lang_file = os.path.join(LOCALES_DIR, "en-US.json")
-        lang_code = "en-US"
-
-    with open(lang_file, "r", encoding="utf-8") as f:
-        translations = json.load(f)
-
-    current_lang = lang_code
+    translations = catalogs.get(lang_code)
+    current_lang = translations.code
 
 def _(key, **kwargs):
-    text = translations.get(key, key)
-    if kwargs:
-        try:
-            text = text.format(**kwargs)
-        except KeyError:
-            # ignore missing params
-            pass
-    return text
+    return translations.gettext(key, kwargs)
     
 load_language(user_settings.get("default_language", "en-US"))
 # ---------- Start with Windows ----------
@@ -129,29 +135,151 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
-def add_to_startup():
-    startup = winshell.startup()
+# Notifications, sound, tray and autostart load their modules on first use
+backends = Backends(tray_icon_path=resource_path("Icon.png"))
+
+# Images are decoded once per process; resized variants are cached on disk
+IMAGE_CACHE_DIR = os.path.join(BASE_DIR, "cache", "images")
+assets = ImageAssets(IMAGE_CACHE_DIR, tk.PhotoImage)
+
 
+# Per-sink rate limits: (notifications per minute, burst)
+NOTIFICATION_RATE_LIMITS = {
+    "toast": (4, 2),
+    "sound": (4, 2),
+    "console": (None, 1),
+    "webhook": (10, 3),
+}
+
+
+def build_notification_dispatcher(sound_player):
+    dispatcher = NotificationDispatcher(dedup_window=user_settings["notification_dedup_window"])
+    for name in user_settings["notification_sinks"]:
+        if name == "toast":
+            sink = NotifierSink(lambda: backends.notifier)
+        elif name == "sound":
+            sink = SoundSink(sound_player)
+        elif name == "console":
+            sink = ConsoleSink()
+        elif name == "webhook" and user_settings["notification_webhook_url"]:
+            sink = WebhookSink(user_settings["notification_webhook_url"])
+        else:
+            print(f"Ignoring unknown or unconfigured notification sink {name!r}", file=sys.stderr)
+            continue
+        per_minute, burst = NOTIFICATION_RATE_LIMITS[name]
+        dispatcher.add_sink(sink, per_minute, burst)
+    return dispatcher
+
+
+def add_to_startup():
     if getattr(sys, "frozen", False):
         exe_path = sys.executable
     else:
         exe_path = os.path.abspath(__file__)
-    
-    shortcut_path = os.path.join(startup, "WaterReminder.lnk")
 
-    shell = Dispatch("WScript.Shell")
-    shortcut = shell.CreateShortCut(shortcut_path)
-    shortcut.Targetpath = exe_path
-    shortcut.WorkingDirectory = os.path.dirname(exe_path)
-    shortcut.IconLocation = exe_path
-    shortcut.save()
+    backends.autostart.enable(exe_path)
 
 
 def remove_from_startup():
-    startup = winshell.startup()
-    shortcut_path = os.path.join(startup, "WaterReminder.lnk")
-    if os.path.exists(shortcut_path):
-        os.remove(shortcut_path)
+    backends.autostart.disable()
+
+
+# ---------- Virtual log view ----------
+
+class VirtualLogView(tk.Frame):
+    """Log pane that only formats and draws the rows currently on screen.
+
+    Rows come from a line source (see waterreminder.log_index) that maps a
+    row number to its bytes on disk, so scrolling through a million-entry
+    log costs the same as scrolling through fifty.
+    """
+
+    def __init__(self, master, source, format_line, width=60, height=10):
+        super().__init__(master)
+        self.source = source
+        self.format_line = format_line
+        self.top = 0
+        self.visible_rows = height
+        self.formatted = {}  # row -> text, only for the rows on screen
+
+        self.text = tk.Text(self, wrap=tk.NONE, width=width, height=height)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scrollbar)
+        # Rows are not wrapped (one log line per row), so long lines scroll sideways
+        self.xscrollbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.text.xview)
+        self.text.configure(xscrollcommand=self.xscrollbar.set)
+        self.text.grid(row=0, column=0, sticky=tk.NSEW)
+        self.scrollbar.grid(row=0, column=1, sticky=tk.NS)
+        self.xscrollbar.grid(row=1, column=0, sticky=tk.EW)
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self.text.configure(state=tk.DISABLED)
+
+        self.text.bind("<Configure>", self.on_resize)
+        self.text.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.text.bind("<Button-4>", lambda event: self.scroll_rows(-3))
+        self.text.bind("<Button-5>", lambda event: self.scroll_rows(3))
+
+    def refresh(self, rebuild=False):
+        # Stick to the bottom when new rows arrive while it is in view
+        old_total = len(self.source)
+        at_bottom = self.top + self.visible_rows >= old_total
+        restarted = self.source.refresh()
+        if rebuild or restarted:
+            self.formatted.clear()
+        if restarted:
+            self.top = 0
+        if at_bottom:
+            self.top = len(self.source) - self.visible_rows
+        self.render()
+
+    def render(self):
+        total = len(self.source)
+        self.top = max(0, min(self.top, total - self.visible_rows))
+        stop = min(total, self.top + self.visible_rows)
+
+        formatted = {}
+        rows_out = []
+        for row, line in enumerate(self.source.lines(self.top, stop), self.top):
+            text = self.formatted.get(row)
+            if text is None:
+                text = self.format_line(line) or ""
+            formatted[row] = text
+            rows_out.append(text)
+        self.formatted = formatted
+
+        left = self.text.xview()[0]  # keep the sideways scroll position across redraws
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, "\n".join(rows_out))
+        self.text.configure(state=tk.DISABLED)
+        self.text.xview_moveto(left)
+
+        if total:
+            self.scrollbar.set(self.top / total, stop / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_rows(self, delta):
+        self.top += delta
+        self.render()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.top = int(float(amount) * len(self.source))
+            self.render()
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_rows(int(amount) * step)
+
+    def on_mouse_wheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+
+    def on_resize(self, event):
+        linespace = tkfont.Font(font=self.text["font"]).metrics("linespace")
+        rows = max(1, event.height // max(1, linespace))
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.render()
 
 
 # ---------- Main App Class ----------
@@ -162,7 +290,7 @@ class WaterReminderApp:
         self.root.title("Water Reminder")
 
         # Add app icon
-        self.root.iconphoto(False, tk.PhotoImage(file=resource_path("Icon.png")))
+        self.root.iconphoto(False, assets.photo(resource_path("Icon.png")))
 
         # Set minimum size
         self.root.minsize(500, 800)
@@ -183,42 +311,76 @@ class WaterReminderApp:
             self.root.grid_rowconfigure(r, weight=1)
 
         # Logo
-        self.logo_image = Image.open(resource_path("logo.png"))
-        self.logo_image = self.logo_image.resize((300, 150), Image.Resampling.LANCZOS)
-        self.logo_photo = ImageTk.PhotoImage(self.logo_image)
+        self.logo_photo = assets.photo(resource_path("logo.png"), (300, 150))
         self.logo_label = tk.Label(root, image=self.logo_photo)
         self.logo_label.grid(row=0, column=0, padx=10, pady=10, columnspan=4)
 
         # State
-        self.total_water_drank = 0.0
-        self.daily_goal = user_settings["daily_goal"]
+        self.daily_goal = user_settings.value("daily_goal")
         self.next_reminder_time = None
-        self.last_drink_time = datetime.now()
+        # Pick up today's progress after a restart (or a reboot with autostart)
+        total, _count, last_drink = log_store.day_progress(date.today().isoformat())
+        self.total_water_drank = total
+        self.last_drink_time = datetime.fromisoformat(last_drink) if last_drink else datetime.now()
+        call_later, cancel_call = tk_timer(self.root)
+        self.scheduler = ReminderScheduler(
+            call_later=call_later, cancel_call=cancel_call, on_clock_jump=self.on_clock_jump
+        )
+        self.countdown_tick_ms = 1000
+        self.countdown_after_id = None
+        # While hidden: no display ticks, one timer per reminder (capped, see on_clock_jump)
+        self.idle = False
+        self.idle_max_timer = 30 * 60
+        self.apply_schedule_settings()
+
+        # Audio worker; started by warm() once the window is up, or by the first reminder
+        self.sound_player = SoundPlayer(
+            lambda: backends.sound, SOUND_DIR, user_settings.get("sound_file")
+        )
+        self.notifications = build_notification_dispatcher(self.sound_player)
+
+        # Commands from the tray thread reach Tk only through this queue
+        self.bridge = UiBridge(self.root)
 
         # Build UI
         self.create_widgets()
-        self.update_water_drank_label()
-        self.update_remaining_label()
-        self.display_log_messages()
-
-        # Close handler
+        self.view = ViewModel(self.root.after_idle)
+        self._log_rebuild_pending = False
+        self.bind_view()
+        self.view.flush()
+
+        # Each part recomputes only when a setting it depends on changed
+        user_settings.subscribe(self.on_schedule_settings_changed, SCHEDULE_SETTINGS)
+        user_settings.subscribe(self.on_goal_changed, ["daily_goal"])
+        user_settings.subscribe(self.on_language_setting_changed, ["default_language"])
+        user_settings.subscribe(self.on_sound_setting_changed, ["sound_file"])
+
+        # Close handler; withdrawing or minimizing the window switches to idle mode
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
-
-        # System Tray Icon
-        self.tray_icon = pystray.Icon("WaterReminderApp")
-        self.tray_image = Image.open(resource_path("Icon.png"))
-        self.tray_icon.icon = self.tray_image
-        self.tray_icon.menu = pystray.Menu(
-            item('Open', self.show_window),
-            item('Quit', self.on_closing_tray)
-        )
-
-        # Windows Notification
-        self.notifier = ToastNotifier()
+        self.root.bind("<Unmap>", self.on_unmap)
+        self.root.bind("<Map>", self.on_map)
 
         # Start reminder logic
         self.schedule_initial_reminder()
 
+        # Load the other languages once the window is up; switching is then I/O free
+        self.root.after(1000, catalogs.preload)
+        # Same for decoding the reminder sound (pygame import + MP3 decode)
+        self.root.after(2000, self.sound_player.warm)
+
+        # Metrics export and profiling are opt-in
+        self.profiler = ProfilerControl(BASE_DIR)
+        if os.environ.get("WATER_REMINDER_PROFILE"):
+            self.profiler.start()
+            atexit.register(self.profiler.stop)
+        metrics_file = os.environ.get("WATER_REMINDER_METRICS") or user_settings["metrics_file"]
+        if metrics_file:
+            self.metrics_exporter = MetricsExporter(
+                os.path.join(BASE_DIR, metrics_file), user_settings["metrics_interval"]
+            )
+            self.metrics_exporter.start()
+            atexit.register(self.metrics_exporter.stop)
+
     # ---------- UI ----------
 
     def create_widgets(self):
@@ -390,10 +552,10 @@ class WaterReminderApp:
         self.log_label.grid(
             row=13, column=0, columnspan=3, sticky=tk.W, padx=10
         )
-        self.log_text = scrolledtext.ScrolledText(
-            self.root, wrap=tk.WORD, width=60, height=10
+        self.log_view = VirtualLogView(
+            self.root, log_store.line_source(), lambda line: format_log_line(line, _)
         )
-        self.log_text.grid(row=14, column=0, columnspan=3, padx=10, pady=5, sticky=tk.NSEW)
+        self.log_view.grid(row=14, column=0, columnspan=3, padx=10, pady=5, sticky=tk.NSEW)
 
         # --- Social / links ---
         self.social_frame = tk.Frame(self.root)
@@ -437,21 +599,62 @@ class WaterReminderApp:
 
     # ---------- UI helpers ----------
 
+    def bind_view(self):
+        # Widget texts are rendered from state here; changes only mark
+        # fields dirty and one after_idle flush applies them.
+        static_labels = [
+            ("language", self.language_label),
+            ("start_time", self.start_time_label),
+            ("end_time", self.end_time_label),
+            ("interval", self.interval_label),
+            ("daily_goal", self.daily_goal_label),
+            ("reminder_amount", self.reminder_amount_label),
+            ("alert_sound", self.alert_sound_label),
+            ("browse_sound", self.browse_sound_button),
+            ("start_with_windows", self.start_with_windows_label),
+            ("log_messages", self.log_label),
+            ("github", self.github_icon),
+            ("website", self.website_icon),
+            ("giwish", self.giwish_icon),
+            ("hsr", self.hsr_icon),
+            ("save_settings", self.save_button),
+            ("drink_water", self.drink_water_button),
+            ("clear_logs", self.clear_logs_button),
+        ]
+        for key, widget in static_labels:
+            self.view.bind(key, widget, lambda key=key: _(key))
+
+        self.view.bind(
+            "water_drank", self.water_drank_label,
+            lambda: _("water_drank", amount=self.total_water_drank)
+        )
+        self.view.bind(
+            "remaining", self.remaining_label,
+            lambda: _("remaining", amount=self.daily_goal - self.total_water_drank)
+        )
+        self.view.bind("countdown", self.countdown_label, self.countdown_text)
+        self.view.bind_action("log", self.flush_log)
+
     def update_water_drank_label(self):
-        self.water_drank_label.config(
-            text=_("water_drank", amount=self.total_water_drank)
-        )
+        self.view.invalidate("water_drank")
 
     def update_remaining_label(self):
-        remaining = self.daily_goal - self.total_water_drank
-        self.remaining_label.config(
-            text=_("remaining", amount=remaining)
-        )
+        self.view.invalidate("remaining")
+
+    def refresh_log(self, rebuild=False):
+        if rebuild:
+            self._log_rebuild_pending = True
+        self.view.invalidate("log")
+
+    def flush_log(self):
+        rebuild = self._log_rebuild_pending
+        self._log_rebuild_pending = False
+        self.display_log_messages(rebuild=rebuild)
 
     def show_settings_saved_dialog(self):
         dialog = tk.Toplevel(self.root)
         dialog.title("Settings Saved")
-        dialog.iconphoto(False, tk.PhotoImage(file=resource_path("Icon.png")))
+        dialog.iconphoto(False, assets.photo(resource_path("Icon.png")))
         dialog.resizable(False, False)
         dialog.grab_set()
 
@@ -478,46 +681,31 @@ class WaterReminderApp:
     
     def on_language_changed(self, event=None):
         display_name = self.language_display_var.get()
-        new_lang = DISPLAY_TO_CODE.get(display_name, "en-US")
+        user_settings["default_language"] = DISPLAY_TO_CODE.get(display_name, "en-US")
 
-        user_settings["default_language"] = new_lang
-        save_user_settings()
-        load_language(new_lang)
+    def on_language_setting_changed(self, changed):
+        load_language(user_settings.value("default_language"))
         self.update_ui_language()
 
     def update_ui_language(self):
-        # Static labels
-        self.language_label.config(text=_("language"))
-        self.start_time_label.config(text=_("start_time"))
-        self.end_time_label.config(text=_("end_time"))
-        self.interval_label.config(text=_("interval"))
-        self.daily_goal_label.config(text=_("daily_goal"))
-        self.reminder_amount_label.config(text=_("reminder_amount"))
-        self.alert_sound_label.config(text=_("alert_sound"))
-        self.browse_sound_button.config(text=_("browse_sound"))
-        self.start_with_windows_label.config(text=_("start_with_windows"))
-        self.log_label.config(text=_("log_messages"))
-        self.github_icon.config(text=_("github"))
-        self.website_icon.config(text=_("website"))
-        self.giwish_icon.config(text=_("giwish"))
-        self.hsr_icon.config(text=_("hsr"))
-        self.save_button.config(text=_("save_settings"))
-        self.drink_water_button.config(text=_("drink_water"))
-        self.clear_logs_button.config(text=_("clear_logs"))
-
-        # Dynamic labels
-        self.update_water_drank_label()
-        self.update_remaining_label()
-        self.display_log_messages()
+        # Every bound text depends on the language; the log is re-rendered too
+        self._log_rebuild_pending = True
+        self.view.invalidate_all()
 
     def save_settings(self):
-        user_settings["start_time"] = self.start_time_entry.get()
-        user_settings["end_time"] = self.end_time_entry.get()
-        user_settings["interval"] = max(1, int(self.interval_entry.get()))
-        user_settings["daily_goal"] = float(self.daily_goal_entry.get())
-        user_settings["reminder_amount"] = float(self.reminder_amount_entry.get())
-        user_settings["start_with_windows"] = self.start_with_windows_var.get()
-        save_user_settings()
+        # Validated all at once; subscribers reschedule / redraw what changed
+        try:
+            user_settings.update(
+                start_time=self.start_time_entry.get(),
+                end_time=self.end_time_entry.get(),
+                interval=self.interval_entry.get(),
+                daily_goal=self.daily_goal_entry.get(),
+                reminder_amount=self.reminder_amount_entry.get(),
+                start_with_windows=self.start_with_windows_var.get()
+            )
+        except ValueError as e:
+            messagebox.showerror("Invalid settings", str(e))
+            return
 
         self.show_settings_saved_dialog()
 
@@ -527,148 +715,169 @@ class WaterReminderApp:
             remove_from_startup()
 
     def drink_water_action(self):
-        amount = float(self.reminder_amount_entry.get())
-        self.total_water_drank += amount
+        try:
+            amount = float(self.reminder_amount_entry.get())
+        except ValueError:
+            messagebox.showerror("Invalid amount", f"{self.reminder_amount_entry.get()!r} is not a number")
+            return
 
         entry = {
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "type": "drink",
             "amount": amount
         }
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        # Logged first, so a failed write never leaves the total ahead of the log
+        try:
+            with metrics.timer("log_write"):
+                log_store.append(entry)
+        except OSError as e:
+            self.on_log_error(e)
+            return
+        self.total_water_drank += amount
 
-        self.update_water_drank_label()
-        self.update_remaining_label()
-        self.display_log_messages()
+        self.view.invalidate("water_drank", "remaining", "log")
         self.reset_timer_from_now()
 
     def clear_logs_action(self):
-        open(log_file, 'w').close()
-        self.display_log_messages()
-
-    def display_log_messages(self):
-        self.log_text.delete('1.0', tk.END)
-        if not os.path.exists(log_file):
-            return
+        log_store.clear()
+        self.refresh_log(rebuild=True)
 
-        lines_out = []
-        with open(log_file, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-
-                try:
-                    entry = json.loads(line)
-                except json.JSONDecodeError:
-                    lines_out.append(line)
-                    continue
+    def display_log_messages(self, rebuild=False):
+        try:
+            with metrics.timer("log_render"):
+                self.log_view.refresh(rebuild)
+        except OSError as e:
+            self.on_log_error(e)
 
-                if entry.get("type") == "drink":
-                    ts = entry.get("timestamp", "")
-                    amount = entry.get("amount", 0)
+    def on_log_error(self, error):
+        # A background write may have failed earlier: go back to what the log really holds
+        self.total_water_drank = log_store.day_progress(date.today().isoformat())[0]
+        self.view.invalidate("water_drank", "remaining")
+        messagebox.showerror("Log error", f"A drink could not be logged: {error}")
 
-                    text = _("log_drink", time=ts, amount=amount)
-                    lines_out.append(text)
-                else:
-                    lines_out.append(line)
+    # ---------- Timer / reminder logic ----------
 
-        if lines_out:
-            self.log_text.insert(tk.END, "\n".join(lines_out) + "\n")
+    def apply_schedule_settings(self):
+        # Built from the parsed settings once per change, not on every tick
+        windows = user_settings.value("reminder_windows") or [
+            (user_settings.value("start_time"), user_settings.value("end_time"))
+        ]
+        self.timetable = Timetable(windows, timedelta(minutes=user_settings.value("interval")))
+        self.interval = self.timetable.interval
+
+    def on_schedule_settings_changed(self, changed):
+        self.apply_schedule_settings()
+        self.schedule_next_reminder()
+        self.update_countdown_label()
 
-    # ---------- Timer / reminder logic ----------
+    def on_goal_changed(self, changed):
+        self.daily_goal = user_settings.value("daily_goal")
+        self.update_remaining_label()
 
     def schedule_initial_reminder(self):
-        self.reset_timer_from_now()
-        self.update_countdown_label()
+        # Counts from the restored last drink, so a restart doesn't add a full interval
+        self.schedule_next_reminder()
+        self.start_countdown_display()
 
     def reset_timer_from_now(self):
         self.last_drink_time = datetime.now()
+        self.schedule_next_reminder()
 
-        start_time = datetime.strptime(user_settings["start_time"], "%H:%M").time()
-        end_time = datetime.strptime(user_settings["end_time"], "%H:%M").time()
-        interval_minutes = max(1, int(user_settings["interval"]))
-        interval = timedelta(minutes=interval_minutes)
-
-        next_reminder_time = (self.last_drink_time + interval).replace(second=0, microsecond=0)
+    def schedule_next_reminder(self):
+        # Out-of-hours deadlines are pushed to the first slot of the next window
+        self.next_reminder_time = self.timetable.next_reminder(
+            self.last_drink_time + self.interval
+        )
 
-        if start_time <= next_reminder_time.time() <= end_time:
-            self.next_reminder_time = next_reminder_time
+        if self.next_reminder_time is None:
+            self.scheduler.cancel("reminder")
         else:
-            self.next_reminder_time = None
-
-    def update_countdown_label(self):
-        now = datetime.now()
-        interval_minutes = max(1, int(user_settings["interval"]))
-        interval = timedelta(minutes=interval_minutes)
+            self.scheduler.schedule(
+                "reminder", self.next_reminder_time, self.on_reminder_due
+            )
+
+    def on_reminder_due(self, deadline):
+        metrics.observe("reminder_jitter", (datetime.now() - deadline).total_seconds())
+        metrics.inc("reminders_fired")
+        self.send_reminder(deadline)
+        self.last_drink_time = datetime.now()
+        self.schedule_next_reminder()
+        self.update_countdown_label()
 
-        elapsed = now - self.last_drink_time
+    # The countdown label has its own display tick, separate from the
+    # reminder deadline, so it can be slowed down or stopped entirely.
 
-        if elapsed >= interval:
-            self.send_reminder()
-            self.last_drink_time = datetime.now()
-            remaining = interval
-        else:
-            remaining = interval - elapsed
+    def start_countdown_display(self, tick_ms=None):
+        if tick_ms is not None:
+            self.countdown_tick_ms = tick_ms
+        self.stop_countdown_display()
+        self.countdown_tick()
 
-        total_seconds = int(remaining.total_seconds())
-        minutes, seconds = divmod(total_seconds, 60)
-        self.countdown_label.config(
-            text=_("next_reminder_in", mm=f"{minutes:02d}", ss=f"{seconds:02d}")
-        )
+    def stop_countdown_display(self):
+        if self.countdown_after_id is not None:
+            self.root.after_cancel(self.countdown_after_id)
+            self.countdown_after_id = None
 
-        self.root.after(1000, self.update_countdown_label)
+    def countdown_tick(self):
+        metrics.inc("countdown_ticks")
+        self.update_countdown_label()
+        self.countdown_after_id = self.root.after(self.countdown_tick_ms, self.countdown_tick)
 
-    def send_reminder(self):
-        start_time = datetime.strptime(user_settings["start_time"], "%H:%M").time()
-        end_time = datetime.strptime(user_settings["end_time"], "%H:%M").time()
+    def update_countdown_label(self):
+        self.view.invalidate("countdown")
 
-        self.show_reminder_messagebox()
+    def countdown_text(self):
+        remaining = self.scheduler.seconds_until_next()
+        if remaining is None:
+            return _("next_reminder_in_raw", value="--:--")
+        minutes, seconds = divmod(int(remaining), 60)
+        return _("next_reminder_in", mm=f"{minutes:02d}", ss=f"{seconds:02d}")
 
-        now = datetime.now()
+    # ---------- Idle mode ----------
 
-        interval_minutes = max(1, int(user_settings["interval"]))
-        interval = timedelta(minutes=interval_minutes)
+    def on_unmap(self, event):
+        if event.widget is self.root:
+            self.enter_idle()
 
-        next_reminder_time = (now + interval).replace(second=0, microsecond=0)
+    def on_map(self, event):
+        if event.widget is self.root:
+            self.exit_idle()
 
-        if start_time <= next_reminder_time.time() <= end_time:
-            self.next_reminder_time = next_reminder_time
-        else:
-            self.next_reminder_time = None
-            
-        self.show_reminder_messagebox()
+    def enter_idle(self):
+        if self.idle:
+            return
+        self.idle = True
+        metrics.inc("idle_entered")
+        self.stop_countdown_display()
+        self.scheduler.max_timer = self.idle_max_timer
+        self.scheduler.resync()
+
+    def exit_idle(self):
+        if not self.idle:
+            return
+        self.idle = False
+        self.scheduler.max_timer = None
+        # The clock may have jumped while hidden (sleep/resume); fire anything
+        # overdue, then recompute the deadline and the countdown from now.
+        self.scheduler.resync()
+        self.schedule_next_reminder()
+        self.start_countdown_display()
+
+    def on_clock_jump(self, seconds):
+        metrics.inc("clock_jumps")
+        if not self.idle:
+            self.update_countdown_label()
 
     # ---------- Notification / sound ----------
 
-    def show_reminder_messagebox(self):
-        self.notifier.show_toast(
+    def send_reminder(self, deadline):
+        # Keyed by the scheduled deadline: one reminder, one notification per sink
+        self.notifications.submit(
+            f"reminder {deadline:%Y-%m-%d %H:%M:%S}",
             "Water Reminder",
             "Time to drink water!",
-            icon_path=resource_path("Icon.ico"),
-            duration=5,
-            threaded=True
-        )
-
-        def play_sound_with_fallback():
-            preferred = user_settings.get("sound_file") or "cute-gugu-gaga.mp3"
-            candidates = [preferred]
-            if "cute-gugu-gaga.mp3" not in candidates:
-                candidates.append("cute-gugu-gaga.mp3")
-
-            for name in candidates:
-                path = os.path.join(SOUND_DIR, name)
-                if os.path.exists(path):
-                    try:
-                        pygame.mixer.music.stop()
-                        pygame.mixer.music.load(path)
-                        pygame.mixer.music.play()
-                        return
-                    except Exception:
-                        continue
-
-        threading.Thread(target=play_sound_with_fallback, daemon=True).start()
+            icon_path=resource_path("Icon.ico")
+        )
 
     # ---------- Misc ----------
 
@@ -682,19 +891,43 @@ class WaterReminderApp:
         ):
             self.hide_window()
         else:
-            self.root.destroy()
+            self.shutdown()
 
     def hide_window(self):
+        tray = backends.tray
+        if not tray.available:
+            self.root.iconify()
+            return
         self.root.withdraw()
-        self.tray_icon.run()
-
-    def show_window(self, icon, item):
+        # The tray runs on its own thread; its menu only posts to the bridge,
+        # so Tk keeps running reminders while the window is hidden.
+        self.bridge.start()
+        tray.start([
+            ("Open", self.bridge.command(self.show_window)),
+            ("Start/stop profiling", self.bridge.command(self.toggle_profiling)),
+            ("Quit", self.bridge.command(self.on_closing_tray))
+        ])
+
+    def show_window(self):
+        self.bridge.stop()
+        backends.tray.stop()
         self.root.deiconify()
-        self.tray_icon.stop()
 
-    def on_closing_tray(self, icon, item):
+    def toggle_profiling(self):
+        path = self.profiler.toggle()
+        if path:
+            self.notifications.submit(f"profile {path}", "Water Reminder", f"Profile saved to {path}")
+
+    def on_closing_tray(self):
+        self.bridge.close()
+        backends.tray.stop()
+        self.shutdown()
+
+    def shutdown(self):
+        # Stop the notification and audio workers before Tk goes away
+        self.notifications.close()
+        self.sound_player.close()
         self.root.destroy()
-        self.tray_icon.stop()
 
     def choose_sound_file(self):
         file_path = filedialog.askopenfilename(
@@ -710,7 +943,6 @@ class WaterReminderApp:
 
         if os.path.abspath(file_path) != os.path.abspath(target_path):
             try:
-                import shutil
                 shutil.copy2(file_path, target_path)
             except Exception as e:
                 messagebox.showerror(
@@ -720,16 +952,26 @@ class WaterReminderApp:
                 return
 
         user_settings["sound_file"] = filename
-        self.sound_label.config(text=filename)
-        save_user_settings()
+        # Always re-select: the copy may have replaced a file of the same name,
+        # which leaves the setting unchanged but the decoded cache stale
+        self.sound_player.select(filename)
+
+    def on_sound_setting_changed(self, changed):
+        filename = user_settings.value("sound_file")
+        self.sound_label.config(text=filename or "Default / None")
 
 # ---------- Main ----------
 
-if __name__ == "__main__":
+def create_window():
+    """Build the themed root window and the app in it; the caller runs mainloop()."""
     root = ttk.Window(themename="cosmo")
     font_path = Path(BASE_DIR) / "fonts" / "NotoSans-Regular.ttf"
     default_font = tkfont.nametofont("TkDefaultFont")
     default_font.configure(family="Noto Sans", size=9)
     root.option_add("*Font", default_font)
-    app = WaterReminderApp(root)
-    root.mainloop()
\ No newline at end of file
+    return root, WaterReminderApp(root)
+
+
+if __name__ == "__main__":
+    root, app = create_window()
+    root.mainloop()
@@ -0,0 +1,78 @@
+"""Hydration analytics on large, multi-user histories.
+
+Generates N synthetic drinks spread over several years and users, then
+times the initial load, every aggregate for every user, and an
+incremental append of one new drink followed by a re-query.
+
+    python benchmarks/bench_analytics.py [--entries 2000000] [--users 50]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from waterreminder.analytics import IntakeAnalytics
+
+
+def synthetic_entries(count, users):
+    start = datetime(2020, 1, 1, 8, 0, 0)
+    step = timedelta(minutes=15)
+    for i in range(count):
+        yield {
+            "timestamp": (start + step * (i // users)).strftime("%Y-%m-%d %H:%M:%S"),
+            "type": "drink",
+            "amount": 0.25,
+            "user": f"user{i % users}"
+        }
+
+
+def query_all(analytics):
+    for user in analytics.user_codes:
+        analytics.goal_attainment(user)
+        analytics.rolling_average(7, user)
+        analytics.rolling_average(30, user)
+        analytics.streaks(user)
+        analytics.hourly_heatmap(user)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=2_000_000)
+    parser.add_argument("--users", type=int, default=50)
+    args = parser.parse_args()
+
+    entries = list(synthetic_entries(args.entries, args.users))
+
+    t0 = time.perf_counter()
+    analytics = IntakeAnalytics(daily_goal=2.0)
+    analytics.append(entries)
+    load_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    query_all(analytics)
+    cold_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    query_all(analytics)
+    cached_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    analytics.append([{"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                       "type": "drink", "amount": 0.25, "user": "user0"}])
+    analytics.streaks("user0")
+    analytics.rolling_average(7, "user0")
+    append_s = time.perf_counter() - t0
+
+    days = len(analytics.daily_totals("user0")[0])
+    print(f"{args.entries} drinks, {args.users} users, {days} days each")
+    print(f"load:                     {load_s * 1e3:9.1f} ms")
+    print(f"all aggregates, cold:     {cold_s * 1e3:9.1f} ms")
+    print(f"all aggregates, cached:   {cached_s * 1e3:9.1f} ms")
+    print(f"append 1 drink + requery: {append_s * 1e3:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Startup cost of the logo: decode + LANCZOS resize vs the variant cache.
+
+    old      import PIL, open logo.png, resize to 300x150 (what startup did)
+    cold     ImageAssets.variant on an empty cache (hash + render + save)
+    warm     ImageAssets.variant on a filled cache (what startup does now)
+
+PhotoImage creation itself needs a display and is not included; with the
+cache, Tk decodes the small pre-rendered PNG instead of Pillow handing it
+a freshly resampled bitmap. Needs Pillow.
+
+    python benchmarks/bench_assets.py [--repeat 20]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from waterreminder.assets import ImageAssets
+
+LOGO = os.path.join(ROOT, "logo.png")
+SIZE = (300, 150)
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def import_pil_seconds():
+    code = "import time; t = time.perf_counter(); from PIL import Image; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    return float(out.stdout) if out.returncode == 0 else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pil_import = import_pil_seconds()
+    if pil_import is None:
+        print("Pillow is not installed; nothing to compare")
+        return 1
+    from PIL import Image
+
+    def old():
+        with Image.open(LOGO) as image:
+            image.resize(SIZE, Image.Resampling.LANCZOS).tobytes()
+
+    old_times, cold_times, warm_times = [], [], []
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        old()
+        old_times.append(time.perf_counter() - t0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            t0 = time.perf_counter()
+            ImageAssets(tmp, None).variant(LOGO, SIZE)
+            cold_times.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            variant = ImageAssets(tmp, None).variant(LOGO, SIZE)
+            warm_times.append(time.perf_counter() - t0)
+            variant_size = os.path.getsize(variant)
+
+    print(f"{'import PIL (once)':>22}: {pil_import * 1000:8.2f} ms")
+    print(f"{'old decode + resize':>22}: {median(old_times) * 1000:8.2f} ms")
+    print(f"{'cold cache (render)':>22}: {median(cold_times) * 1000:8.2f} ms")
+    print(f"{'warm cache':>22}: {median(warm_times) * 1000:8.2f} ms (no Pillow import)")
+    print(f"source {os.path.getsize(LOGO) / 1024:.0f} KB, "
+          f"cached variant {variant_size / 1024:.0f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
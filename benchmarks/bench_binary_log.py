@@ -0,0 +1,80 @@
+"""File size and full-scan time: JSONL log vs packed binary log.
+
+The JSONL scan does what readers of water_intake_log.txt do today
+(json.loads + strptime per line); the binary scan unpacks every record
+from the mmap. A one-day bisect lookup is timed too.
+
+    python benchmarks/bench_binary_log.py [--entries 1000000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_log_view import write_synthetic_log
+from waterreminder.binary_log import BinaryLog, export_jsonl, import_jsonl
+
+
+def scan_jsonl(path):
+    total = 0.0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            datetime.strptime(entry["timestamp"], "%Y-%m-%d %H:%M:%S")
+            total += entry["amount"]
+    return total
+
+
+def scan_binary(log):
+    return sum(ml for _s, _c, ml in log.records()) / 1000
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path = os.path.join(tmp, "water_intake_log.txt")
+        write_synthetic_log(jsonl_path, args.entries)
+        log = BinaryLog(os.path.join(tmp, "water_intake_log.bin"))
+        _n, import_s = timed(import_jsonl, jsonl_path, log)
+
+        jsonl_total, jsonl_s = timed(scan_jsonl, jsonl_path)
+        bin_total, bin_s = timed(scan_binary, log)
+        assert abs(jsonl_total - bin_total) < 1e-6
+
+        day = "2021-06-01"
+        day_entries, day_s = timed(lambda: list(log.iter_range(day, day)))
+
+        round_trip = os.path.join(tmp, "round_trip.txt")
+        export_jsonl(log, round_trip)
+        with open(jsonl_path, "rb") as a, open(round_trip, "rb") as b:
+            lossless = a.read() == b.read()
+
+        jsonl_size = os.path.getsize(jsonl_path)
+        bin_size = os.path.getsize(log.path)
+
+    print(f"entries:           {args.entries}")
+    print(f"JSONL size:        {jsonl_size / 1e6:8.1f} MB ({jsonl_size / args.entries:.1f} B/entry)")
+    print(f"binary size:       {bin_size / 1e6:8.1f} MB ({(bin_size - 8) / args.entries:.1f} B/entry)")
+    print(f"JSONL full scan:   {jsonl_s * 1e3:8.1f} ms")
+    print(f"binary full scan:  {bin_s * 1e3:8.1f} ms")
+    print(f"binary day lookup: {day_s * 1e6:8.1f} us ({len(day_entries)} entries)")
+    print(f"import:            {import_s * 1e3:8.1f} ms")
+    print(f"lossless export:   {lossless}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Bulk log parsing: one json.loads loop vs bulk_parse on 1..N cores.
+
+Writes N synthetic log lines (mostly drinks, some day summaries, other
+events and garbage lines), then times parsing the whole file into
+columns: the baseline json.loads loop, then load_columns() with 1, 2,
+4, ... worker processes. Every run is checked against the baseline.
+
+    python benchmarks/bench_bulk_parse.py [--entries 2000000] [--max-workers 8]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from array import array
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from waterreminder.bulk_parse import TYPE_CODES, load_columns
+
+
+def write_log(path, count):
+    start = datetime(2020, 1, 1, 8, 0, 0)
+    step = timedelta(minutes=15)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            timestamp = (start + step * i).strftime("%Y-%m-%d %H:%M:%S")
+            if i % 1000 == 999:
+                f.write("not json at all\n")
+            elif i % 500 == 0:
+                f.write(json.dumps({"timestamp": timestamp, "type": "reminder_snoozed"}) + "\n")
+            elif i % 100 == 0:
+                f.write(json.dumps({"timestamp": timestamp, "type": "day_summary",
+                                    "amount": 2.25, "count": 9}) + "\n")
+            else:
+                f.write(json.dumps({"timestamp": timestamp, "type": "drink",
+                                    "amount": 0.25 + (i % 4) * 0.125}) + "\n")
+
+
+def json_loop(path):
+    """What a rebuild did before: json.loads per line, then datetime parsing."""
+    seconds, amounts, types = array("q"), array("d"), array("B")
+    epoch = datetime(1970, 1, 1)
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            kind = TYPE_CODES.get(entry.get("type"))
+            if kind is None:
+                continue
+            ts = datetime.strptime(entry["timestamp"], "%Y-%m-%d %H:%M:%S")
+            seconds.append(int((ts - epoch).total_seconds()))
+            amounts.append(float(entry.get("amount", 0)))
+            types.append(kind)
+    return seconds, amounts, types
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=2_000_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, "water_intake_log.txt")
+        write_log(path, args.entries)
+        size_mb = os.path.getsize(path) / 1e6
+
+        t0 = time.perf_counter()
+        expected = json_loop(path)
+        base_s = time.perf_counter() - t0
+        print(f"{args.entries} lines, {size_mb:.0f} MB, {os.cpu_count()} cores")
+        print(f"{'parser':<18}{'time':>10}{'lines/s':>14}{'speedup':>10}")
+        print(f"{'json.loads loop':<18}{base_s:>9.2f}s{args.entries / base_s:>14,.0f}{1.0:>9.1f}x")
+
+        workers = 1
+        while True:
+            t0 = time.perf_counter()
+            columns = load_columns(path, workers=workers)
+            elapsed = time.perf_counter() - t0
+            got = (columns.seconds, columns.amounts, columns.types)
+            assert got == expected, f"{workers} workers: columns differ from the json.loads loop"
+            label = f"bulk, {workers} worker{'s' if workers > 1 else ''}"
+            print(f"{label:<18}{elapsed:>9.2f}s{args.entries / elapsed:>14,.0f}{base_s / elapsed:>9.1f}x")
+            if workers >= args.max_workers:
+                break
+            workers = min(workers * 2, args.max_workers)
+        print(f"odd lines kept aside: {len(columns.odd)}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
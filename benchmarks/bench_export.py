@@ -0,0 +1,99 @@
+"""Streaming export throughput and peak memory.
+
+Builds a service data directory (see waterreminder/service.py) holding
+N synthetic events spread over U users' JSONL logs, then exports all of
+it to CSV, SQLite and (with pyarrow) Parquet. Each export runs in a
+fresh child process so its peak RSS is its own.
+
+    python benchmarks/bench_export.py [--events 2000000] [--users 200]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CHILD = """
+import json, resource, sys, time
+from waterreminder.export import export, service_sources
+t0 = time.perf_counter()
+count = export(service_sources(sys.argv[1]), sys.argv[2], batch_size=int(sys.argv[3]))
+elapsed = time.perf_counter() - t0
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    rss //= 1024  # bytes there, KiB on Linux
+print(json.dumps({"count": count, "seconds": elapsed, "peak_rss_kb": rss}))
+"""
+
+# Same imports as an export of that format, no data: what the export itself adds is the rest
+BASELINE = """
+import json, resource, sys
+import waterreminder.export, waterreminder.intake_log, waterreminder.service
+if sys.argv[1] == "parquet":
+    import pyarrow.compute, pyarrow.parquet
+print(json.dumps({"peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+"""
+
+
+def build_data_dir(data_dir, events, users):
+    start = datetime(2020, 1, 1, 8, 0, 0)
+    per_user = events // users
+    for u in range(users):
+        user_dir = os.path.join(data_dir, "users", f"user{u:04d}")
+        os.makedirs(user_dir)
+        with open(os.path.join(user_dir, "settings.json"), "w", encoding="utf-8") as f:
+            json.dump({"log_storage": "jsonl"}, f)
+        with open(os.path.join(user_dir, "water_intake_log.txt"), "w", encoding="utf-8") as f:
+            for i in range(per_user):
+                timestamp = (start + timedelta(minutes=37 * i)).strftime("%Y-%m-%d %H:%M:%S")
+                f.write(json.dumps({"timestamp": timestamp, "type": "drink", "amount": 0.25}) + "\n")
+    return per_user * users
+
+
+def run_child(code, *args):
+    out = subprocess.run(
+        [sys.executable, "-c", code, *args], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2_000_000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    try:
+        import pyarrow  # noqa: F401
+        outputs = ["history.csv", "history.db", "history.parquet"]
+    except ImportError:
+        outputs = ["history.csv", "history.db"]
+        print("pyarrow not installed, skipping Parquet")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = os.path.join(tmp, "service-data")
+        t0 = time.perf_counter()
+        total = build_data_dir(data_dir, args.events, args.users)
+        print(f"{total} events, {args.users} users, built in {time.perf_counter() - t0:.1f} s")
+
+        print(f"{'format':<10}{'time':>9}{'events/s':>12}{'peak RSS':>11}{'over imports':>14}{'size':>10}")
+        for name in outputs:
+            path = os.path.join(tmp, name)
+            result = run_child(CHILD, data_dir, path, str(args.batch_size))
+            assert result["count"] == total, result
+            fmt = os.path.splitext(name)[1][1:]
+            base = run_child(BASELINE, fmt)["peak_rss_kb"]
+            print(f"{fmt:<10}{result['seconds']:>8.1f}s{total / result['seconds']:>12,.0f}"
+                  f"{result['peak_rss_kb'] / 1024:>9.1f}MB{(result['peak_rss_kb'] - base) / 1024:>12.1f}MB"
+                  f"{os.path.getsize(path) / 1e6:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
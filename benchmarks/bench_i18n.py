@@ -0,0 +1,81 @@
+"""Micro-benchmark for translations.
+
+Times `_()` for a plain label and for the once-per-second countdown text,
+and the cost of switching languages: cold (first load of a locale) and
+warm (cached catalog). The old dict + str.format implementation is timed
+alongside.
+
+    python benchmarks/bench_i18n.py [--number 200000]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from waterreminder.i18n import Catalogs
+
+LOCALES_DIR = os.path.join(ROOT, "locales")
+
+
+def legacy_load(code):
+    with open(os.path.join(LOCALES_DIR, f"{code}.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def legacy_translate(translations, key, **kwargs):
+    text = translations.get(key, key)
+    if kwargs:
+        try:
+            text = text.format(**kwargs)
+        except KeyError:
+            pass
+    return text
+
+
+def per_call_ns(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    catalogs = Catalogs(LOCALES_DIR)
+    codes = catalogs.available()
+
+    t0 = time.perf_counter()
+    for code in codes:
+        catalogs.get(code)
+    cold_us = (time.perf_counter() - t0) / len(codes) * 1e6
+
+    catalog = catalogs.get("ja-JP")
+    legacy = legacy_load("ja-JP")
+
+    def new(key, **kwargs):
+        return catalog.gettext(key, kwargs)
+
+    def old(key, **kwargs):
+        return legacy_translate(legacy, key, **kwargs)
+
+    # Legacy switching reads a file each time, so it gets fewer iterations
+    rows = [
+        ("_() plain label", lambda: new("drink_water"), lambda: old("drink_water"), 1),
+        ("_() countdown", lambda: new("next_reminder_in", mm="05", ss="09"),
+         lambda: old("next_reminder_in", mm="05", ss="09"), 1),
+        ("switch language (warm)", lambda: catalogs.get("zh-CN"), lambda: legacy_load("zh-CN"), 100),
+    ]
+    print(f"{'':26} {'catalog':>12} {'legacy':>12}")
+    for label, new_fn, old_fn, divisor in rows:
+        print(f"{label:26} {per_call_ns(new_fn, args.number):>9.0f} ns "
+              f"{per_call_ns(old_fn, max(1, args.number // divisor)):>9.0f} ns")
+    print(f"{'switch language (cold)':26} {cold_us * 1e3:>9.0f} ns  (first load incl. validation)")
+
+
+if __name__ == "__main__":
+    main()
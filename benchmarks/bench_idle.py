@@ -0,0 +1,98 @@
+"""Wakeups and CPU time of the app while visible and while in the tray.
+
+Starts the app in a child process (this script with --probe, which
+imports WaterReminderApp and drives it). The app runs visible for
+--seconds, then hides itself to the tray (or iconifies without one) for
+another --seconds, and reports for each phase the CPU time, voluntary
+context switches (process wakeups; needs psutil on Windows), scheduler
+timer wakeups and countdown display ticks. Numbers are also shown
+scaled to one hour.
+
+    python benchmarks/bench_idle.py [--seconds 3600]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIELDS = ("cpu_seconds", "context_switches", "scheduler_wakeups", "countdown_ticks")
+
+
+def probe(phase_seconds):
+    """Child process: run the app visible, then hidden, printing one idle_probe line per phase."""
+    sys.path.insert(0, ROOT)
+    from WaterReminderApp import create_window
+    from waterreminder.metrics import metrics, process_activity
+
+    root, app = create_window()
+
+    def report(phase, started, cpu0, switches0, wakeups0, ticks0):
+        cpu, switches = process_activity()
+        counters = metrics.snapshot()["counters"]
+        print("idle_probe " + json.dumps({
+            "phase": phase,
+            "seconds": time.monotonic() - started,
+            "cpu_seconds": cpu - cpu0,
+            "context_switches": None if switches is None else switches - switches0,
+            "scheduler_wakeups": app.scheduler.wakeups - wakeups0,
+            "countdown_ticks": counters.get("countdown_ticks", 0) - ticks0,
+        }), flush=True)
+
+    def run_phase(phase, then):
+        cpu0, switches0 = process_activity()
+        args = (phase, time.monotonic(), cpu0, switches0, app.scheduler.wakeups,
+                metrics.snapshot()["counters"].get("countdown_ticks", 0))
+
+        def finish():
+            report(*args)
+            then()
+        root.after(int(phase_seconds * 1000), finish)
+
+    root.after(2000, lambda: run_phase(
+        "visible", lambda: (app.hide_window(), run_phase("hidden", app.on_closing_tray))
+    ))
+    root.mainloop()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3600, help="length of each phase")
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.probe:
+        return probe(args.seconds)
+
+    try:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--probe", "--seconds", str(args.seconds)],
+            cwd=ROOT, capture_output=True, text=True, timeout=2 * args.seconds + 120
+        )
+    except subprocess.TimeoutExpired:
+        print("idle probe timed out")
+        return 1
+
+    phases = [json.loads(line.partition(" ")[2])
+              for line in out.stdout.splitlines() if line.startswith("idle_probe ")]
+    if not phases:
+        print(f"idle probe failed: {out.stderr.strip() or 'no output'}")
+        return 1
+
+    print(f"{'phase':>8} {'seconds':>8} " + " ".join(f"{f:>18}" for f in FIELDS))
+    for p in phases:
+        print(f"{p['phase']:>8} {p['seconds']:>8.0f} " + " ".join(
+            f"{'n/a' if p[f] is None else round(p[f], 3):>18}" for f in FIELDS))
+    print("per hour:")
+    for p in phases:
+        scale = 3600 / p["seconds"]
+        print(f"{p['phase']:>8} {'':>8} " + " ".join(
+            f"{'n/a' if p[f] is None else round(p[f] * scale, 1):>18}" for f in FIELDS))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Memory and scroll latency of the on-disk line index behind the log view.
+
+For each log size: build the `.idx` once, reopen it the way the app does at
+startup, then fetch random 20-row windows as a scrolling user would. Peak
+Python memory is measured with tracemalloc over the reopen + scroll phase.
+
+    python benchmarks/bench_log_index.py [--sizes 50 100000 5000000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_log_view import translate, write_synthetic_log
+from waterreminder.intake_log import JsonlLog, format_log_line
+
+WINDOW = 20
+
+
+def bench(count, scrolls):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "water_intake_log.txt")
+        write_synthetic_log(path, count)
+
+        start = time.perf_counter()
+        JsonlLog(path).line_source().refresh()
+        build = time.perf_counter() - start
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        source = JsonlLog(path).line_source()
+        source.refresh()
+        reopen = time.perf_counter() - start
+
+        rng = random.Random(count)
+        start = time.perf_counter()
+        for _ in range(scrolls):
+            top = rng.randrange(max(1, len(source) - WINDOW))
+            for line in source.lines(top, top + WINDOW):
+                format_log_line(line, translate)
+        per_scroll = (time.perf_counter() - start) / scrolls
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert len(source) == count
+        return build, reopen, per_scroll, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 10000, 1000000])
+    parser.add_argument("--scrolls", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'entries':>10} {'index build':>12} {'reopen':>10} {'per scroll':>11} {'peak mem':>10}")
+    for count in args.sizes:
+        build, reopen, per_scroll, peak = bench(count, args.scrolls)
+        print(f"{count:>10} {build * 1000:>10.1f}ms {reopen * 1000:>8.2f}ms "
+              f"{per_scroll * 1e6:>9.1f}us {peak / 1024:>8.1f}KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Per-drink latency of the incremental log view.
+
+Builds synthetic logs of increasing size, then times what one click on
+"Drink Water" costs the log pane: append one entry, refresh the view and
+format the rows on screen, as VirtualLogView does through the log's
+line source. The old full re-parse is timed alongside for comparison.
+
+    python benchmarks/bench_log_view.py [--sizes 100 10000 1000000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from waterreminder.intake_log import JsonlLog, format_log_line
+
+VISIBLE_ROWS = 10
+
+
+def translate(key, **kwargs):
+    return "{time}: Drank {amount} liters".format(**kwargs)
+
+
+def write_synthetic_log(path, count):
+    start = datetime(2020, 1, 1, 9, 0, 0)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            entry = {
+                "timestamp": (start + timedelta(minutes=30 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+                "type": "drink",
+                "amount": 0.25
+            }
+            f.write(json.dumps(entry) + "\n")
+
+
+def append_drink(path):
+    entry = {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "type": "drink",
+        "amount": 0.25
+    }
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def render_bottom(source, translate, rows=VISIBLE_ROWS):
+    """VirtualLogView.refresh() + render() for a view stuck to the bottom."""
+    source.refresh()
+    total = len(source)
+    return [format_log_line(line, translate) or "" for line in source.lines(max(0, total - rows), total)]
+
+
+def full_reparse(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [t for t in (format_log_line(line, translate) for line in f) if t is not None]
+
+
+def bench(count, drinks, full_repeats):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "water_intake_log.txt")
+        write_synthetic_log(path, count)
+
+        source = JsonlLog(path).line_source()
+        render_bottom(source, translate)  # startup render, not part of the per-drink cost
+
+        samples = []
+        for _ in range(drinks):
+            t0 = time.perf_counter()
+            append_drink(path)
+            render_bottom(source, translate)
+            samples.append(time.perf_counter() - t0)
+
+        full = []
+        for _ in range(full_repeats):
+            t0 = time.perf_counter()
+            full_reparse(path)
+            full.append(time.perf_counter() - t0)
+
+    samples.sort()
+    return {
+        "entries": count,
+        "incremental_median_us": samples[len(samples) // 2] * 1e6,
+        "incremental_p99_us": samples[int(len(samples) * 0.99) - 1] * 1e6,
+        "full_reparse_ms": min(full) * 1e3,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--drinks", type=int, default=200)
+    parser.add_argument("--full-repeats", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'entries':>10} {'incr median':>14} {'incr p99':>12} {'full reparse':>14}")
+    for count in args.sizes:
+        r = bench(count, args.drinks, args.full_repeats)
+        print(f"{r['entries']:>10} {r['incremental_median_us']:>11.1f} us "
+              f"{r['incremental_p99_us']:>9.1f} us {r['full_reparse_ms']:>11.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
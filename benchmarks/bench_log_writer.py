@@ -0,0 +1,70 @@
+"""Log append throughput under each durability mode.
+
+Compares the old open/write/close per drink with the background
+LogWriter in "buffered", "group" and "fsync" mode, for single appends
+(one event at a time, as clicks or API calls arrive) and for bulk
+imports (append_many).
+
+    python benchmarks/bench_log_writer.py [--events 20000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from waterreminder.log_writer import DURABILITY_MODES, LogWriter
+
+ENTRY = {"timestamp": "2026-03-14 09:00:00", "type": "drink", "amount": 0.25}
+
+
+def open_close_per_event(path, events):
+    for _ in range(events):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(ENTRY, ensure_ascii=False) + "\n")
+
+
+def writer_single(path, events, mode):
+    writer = LogWriter(path, mode)
+    for _ in range(events):
+        writer.append(ENTRY)
+    writer.close()
+
+
+def writer_bulk(path, events, mode):
+    writer = LogWriter(path, mode)
+    for start in range(0, events, 1000):
+        writer.append_many([ENTRY] * min(1000, events - start))
+    writer.close()
+
+
+def rate(fn, events, *args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "water_intake_log.txt")
+        t0 = time.perf_counter()
+        fn(path, events, *args)
+        elapsed = time.perf_counter() - t0
+        assert os.path.getsize(path) > 0
+    return events / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--fsync-events", type=int, default=1000,
+                        help="fewer events for per-record fsync, which is disk bound")
+    args = parser.parse_args()
+
+    print(f"{'mode':>22} {'events/s':>12}")
+    print(f"{'open/close per event':>22} {rate(open_close_per_event, args.events):>12,.0f}")
+    for mode in DURABILITY_MODES:
+        events = args.fsync_events if mode == "fsync" else args.events
+        print(f"{mode + ' (single)':>22} {rate(writer_single, events, mode):>12,.0f}")
+        print(f"{mode + ' (bulk)':>22} {rate(writer_bulk, events, mode):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Startup restore of today's total from the JSONL log.
+
+For logs of increasing size whose last day has --today entries, times:
+
+    full scan    parsing the whole file forward (the naive approach)
+    reverse      JsonlLog.day_progress without a checkpoint (backwards
+                 block read, stops at the previous day)
+    checkpoint   JsonlLog.day_progress with a valid checkpoint and no
+                 appends since (the usual restart)
+
+    python benchmarks/bench_restore.py [--sizes 1000 100000 1000000] [--today 8]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from waterreminder.intake_log import JsonlLog, day_progress_of
+
+
+def write_log(path, count, today):
+    """count entries, 8 a day, the last `today` of them on the final day."""
+    last_day = datetime(2030, 1, 1, 8, 0, 0)
+    with open(path, "w", encoding="utf-8") as f:
+        history = count - today
+        for i in range(history):
+            day = last_day - timedelta(days=(history - i + 7) // 8)
+            ts = day + timedelta(hours=i % 8)
+            f.write(json.dumps({"timestamp": ts.strftime("%Y-%m-%d %H:%M:%S"),
+                                "type": "drink", "amount": 0.25}) + "\n")
+        for i in range(today):
+            ts = last_day + timedelta(minutes=30 * i)
+            f.write(json.dumps({"timestamp": ts.strftime("%Y-%m-%d %H:%M:%S"),
+                                "type": "drink", "amount": 0.25}) + "\n")
+    return last_day.date().isoformat()
+
+
+def full_scan(path, day):
+    with open(path, "r", encoding="utf-8") as f:
+        return day_progress_of((json.loads(line) for line in f if line.strip()), day)
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--today", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'entries':>10} {'full scan':>12} {'reverse':>10} {'checkpoint':>11}")
+    for count in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "water_intake_log.txt")
+            day = write_log(path, count, args.today)
+
+            full, expected = timed(lambda: full_scan(path, day))
+            reverse, got = timed(lambda: JsonlLog(path).day_progress(day))
+            assert got == expected, (got, expected)
+            checkpoint, got = timed(lambda: JsonlLog(path).day_progress(day))
+            assert got == expected, (got, expected)
+            print(f"{count:>10} {full * 1000:>10.1f}ms {reverse * 1000:>8.2f}ms {checkpoint * 1000:>9.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
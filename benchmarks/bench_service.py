@@ -0,0 +1,81 @@
+"""Load benchmark for the multi-user reminder service.
+
+For each population size, registers N users whose first reminder falls
+at a random point in the next few seconds, runs the event loop until all
+of them have fired and reports reminder jitter (fire time - deadline)
+and traced memory per user.
+
+    python benchmarks/bench_service.py [--users 1000 10000 100000] [--spread 5]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from waterreminder.service import ReminderService
+
+ALL_DAY = {"reminder_windows": ["00:00-00:00"], "interval": 1}
+
+
+async def run_population(count, spread):
+    jitter = []
+    done = asyncio.Event()
+
+    def notify(user_id, deadline):
+        jitter.append((datetime.now() - deadline).total_seconds())
+        if len(jitter) == count:
+            done.set()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    service = ReminderService(notify=notify, loop=asyncio.get_running_loop())
+    for i in range(count):
+        service.set_user(f"user{i}", ALL_DAY, persist=False)
+    per_user = (tracemalloc.get_traced_memory()[0] - before) / count
+    tracemalloc.stop()
+
+    # Setup under tracemalloc is slow, so place the deadlines afterwards.
+    # Scheduling itself takes ~20 us/user, hence the lead time before the
+    # first reminders are due; then they land over the next `spread` seconds.
+    lead = 1 + count * 3e-5
+    start = datetime.now()
+    for user in service.users.values():
+        user.last_drink_time = start - timedelta(minutes=1) + timedelta(seconds=lead + random.random() * spread)
+        service._schedule(user)
+
+    t0 = time.perf_counter()
+    await asyncio.wait_for(done.wait(), timeout=spread + 120)
+    elapsed = time.perf_counter() - t0
+
+    jitter.sort()
+    return {
+        "users": count,
+        "bytes_per_user": per_user,
+        "jitter_p50_ms": jitter[len(jitter) // 2] * 1e3,
+        "jitter_p99_ms": jitter[int(len(jitter) * 0.99) - 1] * 1e3,
+        "jitter_max_ms": jitter[-1] * 1e3,
+        "elapsed_s": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--spread", type=float, default=5.0, help="seconds over which first reminders are spread")
+    args = parser.parse_args()
+
+    print(f"{'users':>8} {'B/user':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for count in args.users:
+        r = asyncio.run(run_population(count, args.spread))
+        print(f"{r['users']:>8} {r['bytes_per_user']:>8.0f} {r['jitter_p50_ms']:>8.2f} "
+              f"{r['jitter_p99_ms']:>8.2f} {r['jitter_max_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""JSONL scan vs the SQLite store's indexed queries.
+
+Builds a synthetic JSONL log, migrates it into a SqliteLog, then times
+the three queries the SQLite store indexes for:
+
+    day total    total for one day
+    last 20      the 20 newest events
+    30 days      per-day totals over a 30-day range
+
+against the same answer computed by scanning the JSONL file (JsonlLog).
+Also reports append throughput with and without batching.
+
+    python benchmarks/bench_sqlite_log.py [--sizes 10000 1000000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_log_view import write_synthetic_log
+from waterreminder.intake_log import JsonlLog
+from waterreminder.sqlite_log import SqliteLog, migrate_jsonl
+
+FIRST_DAY = date(2020, 1, 1)  # write_synthetic_log starts here, 48 entries a day
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+def jsonl_last(log, n):
+    last = []
+    for entry in log.iter_range():
+        last.append(entry)
+        if len(last) > n:
+            last.pop(0)
+    return last
+
+
+def bench(count, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "water_intake_log.txt")
+        write_synthetic_log(path, count)
+        jsonl = JsonlLog(path)
+
+        t0 = time.perf_counter()
+        db = SqliteLog(os.path.join(tmp, "water_intake.db"))
+        migrate_jsonl(path, db)
+        migrate = time.perf_counter() - t0
+
+        mid = FIRST_DAY + timedelta(days=count // 48 // 2)
+        span_end = mid + timedelta(days=29)
+        queries = {
+            "day total": (lambda: sum(jsonl.daily_totals(mid, mid).values()),
+                          lambda: db.total_for_day(mid)),
+            "last 20": (lambda: jsonl_last(jsonl, 20), lambda: db.last_events(20)),
+            "30 days": (lambda: jsonl.daily_totals(mid, span_end),
+                        lambda: db.daily_totals(mid, span_end)),
+        }
+        rows = []
+        for name, (scan, query) in queries.items():
+            scan_time, expected = best(scan, 1 if count >= 1_000_000 else repeat)
+            query_time, got = best(query, repeat)
+            assert got == expected, (name, got, expected)
+            rows.append((name, scan_time, query_time))
+
+        entry = {"timestamp": "2030-01-01 09:00:00", "type": "drink", "amount": 0.25}
+        appends = 2000
+        unbatched = SqliteLog(os.path.join(tmp, "unbatched.db"))
+        t0 = time.perf_counter()
+        for _ in range(appends):
+            unbatched.append(entry)
+        single = (time.perf_counter() - t0) / appends
+        batched_log = SqliteLog(os.path.join(tmp, "batched.db"), batch_size=64)
+        t0 = time.perf_counter()
+        for _ in range(appends):
+            batched_log.append(entry)
+        batched_log.flush()
+        batched = (time.perf_counter() - t0) / appends
+        unbatched.close()
+        batched_log.close()
+        db.close()
+        return migrate, rows, single, batched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 1000000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for count in args.sizes:
+        migrate, rows, single, batched = bench(count, args.repeat)
+        print(f"{count} events (migration {migrate:.2f}s)")
+        print(f"  {'query':>10} {'JSONL scan':>12} {'SQLite':>10} {'speedup':>9}")
+        for name, scan_time, query_time in rows:
+            print(f"  {name:>10} {scan_time * 1000:>10.1f}ms {query_time * 1000:>8.3f}ms "
+                  f"{scan_time / query_time:>8.0f}x")
+        print(f"  append: {single * 1e6:.0f}us unbatched, {batched * 1e6:.1f}us batched")
+
+
+if __name__ == "__main__":
+    main()
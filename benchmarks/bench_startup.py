@@ -0,0 +1,102 @@
+"""Cold-start time of the app.
+
+Starts the app in a child process (this script with --probe, which
+imports WaterReminderApp, builds the window and quits after the first
+paint) and reports the time from process launch to the first scheduled
+reminder and to the first painted window (median of several runs). It
+also runs
+`python -X importtime` on the app and on the headless core and lists
+the slowest imports.
+
+    python benchmarks/bench_startup.py [--runs 5] [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORE_MODULES = "waterreminder.intake_log, waterreminder.scheduler, waterreminder.timetable, waterreminder.backends"
+
+
+def probe():
+    """Child process: print the startup marks, then quit after the first paint."""
+    sys.path.insert(0, ROOT)
+    from WaterReminderApp import create_window
+
+    root, _app = create_window()
+    print(f"first_reminder_scheduled {time.time():.6f}", flush=True)
+
+    def report_first_paint():
+        root.update_idletasks()
+        print(f"first_paint {time.time():.6f}", flush=True)
+        root.destroy()
+
+    root.after_idle(report_first_paint)
+    root.mainloop()
+
+
+def probe_once():
+    t0 = time.time()
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--probe"], cwd=ROOT,
+        capture_output=True, text=True, timeout=120
+    )
+    marks = {}
+    for line in out.stdout.splitlines():
+        name, _sep, value = line.partition(" ")
+        try:
+            marks[name] = float(value) - t0
+        except ValueError:
+            continue
+    if not marks:
+        raise RuntimeError(out.stderr.strip() or "app produced no startup marks")
+    return marks
+
+
+def import_times(code, top):
+    """Return [(cumulative_us, module)] from -X importtime, slowest first."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+        capture_output=True, text=True, timeout=120
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative, module = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), module.rstrip()))
+    rows.sort(reverse=True)
+    return rows[:top], out.returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.probe:
+        probe()
+        return
+
+    try:
+        runs = [probe_once() for _ in range(args.runs)]
+        for mark in ("first_reminder_scheduled", "first_paint"):
+            values = sorted(r[mark] for r in runs if mark in r)
+            if values:
+                print(f"{mark:>26}: {values[len(values) // 2] * 1e3:8.1f} ms (median of {len(values)})")
+    except (RuntimeError, subprocess.TimeoutExpired) as e:
+        print(f"GUI startup probe failed: {e}")
+
+    for label, code in (("app", "import WaterReminderApp"), ("core", f"import {CORE_MODULES}")):
+        rows, returncode = import_times(code, args.top)
+        status = "" if returncode == 0 else " (import failed, partial)"
+        print(f"\nslowest imports, {label}{status}:")
+        for cumulative, module in rows:
+            print(f"  {cumulative / 1e3:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Stress test of the Tk/tray threading model, runnable without a display.
+
+A stand-in for the Tk root records the thread of every call made on it
+and runs its own `after` loop on the main thread, like mainloop does.
+The window is "hidden" to the tray, and a tray thread fires menu commands
+through UiBridge as fast as it can, while the ReminderScheduler fires
+reminders every --period seconds. It then checks that:
+
+    - no Tk call came from any thread but the main one,
+    - every command posted by the tray thread ran,
+    - reminders kept firing on time while hidden.
+
+    python benchmarks/stress_tray_bridge.py [--seconds 3] [--commands 20000]
+"""
+import argparse
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from waterreminder.scheduler import ReminderScheduler, tk_timer
+from waterreminder.ui_bridge import UiBridge
+
+
+class GuardedRoot:
+    """Minimal Tk root: after/after_cancel/withdraw/deiconify, thread-checked."""
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.foreign_calls = []
+        self.visible = True
+        self._timers = []
+        self._cancelled = set()
+        self._ids = itertools.count()
+
+    def _check(self, name):
+        if threading.get_ident() != self.thread:
+            self.foreign_calls.append((name, threading.current_thread().name))
+
+    def after(self, ms, fn):
+        self._check("after")
+        after_id = next(self._ids)
+        heapq.heappush(self._timers, (time.monotonic() + ms / 1000, after_id, fn))
+        return after_id
+
+    def after_cancel(self, after_id):
+        self._check("after_cancel")
+        self._cancelled.add(after_id)
+
+    def withdraw(self):
+        self._check("withdraw")
+        self.visible = False
+
+    def deiconify(self):
+        self._check("deiconify")
+        self.visible = True
+
+    def mainloop(self, until):
+        while time.monotonic() < until:
+            if not self._timers:
+                time.sleep(0.001)
+                continue
+            due, after_id, fn = self._timers[0]
+            wait = due - time.monotonic()
+            if wait > 0:
+                time.sleep(min(wait, 0.001))
+                continue
+            heapq.heappop(self._timers)
+            if after_id in self._cancelled:
+                self._cancelled.discard(after_id)
+                continue
+            fn()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--commands", type=int, default=20000)
+    parser.add_argument("--period", type=float, default=0.05, help="seconds between reminders")
+    args = parser.parse_args()
+
+    root = GuardedRoot()
+    bridge = UiBridge(root, poll_ms=20)
+    call_later, cancel_call = tk_timer(root)
+    scheduler = ReminderScheduler(call_later=call_later, cancel_call=cancel_call)
+
+    lateness = []
+    ran = [0]
+
+    def on_reminder(deadline):
+        lateness.append((datetime.now() - deadline).total_seconds())
+        scheduler.schedule("reminder", deadline + timedelta(seconds=args.period), on_reminder)
+
+    delays = []
+
+    def tray_command(posted=None):
+        # What the menu commands do, on the Tk thread
+        ran[0] += 1
+        if posted is not None:
+            delays.append(time.perf_counter() - posted)
+        root.withdraw()
+        root.deiconify()
+        root.withdraw()
+
+    scheduler.schedule("reminder", datetime.now() + timedelta(seconds=args.period), on_reminder)
+    root.withdraw()
+    bridge.start()
+
+    command = bridge.command(tray_command)
+
+    def tray_thread():
+        for i in range(args.commands):
+            if i % 100:
+                command(None, None)
+            else:
+                # Spaced out and timestamped, to see how fast Tk picks them up
+                time.sleep(0.01)
+                bridge.post(tray_command, time.perf_counter())
+
+    tray = threading.Thread(target=tray_thread, name="tray")
+    tray.start()
+    root.mainloop(time.monotonic() + args.seconds)
+    tray.join()
+    root.mainloop(time.monotonic() + 0.2)  # let the last polls run
+    bridge.close()
+
+    lateness.sort()
+    expected = int(args.seconds / args.period) - 1
+    print(f"tray commands posted: {args.commands}, ran on Tk thread: {ran[0]}")
+    print(f"reminders fired while hidden: {len(lateness)} (expected ~{expected}), "
+          f"lateness p50 {lateness[len(lateness) // 2] * 1000:.1f}ms max {lateness[-1] * 1000:.1f}ms")
+    delays.sort()
+    print(f"post-to-run delay p50 {delays[len(delays) // 2] * 1000:.1f}ms "
+          f"max {delays[-1] * 1000:.1f}ms")
+    print(f"Tk calls from other threads: {len(root.foreign_calls)}")
+    assert not root.foreign_calls, root.foreign_calls[:5]
+    assert ran[0] == args.commands
+    assert len(lateness) >= expected
+
+
+if __name__ == "__main__":
+    main()
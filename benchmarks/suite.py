@@ -0,0 +1,192 @@
+"""Benchmark suite for the app's hot paths, runnable without a display.
+
+Times the real core functions the window calls:
+
+    log_render/<n>      opening the log pane at n entries: reopen the
+                        line source and format the rows on screen
+    log_view_drink/<n>  one drink's refresh of the log pane at n entries
+    drink_append/*      appending one entry (direct and via LogWriter)
+    countdown_tick      one countdown label text (scheduler + _())
+    translate/*         _() for a plain label and a formatted string
+    load_language/*     switching language, cached and first load
+    settings_save       write_settings_file for the default settings
+
+Results (seconds per operation, lower is better) go to a JSON file.
+--compare flags metrics that got slower than the baseline by more than
+--threshold and exits non-zero.
+
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --output new.json --compare bench.json
+    python -m benchmarks.suite --sizes 1000 100000 1000000
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_log_view import append_drink, render_bottom, write_synthetic_log
+from waterreminder.i18n import Catalogs
+from waterreminder.intake_log import JsonlLog
+from waterreminder.log_writer import LogWriter
+from waterreminder.scheduler import ReminderScheduler
+from waterreminder.settings import write_settings_file
+
+LOCALES_DIR = os.path.join(ROOT, "locales")
+DEFAULT_SIZES = [1000, 100_000]
+ENTRY = {"timestamp": "2026-03-14 09:00:00", "type": "drink", "amount": 0.25}
+SETTINGS = {
+    "start_time": "08:00", "end_time": "20:00", "interval": 60, "daily_goal": 2.0,
+    "reminder_amount": 0.25, "start_with_windows": False,
+    "sound_file": "cute-gugu-gaga.mp3", "default_language": "en-US"
+}
+
+
+def best_of(fn, number, repeat=5):
+    """Best per-call time over `repeat` runs of `number` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best
+
+
+def bench_log(results, tmp, sizes, translate):
+    for n in sizes:
+        path = os.path.join(tmp, f"log_{n}.txt")
+        write_synthetic_log(path, n)
+
+        render_bottom(JsonlLog(path).line_source(), translate)  # builds the .idx once, like a first start
+
+        def render():
+            return render_bottom(JsonlLog(path).line_source(), translate)
+
+        results[f"log_render/{n}"] = best_of(render, 1, repeat=3 if n < 1_000_000 else 1)
+
+        source = JsonlLog(path).line_source()
+        render_bottom(source, translate)
+
+        def drink():
+            append_drink(path)
+            render_bottom(source, translate)
+
+        results[f"log_view_drink/{n}"] = best_of(drink, 50)
+
+
+def bench_append(results, tmp):
+    store = JsonlLog(os.path.join(tmp, "append_direct.txt"))
+    results["drink_append/direct"] = best_of(lambda: store.append(ENTRY), 500)
+
+    writer = LogWriter(os.path.join(tmp, "append_writer.txt"), "buffered")
+    store = JsonlLog(writer.path, writer)
+    results["drink_append/writer_buffered"] = best_of(lambda: store.append(ENTRY), 2000)
+    writer.close()
+
+
+def bench_countdown(results, translate):
+    now = datetime(2026, 3, 14, 9, 0, 0)
+    scheduler = ReminderScheduler(clock=lambda: now)
+    scheduler.schedule("reminder", now + timedelta(minutes=42, seconds=7), lambda d: None)
+
+    def tick():
+        remaining = scheduler.seconds_until_next()
+        minutes, seconds = divmod(int(remaining), 60)
+        return translate("next_reminder_in", mm=f"{minutes:02d}", ss=f"{seconds:02d}")
+
+    results["countdown_tick"] = best_of(tick, 20_000)
+
+
+def bench_translations(results):
+    catalogs = Catalogs(LOCALES_DIR)
+    catalog = catalogs.get("en-US")
+    results["translate/plain"] = best_of(lambda: catalog.gettext("drink_water"), 50_000)
+    results["translate/format"] = best_of(
+        lambda: catalog.gettext("water_drank", {"amount": 1.25}), 50_000
+    )
+
+    codes = catalogs.available()
+    results["load_language/first_load"] = best_of(
+        lambda: [Catalogs(LOCALES_DIR).get(c) for c in codes], 1, repeat=5
+    ) / len(codes)
+    catalogs.preload()
+    results["load_language/switch"] = best_of(lambda: catalogs.get("ja-JP"), 50_000)
+
+
+def bench_settings(results, tmp):
+    path = os.path.join(tmp, "settings.json")
+    results["settings_save"] = best_of(lambda: write_settings_file(path, SETTINGS), 500)
+
+
+def run(sizes):
+    catalog = Catalogs(LOCALES_DIR).get("en-US")
+
+    def translate(key, **kwargs):
+        return catalog.gettext(key, kwargs)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_log(results, tmp, sizes, translate)
+        bench_append(results, tmp)
+        bench_countdown(results, translate)
+        bench_translations(results)
+        bench_settings(results, tmp)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return [(name, old, new, ratio)] for metrics slower than baseline by > threshold."""
+    regressions = []
+    for name, new in sorted(results.items()):
+        old = baseline.get(name)
+        if old and new > old * (1 + threshold):
+            regressions.append((name, old, new, new / old))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before a metric counts as a regression (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes)
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for name, value in results.items():
+        print(f"{name:32} {value * 1e6:14.2f} us")
+    print(f"\nwrote {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, old, new, ratio in regressions:
+            print(f"REGRESSION {name}: {old * 1e6:.2f} us -> {new * 1e6:.2f} us ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print(f"no regressions against {args.compare} (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
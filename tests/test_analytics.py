@@ -0,0 +1,83 @@
+import unittest
+from datetime import date
+
+from waterreminder import analytics
+from waterreminder.analytics import IntakeAnalytics
+
+
+def drink(day, time="09:00:00", amount=1.0, user=""):
+    return {"timestamp": f"{day} {time}", "type": "drink", "amount": amount, "user": user}
+
+
+@unittest.skipIf(analytics.np is None, "NumPy is not installed")
+class AggregatesTest(unittest.TestCase):
+    def setUp(self):
+        self.analytics = IntakeAnalytics(daily_goal=2.0)
+        self.analytics.append([
+            drink("2026-01-05", "09:30:00", 1.5),
+            drink("2026-01-05", "14:10:00", 1.0),
+            {"timestamp": "2026-01-05 15:00:00", "type": "reminder"},
+            drink("2026-01-07", "09:45:00", 0.5),
+            {"timestamp": "2026-01-04 00:00:00", "type": "day_summary", "amount": 2.0, "count": 8},
+            drink("2026-01-05", "10:00:00", 3.0, user="ann"),
+        ])
+
+    def test_daily_totals_fill_gaps(self):
+        days, totals = self.analytics.daily_totals()
+        self.assertEqual([str(d) for d in days], ["2026-01-04", "2026-01-05", "2026-01-06", "2026-01-07"])
+        self.assertEqual(list(totals), [2.0, 2.5, 0.0, 0.5])
+        self.assertEqual(list(self.analytics.daily_totals("ann")[1]), [3.0])
+        self.assertEqual(len(self.analytics.daily_totals("nobody")[0]), 0)
+
+    def test_goal_attainment_and_rolling_average(self):
+        self.assertEqual(list(self.analytics.goal_attainment()), [1.0, 1.25, 0.0, 0.25])
+        self.assertEqual(list(self.analytics.rolling_average(2)), [2.0, 2.25, 1.25, 0.25])
+
+    def test_heatmap_skips_summaries(self):
+        heatmap = self.analytics.hourly_heatmap()
+        self.assertEqual(heatmap.shape, (7, 24))
+        self.assertEqual(heatmap.sum(), 3.0)
+        self.assertEqual(heatmap[0, 9], 1.5)  # 2026-01-05 was a Monday
+        self.assertEqual(heatmap[2, 9], 0.5)
+
+    def test_append_invalidates_derived_views(self):
+        self.assertEqual(self.analytics.goal_attainment()[-1], 0.25)
+        self.analytics.append([drink("2026-01-07", "18:00:00", 1.5)])
+        self.assertEqual(self.analytics.goal_attainment()[-1], 1.0)
+
+
+@unittest.skipIf(analytics.np is None, "NumPy is not installed")
+class StreaksTest(unittest.TestCase):
+    def streaks(self, days, today):
+        stats = IntakeAnalytics(daily_goal=1.0)
+        stats.append(drink(day) for day in days)
+        return stats.streaks(today=date.fromisoformat(today))
+
+    def test_longest_run_across_gaps(self):
+        days = ["2026-01-01", "2026-01-02", "2026-01-03", "2026-01-05", "2026-01-06"]
+        self.assertEqual(self.streaks(days, "2026-01-06"), {"current": 2, "longest": 3})
+
+    def test_streak_ending_yesterday_is_current(self):
+        days = ["2026-01-04", "2026-01-05"]
+        self.assertEqual(self.streaks(days, "2026-01-06"), {"current": 2, "longest": 2})
+
+    def test_unmet_today_does_not_end_the_streak(self):
+        stats = IntakeAnalytics(daily_goal=1.0)
+        stats.append([drink("2026-01-04"), drink("2026-01-05"), drink("2026-01-06", amount=0.25)])
+        self.assertEqual(stats.streaks(today=date(2026, 1, 6)), {"current": 2, "longest": 2})
+        self.assertEqual(stats.streaks(today=date(2026, 1, 7)), {"current": 0, "longest": 2})
+
+    def test_old_streak_is_not_current(self):
+        days = ["2026-01-01", "2026-01-02", "2026-01-03"]
+        self.assertEqual(self.streaks(days, "2026-01-05"), {"current": 0, "longest": 3})
+        self.assertEqual(self.streaks(days, "2026-02-01"), {"current": 0, "longest": 3})
+
+    def test_no_days_met(self):
+        stats = IntakeAnalytics(daily_goal=5.0)
+        stats.append([drink("2026-01-01")])
+        self.assertEqual(stats.streaks(today=date(2026, 1, 1)), {"current": 0, "longest": 0})
+        self.assertEqual(IntakeAnalytics(1.0).streaks(), {"current": 0, "longest": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from waterreminder.binary_log import BinaryLog, export_jsonl, import_jsonl
+from waterreminder.intake_log import JsonlLog, close_log_store, open_log_store
+
+
+class BinaryLogTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.log = BinaryLog(os.path.join(self.tmp.name, "water_intake_log.bin"))
+
+    def write_jsonl(self, entries):
+        path = os.path.join(self.tmp.name, "water_intake_log.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        return path
+
+    def test_append_rounds_to_millilitres(self):
+        self.log.append({"timestamp": "2026-01-05 09:00:00", "type": "drink", "amount": 0.3333})
+        self.assertEqual(list(self.log.iter_range())[0]["amount"], 0.333)
+
+    def test_import_export_round_trip(self):
+        entries = [{"timestamp": f"2026-01-05 09:0{i}:00", "type": "drink", "amount": 0.25 * (i + 1)}
+                   for i in range(4)]
+        src = self.write_jsonl(entries)
+        self.assertEqual(import_jsonl(src, self.log), 4)
+        dest = os.path.join(self.tmp.name, "out.txt")
+        export_jsonl(self.log, dest)
+        with open(src, encoding="utf-8") as a, open(dest, encoding="utf-8") as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_import_rejects_entries_that_would_change(self):
+        for entry in ({"timestamp": "2026-01-05 09:00:00", "type": "drink", "amount": 1},
+                      {"timestamp": "2026-01-05 09:00:00", "type": "drink", "amount": 0.3333},
+                      {"timestamp": "2026-01-05 09:00:00", "type": "drink", "amount": 0.25, "user": "x"}):
+            with self.subTest(entry=entry), self.assertRaises(ValueError):
+                import_jsonl(self.write_jsonl([entry]), self.log)
+        self.assertEqual(len(self.log), 0)
+
+    def test_failed_migration_keeps_a_full_jsonl_store(self):
+        path = self.write_jsonl([
+            {"timestamp": "2025-01-05 09:00:00", "type": "drink", "amount": 0.25},
+            {"timestamp": "2026-01-05 09:00:00", "type": "drink", "amount": 0.3333},
+        ])
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            store = open_log_store("binary", self.tmp.name, durability="group", retention_days=30)
+        self.addCleanup(close_log_store, store)
+        self.assertIn("Keeping JSONL log storage", stderr.getvalue())
+        self.assertIsInstance(store, JsonlLog)
+        self.assertEqual(store.path, path)
+        self.assertIsNotNone(store.writer)
+        self.assertIsNotNone(store.archive_dir)  # the 2025 day was compacted
+        self.assertEqual(len(self.log), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
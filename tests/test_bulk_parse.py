@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+
+from waterreminder.bulk_parse import TYPE_CODES, load_columns, parse_lines
+
+LINES = [
+    b'{"timestamp": "2026-01-05 09:30:00", "type": "drink", "amount": 0.25}',
+    b'',
+    b'{"timestamp": "2026-02-30 09:30:00", "type": "drink", "amount": 0.25}',
+    b'{"amount": 0.5, "type": "drink", "timestamp": "2026-01-05 10:00:00", "user": "ann"}',
+    b'not json',
+    b'{"timestamp": "2026-01-05 23:59:59", "type": "day_summary", "amount": 2.0, "count": 8}',
+]
+
+
+class ParseLinesTest(unittest.TestCase):
+    def test_fast_and_slow_paths(self):
+        columns = parse_lines(LINES)
+        self.assertEqual(columns.lines, 5)
+        self.assertEqual(len(columns), 3)
+        day = 20458 * 86400  # 2026-01-05
+        self.assertEqual(list(columns.seconds), [day + 34200, day + 36000, day + 86399])
+        self.assertEqual(list(columns.amounts), [0.25, 0.5, 2.0])
+        self.assertEqual(list(columns.types), [TYPE_CODES["drink"], TYPE_CODES["drink"], TYPE_CODES["day_summary"]])
+        self.assertEqual([columns.user_names[u] for u in columns.users], ["", "ann", ""])
+
+    def test_impossible_date_goes_to_odd(self):
+        columns = parse_lines(LINES)
+        self.assertEqual([n for n, _value in columns.odd], [1, 3])
+        self.assertEqual(columns.odd[0][1]["timestamp"], "2026-02-30 09:30:00")
+        self.assertEqual(columns.odd[1][1], "not json")
+
+    def test_chunks_match_single_pass(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "log.txt")
+            with open(path, "wb") as f:
+                f.write(b"\n".join(LINES * 50) + b"\n")
+            whole = load_columns(path, workers=1, chunk_bytes=1 << 20)
+            chunked = load_columns(path, workers=1, chunk_bytes=200)
+        self.assertEqual(list(chunked.seconds), list(whole.seconds))
+        self.assertEqual(chunked.odd, whole.odd)
+        self.assertEqual(len(whole), 150)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from waterreminder.binary_log import BinaryLog
+from waterreminder.export import app_sources, export
+from waterreminder.log_segments import SegmentedLog
+from waterreminder.sqlite_log import SqliteLog
+
+ENTRIES = [
+    {"timestamp": "2026-01-05 09:00:00", "type": "drink", "amount": 0.25},
+    {"timestamp": "2026-01-05 12:30:00", "type": "drink", "amount": 0.5},
+    {"timestamp": "2026-01-06 08:15:00", "type": "drink", "amount": 0.25},
+]
+
+
+def snapshot(directory):
+    out = {}
+    for root, _dirs, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                out[os.path.relpath(path, directory)] = (os.stat(path).st_mtime_ns, f.read())
+    return out
+
+
+class ReadOnlyExportTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+        self.app_dir = os.path.join(self.tmp, "app")
+        os.makedirs(self.app_dir)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def settings(self, storage):
+        with open(os.path.join(self.app_dir, "settings.json"), "w", encoding="utf-8") as f:
+            json.dump({"log_storage": storage}, f)
+
+    def assert_export_leaves_store_alone(self, expected_rows, scratch=()):
+        before = snapshot(self.app_dir)
+        output = os.path.join(self.tmp, "history.csv")
+        count = export(app_sources(self.app_dir), output)
+        after = snapshot(self.app_dir)
+        for name in scratch:
+            after.pop(name, None)
+        self.assertEqual(after, before)
+        with open(output, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))[1:]
+        self.assertEqual(count, expected_rows)
+        self.assertEqual(len(rows), expected_rows)
+
+    def test_sqlite(self):
+        self.settings("sqlite")
+        store = SqliteLog(os.path.join(self.app_dir, "water_intake.db"))
+        for entry in ENTRIES:
+            store.append(entry)
+        store.close()
+        # A WAL reader needs the shared-memory files, even read-only; the database is untouched
+        self.assert_export_leaves_store_alone(3, scratch=("water_intake.db-wal", "water_intake.db-shm"))
+
+    def test_binary_with_torn_record(self):
+        self.settings("binary")
+        path = os.path.join(self.app_dir, "water_intake_log.bin")
+        store = BinaryLog(path)
+        for entry in ENTRIES:
+            store.append(entry)
+        with open(path, "ab") as f:
+            f.write(b"\x01\x02\x03")
+        self.assert_export_leaves_store_alone(3)
+
+    def test_segmented_with_stale_sidecar(self):
+        self.settings("segmented")
+        store = SegmentedLog(os.path.join(self.app_dir, "logs"))
+        for entry in ENTRIES[:2]:
+            store.append(entry)
+        with open(store.segment_path("2026-01-05"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(ENTRIES[2]) + "\n")  # sidecar no longer matches the segment
+        self.assert_export_leaves_store_alone(3)
+        reader = SegmentedLog(store.directory, read_only=True)
+        self.assertEqual(reader.day_count("2026-01-05"), 3)
+        with open(store.index_path("2026-01-05"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["count"], 2)
+
+    def test_jsonl(self):
+        self.settings("jsonl")
+        with open(os.path.join(self.app_dir, "water_intake_log.txt"), "w", encoding="utf-8") as f:
+            for entry in ENTRIES:
+                f.write(json.dumps(entry) + "\n")
+        self.assert_export_leaves_store_alone(3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from waterreminder.i18n import REFERENCE_LANG, Catalogs
+
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "locales")
+
+
+class BundledLocalesTest(unittest.TestCase):
+    def test_every_locale_matches_the_reference(self):
+        catalogs = Catalogs(LOCALES_DIR)
+        with open(catalogs.path(REFERENCE_LANG), encoding="utf-8") as f:
+            reference = set(json.load(f))
+        self.assertGreater(len(catalogs.available()), 1)
+        for code in catalogs.available():
+            with self.subTest(code=code):
+                with open(catalogs.path(code), encoding="utf-8") as f:
+                    keys = set(json.load(f))
+                self.assertEqual(sorted(reference - keys), [], "missing keys")
+                self.assertEqual(sorted(keys - reference), [], "extra keys")
+                self.assertEqual(catalogs.get(code).problems, [])
+
+
+class CatalogProblemsTest(unittest.TestCase):
+    def test_problems_are_reported_and_fall_back(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for code, catalog in ((REFERENCE_LANG, {"hello": "Hello {name}", "bye": "Bye"}),
+                                  ("xx-XX", {"hello": "Hi {nom}", "extra": "?"})):
+                with open(os.path.join(tmp, f"{code}.json"), "w", encoding="utf-8") as f:
+                    json.dump(catalog, f)
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr):
+                catalog = Catalogs(tmp).get("xx-XX")
+        self.assertEqual(len(catalog.problems), 3)
+        self.assertEqual(stderr.getvalue().count("Translation problem"), 3)
+        self.assertEqual(catalog.gettext("hello", {"name": "Ann"}), "Hello Ann")
+        self.assertEqual(catalog.gettext("bye"), "Bye")
+
+
+if __name__ == "__main__":
+    unittest.main()
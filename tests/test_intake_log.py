@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import unittest
+
+from waterreminder.intake_log import JsonlLog
+
+TODAY = "2026-01-06"
+
+
+def drink(timestamp, amount=0.25):
+    return {"timestamp": timestamp, "type": "drink", "amount": amount}
+
+
+class DayProgressTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "water_intake_log.txt")
+        self.write([drink("2026-01-05 09:00:00", 1.0), drink("2026-01-05 21:00:00", 1.0),
+                    drink(f"{TODAY} 08:00:00"), {"timestamp": f"{TODAY} 08:30:00", "type": "reminder"},
+                    drink(f"{TODAY} 09:00:00", 0.5)])
+
+    def write(self, entries, mode="a"):
+        with open(self.path, mode, encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+
+    def checkpoint(self):
+        with open(self.path + ".checkpoint", encoding="utf-8") as f:
+            return json.load(f)
+
+    def mark_checkpoint(self, total):
+        """Give the checkpoint a total the file can't produce, to see whether it was used."""
+        checkpoint = self.checkpoint()
+        checkpoint["total"] = total
+        with open(self.path + ".checkpoint", "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+
+    def test_no_checkpoint_reads_only_today(self):
+        self.assertEqual(JsonlLog(self.path).day_progress(TODAY), (0.75, 2, f"{TODAY} 09:00:00"))
+        self.assertEqual(self.checkpoint()["day"], TODAY)
+        self.assertEqual(self.checkpoint()["size"], os.path.getsize(self.path))
+
+    def test_todays_checkpoint_is_used(self):
+        JsonlLog(self.path).day_progress(TODAY)
+        self.mark_checkpoint(5.0)
+        self.assertEqual(JsonlLog(self.path).day_progress(TODAY), (5.0, 2, f"{TODAY} 09:00:00"))
+
+    def test_entries_after_the_checkpoint_are_added(self):
+        JsonlLog(self.path).day_progress(TODAY)
+        self.mark_checkpoint(5.0)
+        self.write([drink(f"{TODAY} 10:00:00"), drink(f"{TODAY} 11:00:00", 0.5)])
+        self.assertEqual(JsonlLog(self.path).day_progress(TODAY), (5.75, 4, f"{TODAY} 11:00:00"))
+
+    def test_stale_checkpoint_is_ignored(self):
+        JsonlLog(self.path).day_progress("2026-01-05")
+        self.mark_checkpoint(5.0)
+        self.assertEqual(JsonlLog(self.path).day_progress(TODAY), (0.75, 2, f"{TODAY} 09:00:00"))
+        self.assertEqual(self.checkpoint()["day"], TODAY)
+
+    def test_checkpoint_for_a_replaced_file_is_ignored(self):
+        JsonlLog(self.path).day_progress(TODAY)
+        self.mark_checkpoint(5.0)
+        self.write([drink(f"{TODAY} 07:00:00"), drink(f"{TODAY} 07:30:00"), drink(f"{TODAY} 08:00:00"),
+                    drink(f"{TODAY} 08:10:00"), drink(f"{TODAY} 08:20:00")], mode="w")
+        self.assertEqual(JsonlLog(self.path).day_progress(TODAY), (1.25, 5, f"{TODAY} 08:20:00"))
+
+    def test_appends_keep_the_checkpoint_current(self):
+        store = JsonlLog(self.path)
+        store.day_progress(TODAY)
+        store.append(drink(f"{TODAY} 12:00:00", 1.0))
+        store.close()
+        self.assertEqual(self.checkpoint()["total"], 1.75)
+        self.assertEqual(JsonlLog(self.path).day_progress(TODAY), (1.75, 3, f"{TODAY} 12:00:00"))
+
+
+if __name__ == "__main__":
+    unittest.main()
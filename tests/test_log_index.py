@@ -0,0 +1,131 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from waterreminder.intake_log import JsonlLog
+from waterreminder.log_index import INDEX_HEADER, INDEX_MAGIC, LineIndex
+from waterreminder.log_writer import LogWriter
+
+
+def line(n):
+    return json.dumps({"timestamp": f"2026-01-05 09:{n:02d}:00", "type": "drink", "amount": 0.25}) + "\n"
+
+
+class LineIndexTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "water_intake_log.txt")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, text, mode="a"):
+        with open(self.path, mode, encoding="utf-8") as f:
+            f.write(text)
+
+    def test_appends_are_indexed_incrementally(self):
+        self.write(line(0) + "\n" + line(1))
+        index = LineIndex(self.path)
+        self.assertFalse(index.refresh())
+        self.assertEqual(len(index), 2)
+        self.write(line(2))
+        self.assertFalse(index.refresh())
+        self.assertEqual(index.lines(0, 10), [line(n).rstrip("\n") for n in range(3)])
+        self.assertEqual(index.lines(1, 2), [line(1).rstrip("\n")])
+        self.assertEqual(index.lines(5, 9), [])
+
+    def test_half_written_line_waits_for_its_newline(self):
+        self.write(line(0) + line(1)[:20])
+        index = LineIndex(self.path)
+        index.refresh()
+        self.assertEqual(len(index), 1)
+        self.write(line(1)[20:])
+        index.refresh()
+        self.assertEqual(index.lines(0, 2), [line(0).rstrip("\n"), line(1).rstrip("\n")])
+
+    def test_truncated_log_restarts(self):
+        self.write(line(0) + line(1))
+        index = LineIndex(self.path)
+        index.refresh()
+        self.write(line(5), mode="w")
+        self.assertTrue(index.refresh())
+        self.assertEqual(index.lines(0, 10), [line(5).rstrip("\n")])
+
+    def test_existing_index_is_reused(self):
+        self.write(line(0) + line(1))
+        LineIndex(self.path).refresh()
+        self.write(line(2))
+        index = LineIndex(self.path)
+        self.assertEqual((len(index), index.indexed_size), (2, len(line(0)) * 2))
+        self.assertFalse(index.refresh())
+        self.assertEqual(len(index), 3)
+
+    def test_stale_index_is_rebuilt(self):
+        self.write(line(0) + line(1))
+        LineIndex(self.path).refresh()
+        # Replaced by a different log whose line boundaries don't match the index
+        self.write("x" + line(3) + line(4), mode="w")
+        index = LineIndex(self.path)
+        self.assertEqual(len(index), 0)
+        index.refresh()
+        self.assertEqual(index.lines(0, 10), ["x" + line(3).rstrip("\n"), line(4).rstrip("\n")])
+
+        # Shorter than what the index covers
+        self.write(line(0), mode="w")
+        self.assertEqual(len(LineIndex(self.path)), 0)
+
+    def test_corrupt_index_is_rebuilt(self):
+        self.write(line(0) + line(1))
+        for garbage in (b"", b"WRIDX", b"not an index at all", INDEX_HEADER.pack(b"OTHER\x00\x00\x00", 0)):
+            with self.subTest(garbage=garbage):
+                with open(self.path + ".idx", "wb") as f:
+                    f.write(garbage)
+                index = LineIndex(self.path)
+                self.assertEqual(len(index), 0)
+                index.refresh()
+                self.assertEqual(len(index), 2)
+                with open(self.path + ".idx", "rb") as f:
+                    self.assertEqual(f.read(len(INDEX_MAGIC)), INDEX_MAGIC)
+
+
+class JsonlLineSourceTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "water_intake_log.txt")
+        self.archive_dir = os.path.join(self._tmp.name, "archive")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_archived_lines_come_first(self):
+        os.makedirs(self.archive_dir)
+        summary = json.dumps({"timestamp": "2025-12-01 00:00:00", "type": "day_summary", "amount": 2.0, "count": 8})
+        with gzip.open(os.path.join(self.archive_dir, "water_intake_2025-12.jsonl.gz"), "wt") as f:
+            f.write(summary + "\n")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(line(0) + line(1))
+
+        source = JsonlLog(self.path, archive_dir=self.archive_dir).line_source()
+        self.assertFalse(source.refresh())
+        self.assertEqual(len(source), 3)
+        self.assertEqual(source.lines(0, 3), [summary, line(0).rstrip("\n"), line(1).rstrip("\n")])
+        self.assertEqual(source.lines(1, 2), [line(0).rstrip("\n")])
+        self.assertEqual(source.lines(0, 1), [summary])
+
+    def test_refresh_waits_for_the_writer(self):
+        writer = LogWriter(self.path)
+        self.addCleanup(writer.close)
+        store = JsonlLog(self.path, writer=writer)
+        source = store.line_source()
+        source.refresh()
+        for n in range(5):
+            store.append(json.loads(line(n)))
+        self.assertFalse(source.refresh())
+        self.assertEqual(len(source), 5)
+        self.assertEqual(json.loads(source.lines(4, 5)[0])["timestamp"], "2026-01-05 09:04:00")
+
+
+if __name__ == "__main__":
+    unittest.main()
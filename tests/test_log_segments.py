@@ -0,0 +1,127 @@
+import json
+import os
+import tempfile
+import unittest
+
+from waterreminder.intake_log import open_log_store
+from waterreminder.log_segments import SegmentedLog, migrate_jsonl
+
+
+def drink(timestamp, amount=0.25):
+    return {"timestamp": timestamp, "type": "drink", "amount": amount}
+
+
+class SegmentedLineSourceTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.log = SegmentedLog(os.path.join(self._tmp.name, "logs"))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def all_lines(self, source):
+        return [json.loads(line) for line in source.lines(0, len(source))]
+
+    def test_appends_to_newest_and_new_days(self):
+        for day in ("2026-01-05", "2026-01-06"):
+            self.log.append(drink(f"{day} 09:00:00"))
+        source = self.log.line_source()
+        self.assertFalse(source.refresh())
+        self.log.append(drink("2026-01-06 10:00:00"))
+        self.log.append(drink("2026-01-07 08:00:00"))
+        self.assertFalse(source.refresh())
+        self.assertEqual(len(source), 4)
+        self.assertEqual([e["timestamp"] for e in self.all_lines(source)], [
+            "2026-01-05 09:00:00", "2026-01-06 09:00:00", "2026-01-06 10:00:00", "2026-01-07 08:00:00",
+        ])
+
+    def test_older_day_changes_restart(self):
+        for day in ("2026-01-05", "2026-01-07"):
+            self.log.append(drink(f"{day} 09:00:00"))
+        source = self.log.line_source()
+        source.refresh()
+
+        # A late entry for an older day shifts every row after it
+        self.log.append(drink("2026-01-05 21:00:00"))
+        self.assertTrue(source.refresh())
+        self.assertEqual([e["timestamp"] for e in self.all_lines(source)], [
+            "2026-01-05 09:00:00", "2026-01-05 21:00:00", "2026-01-07 09:00:00",
+        ])
+
+        # So does a new day before the newest one
+        self.log.append(drink("2026-01-06 12:00:00"))
+        self.assertTrue(source.refresh())
+        self.assertEqual(len(source), 4)
+        self.assertEqual(json.loads(source.lines(2, 3)[0])["timestamp"], "2026-01-06 12:00:00")
+        self.assertFalse(source.refresh())
+
+    def test_clear_restarts(self):
+        self.log.append(drink("2026-01-05 09:00:00"))
+        source = self.log.line_source()
+        source.refresh()
+        self.log.clear()
+        self.assertTrue(source.refresh())
+        self.assertEqual(len(source), 0)
+
+    def test_undated_lines_come_first(self):
+        src = os.path.join(self._tmp.name, "water_intake_log.txt")
+        with open(src, "w", encoding="utf-8") as f:
+            f.write(json.dumps(drink("2026-01-05 09:00:00")) + "\n")
+            f.write(json.dumps({"type": "note", "text": "no timestamp"}) + "\n")
+        self.assertEqual(migrate_jsonl(src, self.log), 2)
+
+        source = self.log.line_source()
+        source.refresh()
+        self.assertEqual([e["type"] for e in self.all_lines(source)], ["note", "drink"])
+        self.assertEqual([e["type"] for e in self.log.iter_range()], ["note", "drink"])
+        self.assertEqual([e["type"] for e in self.log.iter_range("2026-01-01")], ["drink"])
+
+        # More undated lines shift the dated rows down, so the view starts over
+        self.log.append({"type": "note", "text": "another"})
+        self.assertTrue(source.refresh())
+        self.assertEqual([e["type"] for e in self.all_lines(source)], ["note", "note", "drink"])
+
+
+class MigrateJsonlTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self._tmp.name, "water_intake_log.txt")
+        self.directory = os.path.join(self._tmp.name, "logs")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write_source(self, data):
+        with open(self.src, "wb") as f:
+            f.write(data)
+
+    def test_days_out_of_order_keep_their_line_order(self):
+        entries = [drink("2026-01-05 09:00:00"), drink("2026-01-06 09:00:00"),
+                   drink("2026-01-05 22:00:00"), drink("2026-01-06 10:00:00", 0.5)]
+        self.write_source(b"".join(json.dumps(e).encode() + b"\n" for e in entries))
+        log = SegmentedLog(self.directory)
+        self.assertEqual(migrate_jsonl(self.src, log), 4)
+        self.assertEqual(log.days(), ["2026-01-05", "2026-01-06"])
+        self.assertEqual(list(log.iter_range()), [entries[0], entries[2], entries[1], entries[3]])
+        self.assertEqual(log.daily_totals(), {"2026-01-05": 0.5, "2026-01-06": 0.75})
+        self.assertFalse(os.path.exists(self.directory + ".migrating"))
+        with self.assertRaises(ValueError):
+            migrate_jsonl(self.src, log)
+
+    def test_interrupted_migration_is_redone(self):
+        good = json.dumps(drink("2026-01-05 09:00:00")).encode() + b"\n"
+        self.write_source(good + b"\xff\xfe broken\n" + good)
+        with self.assertRaises(UnicodeDecodeError):
+            open_log_store("segmented", self._tmp.name)
+        self.assertEqual(SegmentedLog(self.directory).segments(), [])
+        self.assertTrue(os.path.exists(self.src))
+
+        self.write_source(good * 2)
+        store = open_log_store("segmented", self._tmp.name)
+        self.assertEqual(store.day_count("2026-01-05"), 2)
+        self.assertFalse(os.path.exists(self.src))
+        self.assertFalse(os.path.exists(self.directory + ".migrating"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from waterreminder.log_writer import LogWriter, repair_torn_tail
+
+ENTRY = {"timestamp": "2026-01-05 09:00:00", "type": "drink", "amount": 0.25}
+
+
+class FlakyWriter(LogWriter):
+    """Writes half a record and then fails, `failures` times."""
+
+    failures = 1
+
+    def _write_batch(self, f, batch):
+        if self.failures:
+            self.failures -= 1
+            f.write(b'{"timestamp": "2026-')
+            f.flush()
+            raise OSError(28, "No space left on device")
+        super()._write_batch(f, batch)
+
+
+class LogWriterTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "water_intake_log.txt")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def read_entries(self):
+        with open(self.path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_modes_write_in_order(self):
+        for mode in ("buffered", "group", "fsync"):
+            with self.subTest(mode=mode):
+                writer = LogWriter(self.path, mode, group_interval=0.01)
+                writer.append(ENTRY)
+                writer.append_many([dict(ENTRY, amount=0.5), dict(ENTRY, amount=0.75)])
+                self.assertTrue(writer.wait_written(5))
+                self.assertEqual([e["amount"] for e in self.read_entries()], [0.25, 0.5, 0.75])
+                writer.truncate()
+                self.assertEqual(os.path.getsize(self.path), 0)
+                writer.close()
+
+    def test_closed_writer_rejects_appends(self):
+        writer = LogWriter(self.path)
+        writer.close()
+        with self.assertRaises(ValueError):
+            writer.append(ENTRY)
+
+    def test_failed_write_is_reported_and_writer_keeps_going(self):
+        writer = FlakyWriter(self.path)
+        with contextlib.redirect_stderr(io.StringIO()) as err:
+            writer.append(ENTRY)
+            with self.assertRaises(OSError):
+                writer.wait_written(5)
+        self.assertIn("No space left", err.getvalue())
+        # The half record was cut off again
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+        # Reported once; the thread is still alive and writes the next record
+        writer.append(dict(ENTRY, amount=0.5))
+        self.assertTrue(writer.sync())
+        self.assertEqual(self.read_entries(), [dict(ENTRY, amount=0.5)])
+        writer.close()
+
+    def test_error_is_raised_from_the_next_append(self):
+        writer = FlakyWriter(self.path)
+        with contextlib.redirect_stderr(io.StringIO()):
+            writer.append(ENTRY)
+            with writer._cond:
+                writer._cond.wait_for(lambda: writer._written >= 1, 5)
+        with self.assertRaises(OSError):
+            writer.append(dict(ENTRY, amount=0.5))
+        writer.append(dict(ENTRY, amount=0.75))
+        writer.close()
+        self.assertEqual(self.read_entries(), [dict(ENTRY, amount=0.75)])
+
+
+class RepairTornTailTest(unittest.TestCase):
+    def test_cuts_off_a_torn_line(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "log.txt")
+            with open(path, "wb") as f:
+                f.write(json.dumps(ENTRY).encode() + b'\n{"timestamp": "2026-')
+            self.assertTrue(repair_torn_tail(path))
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), json.dumps(ENTRY).encode() + b"\n")
+            with open(path + ".torn", "rb") as f:
+                self.assertEqual(f.read(), b'{"timestamp": "2026-\n')
+            self.assertFalse(repair_torn_tail(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import unittest
+
+from waterreminder.metrics import BUCKETS, Metrics, MetricsExporter
+
+
+class MetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics()
+
+    def test_counters(self):
+        self.metrics.inc("drinks_logged")
+        self.metrics.inc("drinks_logged", 2)
+        self.metrics.inc("reminders")
+        self.assertEqual(self.metrics.snapshot()["counters"], {"drinks_logged": 3, "reminders": 1})
+
+    def test_timer_snapshot(self):
+        for seconds in (0.0002, 0.003, 0.003, 10.0):
+            self.metrics.observe("tick", seconds)
+        timer = self.metrics.snapshot()["timers"]["tick"]
+        self.assertEqual(timer["count"], 4)
+        self.assertAlmostEqual(timer["sum"], 10.0062)
+        self.assertAlmostEqual(timer["mean"], 10.0062 / 4)
+        self.assertEqual(timer["max"], 10.0)
+        self.assertEqual(list(timer["buckets"]), [str(b) for b in BUCKETS] + ["+Inf"])
+        self.assertEqual((timer["buckets"]["0.0005"], timer["buckets"]["0.005"], timer["buckets"]["+Inf"]),
+                         (1, 2, 1))
+        self.assertEqual(sum(timer["buckets"].values()), 4)
+
+    def test_timer_context_manager_records_on_error(self):
+        with self.assertRaises(RuntimeError), self.metrics.timer("save"):
+            raise RuntimeError("boom")
+        self.assertEqual(self.metrics.snapshot()["timers"]["save"]["count"], 1)
+
+    def test_snapshot_is_a_copy_and_reset_clears(self):
+        self.metrics.inc("a")
+        snapshot = self.metrics.snapshot()
+        self.metrics.inc("a")
+        self.assertEqual(snapshot["counters"]["a"], 1)
+        self.metrics.reset()
+        self.assertEqual((self.metrics.snapshot()["counters"], self.metrics.snapshot()["timers"]), ({}, {}))
+
+    def test_prometheus_buckets_are_cumulative(self):
+        self.metrics.inc("reminders", 2)
+        self.metrics.observe("tick", 0.0002)
+        self.metrics.observe("tick", 0.003)
+        lines = self.metrics.to_prometheus().splitlines()
+        self.assertIn("water_reminder_reminders_total 2", lines)
+        self.assertIn('water_reminder_tick_seconds_bucket{le="0.0005"} 1', lines)
+        self.assertIn('water_reminder_tick_seconds_bucket{le="0.005"} 2', lines)
+        self.assertIn('water_reminder_tick_seconds_bucket{le="+Inf"} 2', lines)
+        self.assertIn("water_reminder_tick_seconds_count 2", lines)
+
+
+class MetricsExporterTest(unittest.TestCase):
+    def test_format_follows_the_file_name(self):
+        registry = Metrics()
+        registry.inc("reminders")
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("metrics.json", "metrics.prom"):
+                path = os.path.join(tmp, name)
+                exporter = MetricsExporter(path, interval=3600, registry=registry)
+                exporter.start()
+                exporter.stop()
+                with open(path, encoding="utf-8") as f:
+                    text = f.read()
+                if name.endswith(".json"):
+                    self.assertEqual(json.loads(text)["counters"], {"reminders": 1})
+                else:
+                    self.assertIn("water_reminder_reminders_total 1", text)
+                self.assertFalse(os.path.exists(path + ".tmp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
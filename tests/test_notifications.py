@@ -0,0 +1,111 @@
+import threading
+import unittest
+
+from waterreminder.metrics import metrics
+from waterreminder.notifications import MemorySink, NotificationDispatcher, RateLimit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class BlockingSink(MemorySink):
+    """Holds every delivery until `release` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def deliver(self, notification):
+        self.release.wait(5)
+        super().deliver(notification)
+
+
+class RateLimitTest(unittest.TestCase):
+    def test_burst_then_refill(self):
+        clock = FakeClock()
+        limit = RateLimit(per_minute=6, burst=2, clock=clock)
+        self.assertEqual([limit.allow() for _ in range(3)], [True, True, False])
+        clock.now += 5  # half a token
+        self.assertFalse(limit.allow())
+        clock.now += 5
+        self.assertTrue(limit.allow())
+        clock.now += 3600  # refills up to the burst only
+        self.assertEqual([limit.allow() for _ in range(3)], [True, True, False])
+
+
+class NotificationDispatcherTest(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+        self.clock = FakeClock()
+        self.dispatcher = NotificationDispatcher(dedup_window=60, clock=self.clock)
+        self.addCleanup(self.dispatcher.close)
+
+    def counter(self, name):
+        return metrics.snapshot()["counters"].get(name, 0)
+
+    def test_same_key_is_delivered_once_per_window(self):
+        sink = self.dispatcher.add_sink(MemorySink())
+        self.assertTrue(self.dispatcher.submit("reminder 09:00", "Water", "Drink"))
+        self.assertFalse(self.dispatcher.submit("reminder 09:00", "Water", "Drink"))
+        self.assertTrue(self.dispatcher.submit("reminder 10:00", "Water", "Drink"))
+        self.clock.now += 59
+        self.assertFalse(self.dispatcher.submit("reminder 09:00", "Water", "Drink"))
+        self.clock.now += 1
+        self.assertTrue(self.dispatcher.submit("reminder 09:00", "Water", "Again"))
+        self.dispatcher.wait_idle()
+        self.assertEqual([n.message for n in sink.delivered], ["Drink", "Drink", "Again"])
+        self.assertEqual(self.counter("notifications_deduplicated"), 2)
+
+    def test_expired_keys_are_forgotten(self):
+        for n in range(300):
+            self.dispatcher.submit(f"key {n}", "Water", "Drink")
+        self.assertEqual(len(self.dispatcher._seen), 300)
+        self.clock.now += 61
+        self.dispatcher.submit("fresh", "Water", "Drink")
+        self.assertEqual(list(self.dispatcher._seen), ["fresh"])
+
+    def test_rate_limit_is_per_sink(self):
+        limited = MemorySink()
+        limited.name = "limited"
+        free = self.dispatcher.add_sink(MemorySink())
+        self.dispatcher.add_sink(limited, per_minute=1, burst=2)
+        for n in range(5):
+            self.dispatcher.submit(f"key {n}", "Water", "Drink")
+        self.dispatcher.wait_idle()
+        self.assertEqual((len(free.delivered), len(limited.delivered)), (5, 2))
+        self.assertEqual(self.counter("notifications_rate_limited_limited"), 3)
+
+        self.clock.now += 60
+        self.dispatcher.submit("key 5", "Water", "Drink")
+        self.dispatcher.wait_idle()
+        self.assertEqual(len(limited.delivered), 3)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        dispatcher = NotificationDispatcher(queue_size=2, clock=self.clock)
+        sink = dispatcher.add_sink(BlockingSink())
+        for n in range(5):
+            dispatcher.submit(f"key {n}", "Water", "Drink")
+        # One is being delivered, two wait in the queue, the rest are dropped
+        self.assertGreaterEqual(self.counter("notifications_dropped_memory"), 2)
+        sink.release.set()
+        dispatcher.wait_idle()
+        dispatcher.close()
+        self.assertEqual(len(sink.delivered), 5 - self.counter("notifications_dropped_memory"))
+
+    def test_close_stops_the_workers(self):
+        self.dispatcher.add_sink(MemorySink())
+        self.dispatcher.submit("key", "Water", "Drink")
+        self.dispatcher.close()
+        worker = self.dispatcher._workers[0]
+        worker.thread.join(5)
+        self.assertFalse(worker.thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+from waterreminder.intake_log import JsonlLog
+from waterreminder.retention import archive_segments, compact, iter_archive_lines
+
+TODAY = date(2026, 3, 10)
+ENTRIES = [
+    {"timestamp": "2026-02-27 09:00:00", "type": "drink", "amount": 0.25},
+    {"timestamp": "2026-02-27 12:00:00", "type": "drink", "amount": 0.5},
+    {"timestamp": "2026-02-27 13:00:00", "type": "reminder"},
+    {"timestamp": "2026-03-01 09:00:00", "type": "drink", "amount": 1.0},
+    {"timestamp": "2026-03-09 09:00:00", "type": "drink", "amount": 0.25},
+    {"timestamp": "2026-03-10 09:00:00", "type": "drink", "amount": 0.5},
+]
+
+
+class CompactTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self._tmp.name, "water_intake_log.txt")
+        self.archive_dir = os.path.join(self._tmp.name, "archive")
+        with open(self.log_path, "w", encoding="utf-8") as f:
+            for entry in ENTRIES:
+                f.write(json.dumps(entry) + "\n")
+            f.write("not json\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def hot_lines(self):
+        with open(self.log_path, encoding="utf-8") as f:
+            return [line.rstrip("\n") for line in f]
+
+    def archived(self):
+        return [json.loads(line) for line in iter_archive_lines(self.archive_dir)]
+
+    def totals(self):
+        return JsonlLog(self.log_path, archive_dir=self.archive_dir).daily_totals()
+
+    def test_old_days_become_summaries(self):
+        self.assertEqual(compact(self.log_path, self.archive_dir, 2, today=TODAY), 4)
+        self.assertEqual([os.path.basename(p) for p in archive_segments(self.archive_dir)],
+                         ["water_intake_2026-02.jsonl.gz", "water_intake_2026-03.jsonl.gz"])
+        self.assertEqual(self.archived(), [
+            {"timestamp": "2026-02-27 00:00:00", "type": "day_summary", "amount": 0.75, "count": 2},
+            {"timestamp": "2026-02-27 13:00:00", "type": "reminder"},
+            {"timestamp": "2026-03-01 00:00:00", "type": "day_summary", "amount": 1.0, "count": 1},
+        ])
+        # Recent days and unparseable lines stay hot
+        self.assertEqual(self.hot_lines(), [json.dumps(ENTRIES[4]), json.dumps(ENTRIES[5]), "not json"])
+        self.assertEqual(self.totals(), {"2026-02-27": 0.75, "2026-03-01": 1.0,
+                                         "2026-03-09": 0.25, "2026-03-10": 0.5})
+
+    def test_recompacting_is_a_no_op(self):
+        compact(self.log_path, self.archive_dir, 2, today=TODAY)
+        archived = self.archived()
+        self.assertEqual(compact(self.log_path, self.archive_dir, 2, today=TODAY), 0)
+        self.assertEqual(self.archived(), archived)
+
+    def test_crash_before_replace_does_not_double_count(self):
+        before = self.log_path + ".before"
+        shutil.copy(self.log_path, before)
+        compact(self.log_path, self.archive_dir, 2, today=TODAY)
+        expected = self.totals()
+        archived = self.archived()
+        # As if the process died after writing the archives but before os.replace
+        shutil.copy(before, self.log_path)
+        compact(self.log_path, self.archive_dir, 2, today=TODAY)
+        self.assertEqual(self.archived(), archived)
+        self.assertEqual(self.totals(), expected)
+
+    def test_later_days_append_to_the_same_month(self):
+        compact(self.log_path, self.archive_dir, 10, today=TODAY)
+        self.assertEqual(len(self.archived()), 2)  # February only
+        compact(self.log_path, self.archive_dir, 2, today=TODAY)
+        self.assertEqual([e["timestamp"] for e in self.archived()],
+                         ["2026-02-27 00:00:00", "2026-02-27 13:00:00", "2026-03-01 00:00:00"])
+
+    def test_raw_archiving(self):
+        compact(self.log_path, self.archive_dir, 2, today=TODAY, summarize=False)
+        compact(self.log_path, self.archive_dir, 2, today=TODAY, summarize=False)
+        self.assertEqual(self.archived(), ENTRIES[:4])
+
+    def test_disabled(self):
+        self.assertEqual(compact(self.log_path, self.archive_dir, 0, today=TODAY), 0)
+        self.assertFalse(os.path.exists(self.archive_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
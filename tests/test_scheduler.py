@@ -0,0 +1,128 @@
+import contextlib
+import io
+import unittest
+from datetime import datetime, timedelta
+
+from waterreminder.scheduler import ReminderScheduler
+
+T0 = datetime(2026, 1, 5, 9, 0, 0)
+
+
+class FakeHost:
+    """Manual clock plus a single host timer, like Tk's after()."""
+
+    def __init__(self):
+        self.now = T0
+        self.timers = {}
+        self._tokens = 0
+
+    def clock(self):
+        return self.now
+
+    def call_later(self, seconds, fn):
+        self._tokens += 1
+        self.timers[self._tokens] = (self.now + timedelta(seconds=seconds), fn)
+        return self._tokens
+
+    def cancel_call(self, token):
+        self.timers.pop(token, None)
+
+    def advance(self, seconds):
+        """Move the clock forward, firing host timers as they come due."""
+        end = self.now + timedelta(seconds=seconds)
+        while True:
+            due = [(at, token) for token, (at, _fn) in self.timers.items() if at <= end]
+            if not due:
+                break
+            at, token = min(due)
+            self.now = max(self.now, at)
+            _at, fn = self.timers.pop(token)
+            fn()
+        self.now = end
+
+    def scheduler(self, **kwargs):
+        return ReminderScheduler(
+            clock=self.clock, call_later=self.call_later, cancel_call=self.cancel_call, **kwargs
+        )
+
+
+class ReminderSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.host = FakeHost()
+        self.scheduler = self.host.scheduler()
+        self.fired = []
+
+    def record(self, name):
+        return lambda deadline: self.fired.append((name, deadline))
+
+    def test_fires_in_deadline_order(self):
+        self.scheduler.schedule("b", T0 + timedelta(minutes=2), self.record("b"))
+        self.scheduler.schedule("a", T0 + timedelta(minutes=1), self.record("a"))
+        self.host.advance(180)
+        self.assertEqual([name for name, _ in self.fired], ["a", "b"])
+        self.assertEqual(len(self.host.timers), 0)
+
+    def test_reschedule_replaces_job(self):
+        self.scheduler.schedule("a", T0 + timedelta(minutes=1), self.record("first"))
+        self.scheduler.schedule("a", T0 + timedelta(minutes=5), self.record("second"))
+        self.host.advance(120)
+        self.assertEqual(self.fired, [])
+        self.host.advance(240)
+        self.assertEqual(self.fired, [("second", T0 + timedelta(minutes=5))])
+
+    def test_cancel(self):
+        self.scheduler.schedule("a", T0 + timedelta(minutes=1), self.record("a"))
+        self.scheduler.cancel("a")
+        self.host.advance(120)
+        self.assertEqual(self.fired, [])
+        self.assertIsNone(self.scheduler.next_deadline())
+
+    def test_failing_callback_does_not_stop_other_jobs(self):
+        def boom(deadline):
+            raise RuntimeError("boom")
+
+        self.scheduler.schedule("bad", T0 + timedelta(minutes=1), boom)
+        self.scheduler.schedule("good", T0 + timedelta(minutes=1), self.record("good"))
+        self.scheduler.schedule("later", T0 + timedelta(minutes=10), self.record("later"))
+        with contextlib.redirect_stderr(io.StringIO()) as err:
+            self.host.advance(60)
+        self.assertIn("boom", err.getvalue())
+        self.assertEqual([name for name, _ in self.fired], ["good"])
+
+        # The host timer was re-armed for the remaining job
+        self.assertEqual(len(self.host.timers), 1)
+        self.host.advance(600)
+        self.assertEqual([name for name, _ in self.fired], ["good", "later"])
+
+    def test_failing_callback_that_rescheduled_itself_keeps_running(self):
+        calls = []
+
+        def flaky(deadline):
+            calls.append(deadline)
+            self.scheduler.schedule("flaky", deadline + timedelta(minutes=1), flaky)
+            raise RuntimeError("flaky")
+
+        self.scheduler.schedule("flaky", T0 + timedelta(minutes=1), flaky)
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.host.advance(3 * 60)
+        self.assertEqual(len(calls), 3)
+
+    def test_max_timer_caps_host_timer(self):
+        scheduler = self.host.scheduler(max_timer=60)
+        scheduler.schedule("a", T0 + timedelta(hours=1), self.record("a"))
+        (at, _fn), = self.host.timers.values()
+        self.assertEqual(at, T0 + timedelta(seconds=60))
+        self.host.advance(3600)
+        self.assertEqual(self.fired, [("a", T0 + timedelta(hours=1))])
+
+    def test_run_due_without_host_timer(self):
+        host = FakeHost()
+        scheduler = ReminderScheduler(clock=host.clock)
+        scheduler.schedule("a", T0 + timedelta(minutes=1), self.record("a"))
+        self.assertEqual(scheduler.run_due(), 0)
+        host.now += timedelta(minutes=1)
+        self.assertEqual(scheduler.run_due(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
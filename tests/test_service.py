@@ -0,0 +1,93 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from waterreminder.service import ReminderService
+
+NOW = datetime(2026, 1, 5, 10, 0, 0)
+
+
+class ReminderServiceTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.service = ReminderService(self.tmp.name, loop=self.loop)
+
+    def request(self, method, path, payload=None):
+        return self.service.handle_request(method, path, json.dumps(payload) if payload is not None else "")
+
+    def saved_settings(self, user_id):
+        with open(os.path.join(self.tmp.name, "users", user_id, "settings.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_invalid_settings_are_rejected_and_not_saved(self):
+        self.assertEqual(self.request("PUT", "/users/ann/settings", {"daily_goal": 3})[0], 200)
+        for bad in ({"daily_goal": "abc"}, {"start_time": 8}, {"interval": 5, "log_storage": "xml"}, [1]):
+            with self.subTest(bad=bad):
+                status, payload = self.request("PUT", "/users/ann/settings", bad)
+                self.assertEqual(status, 400)
+                self.assertIn("error", payload)
+        self.assertEqual(self.saved_settings("ann")["daily_goal"], 3.0)
+        self.assertEqual(self.saved_settings("ann")["interval"], 60)
+        self.assertEqual(self.request("GET", "/users/ann/progress")[0], 200)
+
+    def test_non_object_bodies_are_rejected(self):
+        self.request("PUT", "/users/dee/settings", {})
+        for path, method in (("/users/dee/drink", "POST"), ("/users/dee/settings", "PUT")):
+            for body in ([1], "0.25", None):
+                with self.subTest(path=path, body=body):
+                    status, payload = self.service.handle_request(method, path, json.dumps(body))
+                    self.assertEqual(status, 400)
+                    self.assertIn("error", payload)
+
+    def test_invalid_drink_amounts_are_rejected(self):
+        self.request("PUT", "/users/eve/settings", {})
+        for amount in ("nan", "inf", float("-inf"), -0.25, 0, "abc", True):
+            with self.subTest(amount=amount):
+                self.assertEqual(self.request("POST", "/users/eve/drink", {"amount": amount})[0], 400)
+        status, progress = self.request("POST", "/users/eve/drink", {"amount": "0.5"})
+        self.assertEqual((status, progress["total"]), (200, 0.5))
+        json.dumps(self.request("GET", "/users/eve/progress")[1], allow_nan=False)
+
+    def test_settings_are_normalized(self):
+        status, settings = self.request("PUT", "/users/bob/settings", {"daily_goal": "2.5", "interval": "30"})
+        self.assertEqual(status, 200)
+        self.assertEqual((settings["daily_goal"], settings["interval"]), (2.5, 30))
+
+    def test_storage_change_closes_the_old_store(self):
+        self.request("PUT", "/users/cy/settings", {})
+        self.request("POST", "/users/cy/drink", {"amount": 0.25})
+        old = self.service.users["cy"]._store
+        self.request("PUT", "/users/cy/settings", {"daily_goal": 2.5})
+        self.assertIs(self.service.users["cy"]._store, old)
+        self.request("PUT", "/users/cy/settings", {"log_storage": "sqlite"})
+        self.assertIsNone(self.service.users["cy"]._store)
+        self.assertEqual(self.request("POST", "/users/cy/drink", {"amount": 0.25})[0], 200)
+        self.service.users["cy"]._store.close()
+
+    def test_progress_survives_a_restart(self):
+        for storage in ("jsonl", "segmented", "binary", "sqlite"):
+            with self.subTest(storage=storage):
+                user_id = f"u-{storage}"
+                service = ReminderService(self.tmp.name, clock=lambda: NOW, loop=self.loop)
+                service.set_user(user_id, {"log_storage": storage})
+                service.log_drink(user_id, 0.25)
+                service.log_drink(user_id, 0.5)
+                for user in list(service.users):
+                    service.remove_user(user)
+
+                restarted = ReminderService(self.tmp.name, clock=lambda: NOW, loop=self.loop)
+                restarted.load_users()
+                self.assertEqual(restarted.progress(user_id)["total"], 0.75)
+                self.assertEqual(restarted.users[user_id].last_drink_time, NOW)
+                for user in list(restarted.users):
+                    restarted.remove_user(user)
+
+
+if __name__ == "__main__":
+    unittest.main()
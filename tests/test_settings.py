@@ -0,0 +1,63 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import time
+
+from waterreminder.settings import SettingsStore
+
+DEFAULTS = {"start_time": "08:00", "end_time": "20:00", "interval": 60, "daily_goal": 2.0,
+            "reminder_windows": []}
+
+
+class SettingsStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "settings.json")
+
+    def store(self, saved=None):
+        if saved is not None:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(saved, f)
+        with contextlib.redirect_stderr(io.StringIO()):
+            store = SettingsStore(self.path, DEFAULTS, save_delay=60)
+        self.addCleanup(store.close)
+        return store
+
+    def test_bad_values_in_file_fall_back_to_defaults(self):
+        store = self.store({"start_time": 8, "end_time": "21:30", "interval": "x",
+                            "reminder_windows": [["08:00", 9]]})
+        self.assertEqual(store["start_time"], "08:00")
+        self.assertEqual(store.value("end_time"), time(21, 30))
+        self.assertEqual(store["interval"], 60)
+        self.assertEqual(store["reminder_windows"], [])
+
+    def test_update_is_all_or_nothing(self):
+        store = self.store()
+        with self.assertRaises(ValueError):
+            store.update(interval=30, start_time=8)
+        self.assertEqual(store["interval"], 60)
+
+    def test_subscribers_see_only_relevant_changes(self):
+        store = self.store()
+        seen = []
+        store.subscribe(seen.append, ["interval"])
+        store.update(daily_goal="2.5")
+        store.update(interval="30", daily_goal=2.5)
+        self.assertEqual(seen, [{"interval"}])
+
+    def test_flush_writes_parsed_values(self):
+        store = self.store()
+        store.update(interval="45", reminder_windows=["7:00-12:00"])
+        store.flush()
+        with open(self.path, encoding="utf-8") as f:
+            saved = json.load(f)
+        self.assertEqual(saved["interval"], 45)
+        self.assertEqual(saved["reminder_windows"], ["07:00-12:00"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+from waterreminder.sound import DEFAULT_SOUND, SoundCache, SoundPlayer
+
+
+class FakeBackend:
+    def __init__(self):
+        self.decoded = []
+        self.played = []
+
+    def decode(self, path):
+        self.decoded.append(os.path.basename(path))
+        return path, 100
+
+    def play_decoded(self, handle):
+        self.played.append(os.path.basename(handle))
+
+
+class SoundCacheTest(unittest.TestCase):
+    def test_least_recently_used_is_evicted_past_the_byte_limit(self):
+        cache = SoundCache(max_bytes=250)
+        cache.put("a", 1, "A", 100)
+        cache.put("b", 1, "B", 100)
+        self.assertEqual(cache.get("a", 1), "A")  # b is now the oldest
+        cache.put("c", 1, "C", 100)
+        self.assertEqual((len(cache), cache.used_bytes), (2, 200))
+        self.assertIsNone(cache.get("b", 1))
+        self.assertEqual(cache.peek("a"), "A")
+        self.assertEqual(cache.peek("c"), "C")
+
+    def test_oversized_entries_are_not_kept(self):
+        cache = SoundCache(max_bytes=250)
+        cache.put("a", 1, "A", 100)
+        cache.put("huge", 1, "H", 300)
+        self.assertIsNone(cache.peek("huge"))
+        self.assertEqual((len(cache), cache.used_bytes), (1, 100))
+
+    def test_replacing_and_stale_entries_keep_the_byte_count(self):
+        cache = SoundCache(max_bytes=250)
+        cache.put("a", 1, "A", 100)
+        cache.put("a", 2, "A2", 150)
+        self.assertEqual(cache.used_bytes, 150)
+        self.assertIsNone(cache.get("a", 3))  # file changed since it was decoded
+        self.assertEqual((len(cache), cache.used_bytes), (0, 0))
+
+
+class SoundPlayerTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        for name in (DEFAULT_SOUND, "ding.wav"):
+            with open(os.path.join(self._tmp.name, name), "wb") as f:
+                f.write(b"RIFF")
+        self.backend = FakeBackend()
+        self.backend_requests = 0
+
+    def get_backend(self):
+        self.backend_requests += 1
+        return self.backend
+
+    def test_nothing_is_decoded_until_asked(self):
+        player = SoundPlayer(self.get_backend, self._tmp.name, "ding.wav")
+        self.assertIsNone(player._worker)
+        self.assertEqual(self.backend_requests, 0)
+
+        player.play()
+        player.close()
+        player._worker.join(5)
+        self.assertEqual((self.backend.decoded, self.backend.played), (["ding.wav"], ["ding.wav"]))
+
+    def test_warm_decodes_once_for_later_plays(self):
+        player = SoundPlayer(self.get_backend, self._tmp.name, "missing.wav")
+        player.warm()
+        player.play()
+        player.play()
+        player.close()
+        player._worker.join(5)
+        self.assertEqual(self.backend.decoded, [DEFAULT_SOUND])
+        self.assertEqual(self.backend.played, [DEFAULT_SOUND, DEFAULT_SOUND])
+        self.assertEqual(self.backend_requests, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
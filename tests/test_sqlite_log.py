@@ -0,0 +1,100 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from waterreminder.sqlite_log import SqliteLog, migrate_lines
+
+
+def drink(timestamp, amount=0.25):
+    return {"timestamp": timestamp, "type": "drink", "amount": amount}
+
+
+class SqliteLogTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "water_intake.db")
+        self.log = SqliteLog(self.path)
+
+    def tearDown(self):
+        self.log.close()
+        self._tmp.cleanup()
+
+    def test_append_is_committed_right_away(self):
+        self.log.append(drink("2026-01-05 09:00:00"))
+        # Another connection (or the next process after a crash) sees it without flush()/close()
+        other = sqlite3.connect(self.path)
+        try:
+            self.assertEqual(other.execute("SELECT count(*) FROM events").fetchone()[0], 1)
+        finally:
+            other.close()
+
+    def test_batched_appends_flush_before_reads(self):
+        log = SqliteLog(os.path.join(self._tmp.name, "batched.db"), batch_size=10)
+        for minute in range(3):
+            log.append(drink(f"2026-01-05 09:0{minute}:00"))
+        self.assertEqual(len(log._pending), 3)
+        self.assertEqual(len(log), 3)
+        log.close()
+
+    def test_queries(self):
+        for entry in (drink("2026-01-05 09:00:00"), drink("2026-01-05 12:00:00", 0.5),
+                      {"timestamp": "2026-01-05 23:59:00", "type": "reminder"},
+                      drink("2026-01-06 08:00:00")):
+            self.log.append(entry)
+        self.assertEqual(len(self.log), 4)
+        self.assertEqual(self.log.day_progress("2026-01-05"), (0.75, 2, "2026-01-05 12:00:00"))
+        self.assertEqual(self.log.total_for_day("2026-01-06"), 0.25)
+        self.assertEqual(self.log.daily_totals(), {"2026-01-05": 0.75, "2026-01-06": 0.25})
+        self.assertEqual([e["timestamp"] for e in self.log.last_events(2)],
+                         ["2026-01-05 23:59:00", "2026-01-06 08:00:00"])
+        self.assertEqual(len(list(self.log.iter_range("2026-01-06", "2026-01-06"))), 1)
+
+    def test_iter_range_pages_in_timestamp_order(self):
+        # Inserted out of order, with duplicate timestamps across page boundaries
+        for ts in ("2026-01-05 10:00:00", "2026-01-05 09:00:00", "2026-01-05 10:00:00",
+                   "2026-01-05 09:00:00", "2026-01-05 11:00:00"):
+            self.log.append(drink(ts))
+        entries = list(self.log.iter_range(page_size=2))
+        self.assertEqual([e["timestamp"] for e in entries], sorted(e["timestamp"] for e in entries))
+        self.assertEqual(len(entries), 5)
+
+    def test_users_are_separate(self):
+        other = SqliteLog(self.path, user="ann")
+        other.append(drink("2026-01-05 09:00:00"))
+        self.log.append(drink("2026-01-05 09:00:00", 0.5))
+        self.assertEqual(other.daily_totals(), {"2026-01-05": 0.25})
+        other.clear()
+        self.assertEqual(len(other), 0)
+        self.assertEqual(len(self.log), 1)
+        other.close()
+
+    def test_line_source_restarts_after_clear(self):
+        source = self.log.line_source()
+        self.log.append(drink("2026-01-05 09:00:00"))
+        self.assertFalse(source.refresh())
+        self.assertEqual(len(source), 1)
+        self.log.clear()
+        self.log.append(drink("2026-01-06 09:00:00"))
+        self.assertTrue(source.refresh())
+        self.assertEqual([json.loads(line)["timestamp"] for line in source.lines(0, len(source))],
+                         ["2026-01-06 09:00:00"])
+
+    def test_migrate_lines_keeps_lines_verbatim(self):
+        lines = ['{"timestamp": "2026-01-05 09:00:00", "type": "drink", "amount": 1}\n', "\n", "not json\n"]
+        self.assertEqual(migrate_lines(lines, self.log, chunk_size=1), 2)
+        rows = self.log._query("SELECT timestamp, amount, line FROM events ORDER BY id")
+        self.assertEqual(rows, [("2026-01-05 09:00:00", 1.0, lines[0].strip()), ("", None, "not json")])
+
+    def test_read_only_store_refuses_writes(self):
+        self.log.append(drink("2026-01-05 09:00:00"))
+        reader = SqliteLog(self.path, read_only=True)
+        self.assertEqual(len(reader), 1)
+        with self.assertRaises(sqlite3.OperationalError):
+            reader.append(drink("2026-01-05 10:00:00"))
+        reader.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
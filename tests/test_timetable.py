@@ -0,0 +1,43 @@
+import unittest
+from datetime import date, datetime, time, timedelta
+
+from waterreminder.timetable import Timetable, parse_window
+
+DAY = date(2026, 1, 5)
+
+
+def at(hh, mm, day=DAY):
+    return datetime.combine(day, time(hh, mm))
+
+
+class TimetableTest(unittest.TestCase):
+    def test_day_window(self):
+        timetable = Timetable([parse_window("08:00-20:00")], timedelta(hours=1))
+        self.assertTrue(timetable.is_active(at(8, 0)))
+        self.assertTrue(timetable.is_active(at(20, 0)))
+        self.assertFalse(timetable.is_active(at(20, 1)))
+        self.assertEqual(timetable.next_reminder(at(9, 30)), at(9, 30))
+        self.assertEqual(timetable.next_reminder(at(21, 0)), at(8, 0, DAY + timedelta(days=1)))
+
+    def test_overnight_window(self):
+        timetable = Timetable([parse_window("22:00-06:00")], timedelta(hours=2))
+        self.assertTrue(timetable.is_active(at(23, 0)))
+        self.assertTrue(timetable.is_active(at(5, 0)))
+        self.assertFalse(timetable.is_active(at(12, 0)))
+        self.assertEqual(timetable.next_slot(at(12, 0)), at(22, 0))
+
+    def test_rebuilds_on_date_rollover(self):
+        timetable = Timetable([parse_window(["09:00", "10:00"])], timedelta(minutes=30))
+        timetable.is_active(at(9, 0))
+        tomorrow = DAY + timedelta(days=1)
+        self.assertEqual(timetable.next_slot(at(11, 0, tomorrow)), at(9, 0, tomorrow + timedelta(days=1)))
+        self.assertEqual(timetable.day, tomorrow)
+
+    def test_invalid_windows(self):
+        for window in ("08:00", "8-9", 8, ["08:00", 9]):
+            with self.subTest(window=window), self.assertRaises((ValueError, TypeError)):
+                parse_window(window)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import threading
+import unittest
+
+from waterreminder.ui_bridge import UiBridge
+
+
+class FakeWidget:
+    """after()/after_cancel() with timers fired by hand."""
+
+    def __init__(self):
+        self.timers = {}
+        self._next_id = 0
+
+    def after(self, ms, fn):
+        self._next_id += 1
+        self.timers[self._next_id] = fn
+        return self._next_id
+
+    def after_cancel(self, after_id):
+        del self.timers[after_id]
+
+    def fire(self):
+        timers, self.timers = self.timers, {}
+        for fn in timers.values():
+            fn()
+
+
+class UiBridgeTest(unittest.TestCase):
+    def setUp(self):
+        self.widget = FakeWidget()
+        self.bridge = UiBridge(self.widget, poll_ms=10)
+        self.ran = []
+
+    def test_commands_from_other_threads_run_on_the_poll(self):
+        self.bridge.start()
+        threads = [threading.Thread(target=self.bridge.command(lambda n=n: self.ran.append(n)))
+                   for n in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.ran, [])
+        self.widget.fire()
+        self.assertEqual(sorted(self.ran), list(range(20)))
+        self.assertEqual(len(self.widget.timers), 1)  # polling goes on
+
+    def test_post_passes_arguments(self):
+        self.bridge.post(self.ran.append, "x")
+        self.assertEqual(self.bridge.drain(), 1)
+        self.assertEqual((self.ran, self.bridge.drain()), (["x"], 0))
+
+    def test_no_timer_while_stopped(self):
+        self.assertEqual(self.widget.timers, {})
+        self.bridge.start()
+        self.bridge.start()
+        self.assertEqual(len(self.widget.timers), 1)
+        self.bridge.stop()
+        self.assertEqual(self.widget.timers, {})
+        self.bridge.post(self.ran.append, 1)
+        self.widget.fire()
+        self.assertEqual(self.ran, [])  # kept until the next start or drain
+
+    def test_command_that_stops_the_bridge_ends_polling(self):
+        self.bridge.start()
+        self.bridge.command(self.bridge.stop)(icon=None, item=None)
+        self.widget.fire()
+        self.assertFalse(self.bridge.running)
+        self.assertEqual(self.widget.timers, {})
+
+    def test_close_stops(self):
+        self.bridge.start()
+        self.bridge.close()
+        self.assertEqual((self.bridge.running, self.widget.timers), (False, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
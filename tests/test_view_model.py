@@ -0,0 +1,75 @@
+import unittest
+
+from waterreminder.view_model import ViewModel
+
+
+class FakeWidget:
+    def __init__(self):
+        self.options = {}
+        self.configs = 0
+
+    def config(self, **options):
+        self.options.update(options)
+        self.configs += 1
+
+
+class ViewModelTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduled = []
+        self.view = ViewModel(self.scheduled.append)
+        self.state = {"total": 0.5, "goal": 2.0}
+        self.total_label = FakeWidget()
+        self.progress = FakeWidget()
+        self.view.bind("total", self.total_label, lambda: f"{self.state['total']} L")
+        self.view.bind("progress", self.progress, lambda: self.state["total"] / self.state["goal"], option="value")
+
+    def run_idle(self):
+        scheduled, self.scheduled[:] = list(self.scheduled), []
+        for fn in scheduled:
+            fn()
+
+    def test_bound_fields_start_dirty(self):
+        self.view.flush()
+        self.assertEqual(self.total_label.options, {"text": "0.5 L"})
+        self.assertEqual(self.progress.options, {"value": 0.25})
+
+    def test_changes_coalesce_into_one_idle_flush(self):
+        self.view.flush()
+        for total in (0.75, 1.0, 1.25):
+            self.state["total"] = total
+            self.view.invalidate("total", "progress")
+        self.assertEqual(len(self.scheduled), 1)
+        self.run_idle()
+        self.assertEqual((self.total_label.options["text"], self.total_label.configs), ("1.25 L", 2))
+        self.assertEqual(self.view.flushes, 2)
+
+    def test_unchanged_values_do_not_touch_widgets(self):
+        self.view.flush()
+        self.view.invalidate_all()
+        self.run_idle()
+        self.assertEqual((self.total_label.configs, self.progress.configs), (1, 1))
+
+        self.state["goal"] = 1.0
+        self.view.invalidate("progress")
+        self.run_idle()
+        self.assertEqual((self.total_label.configs, self.progress.configs), (1, 2))
+
+    def test_actions_run_only_when_dirty(self):
+        calls = []
+        self.view.bind_action("log", lambda: calls.append("log"))
+        self.view.flush()
+        self.view.invalidate("total")
+        self.run_idle()
+        self.assertEqual(calls, ["log"])
+        self.view.invalidate("log")
+        self.run_idle()
+        self.assertEqual(calls, ["log", "log"])
+
+    def test_empty_flush_is_not_counted(self):
+        self.view.flush()
+        self.view.flush()
+        self.assertEqual(self.view.flushes, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
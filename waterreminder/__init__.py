@@ -0,0 +1 @@
+# Headless core of the Water Reminder app (no Tk / Windows imports here).
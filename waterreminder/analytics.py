@@ -0,0 +1,278 @@
+"""Vectorized hydration analytics.
+
+Drink events are kept as NumPy columns (timestamp seconds, amount, user
+code). Per-day totals and the weekday x hour heatmap are accumulated with
+np.add.at, so appending new drinks only touches the affected cells. The
+derived views (goal attainment, rolling averages, streaks) are computed
+from the per-day totals in single vectorized passes and cached until the
+next append.
+
+NumPy is optional for the app (Build.bat leaves it out of the exe); this
+module needs it.
+"""
+from datetime import date
+
+from .bulk_parse import TYPE_CODES
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - reported on use
+    np = None
+
+DEFAULT_USER = ""
+_DAY = 86400
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("hydration analytics need NumPy: pip install numpy")
+
+
+class _UserAggregates:
+    def __init__(self):
+        self.day0 = None  # day number (days since epoch) of totals[0]
+        self.totals = np.zeros(0)
+        self.heatmap = np.zeros((7, 24))
+        self.derived = {}
+
+    def add(self, seconds, amounts, heatmap=True):
+        days = seconds // _DAY
+        lo, hi = int(days.min()), int(days.max())
+        if self.day0 is None:
+            self.day0 = lo
+            self.totals = np.zeros(hi - lo + 1)
+        else:
+            if lo < self.day0:
+                self.totals = np.concatenate([np.zeros(self.day0 - lo), self.totals])
+                self.day0 = lo
+            if hi - self.day0 + 1 > len(self.totals):
+                self.totals = np.concatenate([self.totals, np.zeros(hi - self.day0 + 1 - len(self.totals))])
+        np.add.at(self.totals, days - self.day0, amounts)
+        self.derived.clear()
+        if not heatmap:
+            return
+
+        # 1970-01-01 was a Thursday: (days + 3) % 7 gives Monday = 0
+        weekday = (days + 3) % 7
+        hour = (seconds % _DAY) // 3600
+        np.add.at(self.heatmap, (weekday, hour), amounts)
+
+
+class IntakeAnalytics:
+    def __init__(self, daily_goal):
+        _require_numpy()
+        self.daily_goal = float(daily_goal)
+        self.user_codes = {}
+        self._aggregates = {}
+        # Columns are over-allocated and grown by doubling, so appends are amortized O(batch)
+        self._n = 0
+        self._seconds = np.zeros(1024, dtype=np.int64)
+        self._amounts = np.zeros(1024)
+        self._users = np.zeros(1024, dtype=np.int32)
+
+    @classmethod
+    def from_store(cls, store, daily_goal, start=None, end=None, workers=None):
+        """Build from any log store (JsonlLog, SegmentedLog, BinaryLog, ...).
+
+        Stores with bulk_columns() (JsonlLog) are parsed in `workers`
+        processes (see bulk_parse.py) instead of entry by entry.
+        """
+        analytics = cls(daily_goal)
+        if hasattr(store, "bulk_columns"):
+            analytics.append_columns(store.bulk_columns(workers), start, end)
+        else:
+            analytics.append(store.iter_range(start, end))
+        return analytics
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def seconds(self):
+        return self._seconds[:self._n]
+
+    @property
+    def amounts(self):
+        return self._amounts[:self._n]
+
+    @property
+    def users(self):
+        return self._users[:self._n]
+
+    def _reserve(self, extra):
+        needed = self._n + extra
+        if needed <= len(self._seconds):
+            return
+        capacity = max(needed, 2 * len(self._seconds))
+        for name in ("_seconds", "_amounts", "_users"):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:self._n] = old[:self._n]
+            setattr(self, name, grown)
+
+    # ---------- Loading ----------
+
+    def append(self, entries, batch_size=100_000):
+        """Add drink entries (dicts as written to the log); other types are skipped.
+
+        Archived "day_summary" records (see retention.py) count towards the
+        day totals only, since their time of day is unknown.
+        """
+        timestamps, amounts, users = [], [], []
+        for entry in entries:
+            kind = entry.get("type")
+            if kind == "day_summary":
+                self._add_summary(entry)
+                continue
+            if kind != "drink":
+                continue
+            timestamps.append(entry["timestamp"])
+            amounts.append(entry.get("amount", 0))
+            users.append(entry.get("user", DEFAULT_USER))
+            if len(timestamps) >= batch_size:
+                self._append_columns(timestamps, amounts, users)
+                timestamps, amounts, users = [], [], []
+        if timestamps:
+            self._append_columns(timestamps, amounts, users)
+
+    def append_columns(self, columns, start=None, end=None):
+        """Add a bulk_parse.Columns, optionally only the days start..end (inclusive)."""
+        if not len(columns):
+            return
+        seconds = np.frombuffer(columns.seconds, dtype=np.int64)
+        amounts = np.frombuffer(columns.amounts, dtype=np.float64)
+        types = np.frombuffer(columns.types, dtype=np.uint8)
+        remap = np.array([self.user_codes.setdefault(u, len(self.user_codes)) for u in columns.user_names],
+                         dtype=np.int32)
+        codes = remap[np.frombuffer(columns.users, dtype=np.int32)]
+
+        keep = np.ones(len(seconds), dtype=bool)
+        if start is not None:
+            keep &= seconds >= np.datetime64(str(start), "D").astype(np.int64) * _DAY
+        if end is not None:
+            keep &= seconds < (np.datetime64(str(end), "D").astype(np.int64) + 1) * _DAY
+
+        drinks = keep & (types == TYPE_CODES["drink"])
+        self._append_arrays(seconds[drinks], amounts[drinks], codes[drinks])
+        summaries = keep & (types == TYPE_CODES["day_summary"])
+        if summaries.any():
+            for user, rows in self._by_user(codes[summaries]):
+                self._user_agg(user).add(seconds[summaries][rows], amounts[summaries][rows], heatmap=False)
+
+    def _append_columns(self, timestamps, amounts, users):
+        # Naive local wall-clock times, parsed as-is (no timezone shift)
+        seconds = np.array(timestamps, dtype="datetime64[s]").astype(np.int64)
+        amounts = np.asarray(amounts, dtype=np.float64)
+        codes = np.fromiter(
+            (self.user_codes.setdefault(u, len(self.user_codes)) for u in users),
+            dtype=np.int32, count=len(users)
+        )
+        self._append_arrays(seconds, amounts, codes)
+
+    def _append_arrays(self, seconds, amounts, codes):
+        if not len(seconds):
+            return
+        self._reserve(len(seconds))
+        end = self._n + len(seconds)
+        self._seconds[self._n:end] = seconds
+        self._amounts[self._n:end] = amounts
+        self._users[self._n:end] = codes
+        self._n = end
+
+        # Only the users present in this batch get their aggregates touched
+        for user, rows in self._by_user(codes):
+            self._user_agg(user).add(seconds[rows], amounts[rows])
+
+    def _by_user(self, codes):
+        """(user, row indices) for each user code present in `codes`."""
+        names = {code: user for user, code in self.user_codes.items()}
+        order = np.argsort(codes, kind="stable")
+        present, starts = np.unique(codes[order], return_index=True)
+        for code, rows in zip(present, np.split(order, starts[1:])):
+            yield names[int(code)], rows
+
+    def _user_agg(self, user):
+        agg = self._aggregates.get(user)
+        if agg is None:
+            agg = self._aggregates[user] = _UserAggregates()
+        return agg
+
+    def _add_summary(self, entry):
+        user = entry.get("user", DEFAULT_USER)
+        self.user_codes.setdefault(user, len(self.user_codes))
+        agg = self._user_agg(user)
+        seconds = np.array([entry["timestamp"]], dtype="datetime64[s]").astype(np.int64)
+        agg.add(seconds, np.array([float(entry.get("amount", 0))]), heatmap=False)
+
+    def _agg(self, user):
+        agg = self._aggregates.get(user)
+        if agg is None:
+            agg = _UserAggregates()
+        return agg
+
+    # ---------- Aggregates ----------
+
+    def daily_totals(self, user=DEFAULT_USER):
+        """(days as datetime64[D], liters per day), every day from first to last drink."""
+        agg = self._agg(user)
+        if agg.day0 is None:
+            return np.zeros(0, dtype="datetime64[D]"), agg.totals
+        days = np.arange(agg.day0, agg.day0 + len(agg.totals)).astype("datetime64[D]")
+        return days, agg.totals
+
+    def goal_attainment(self, user=DEFAULT_USER):
+        """Fraction of the daily goal reached on each day."""
+        agg = self._agg(user)
+        if "attainment" not in agg.derived:
+            agg.derived["attainment"] = agg.totals / self.daily_goal if self.daily_goal > 0 else np.ones_like(agg.totals)
+        return agg.derived["attainment"]
+
+    def rolling_average(self, window, user=DEFAULT_USER):
+        """Trailing mean of daily totals over `window` days (shorter at the start)."""
+        agg = self._agg(user)
+        key = ("rolling", window)
+        if key not in agg.derived:
+            csum = np.concatenate([[0.0], np.cumsum(agg.totals)])
+            idx = np.arange(1, len(agg.totals) + 1)
+            start = np.maximum(idx - window, 0)
+            agg.derived[key] = (csum[idx] - csum[start]) / (idx - start)
+        return agg.derived[key]
+
+    def streaks(self, user=DEFAULT_USER, today=None):
+        """{"current": n, "longest": n} consecutive days meeting the goal.
+
+        The current streak runs up to today, or up to yesterday while today's
+        goal is still open; it is 0 once a whole day has been missed.
+        """
+        agg = self._agg(user)
+        today = np.datetime64(str(today or date.today()), "D").astype(np.int64)
+        key = ("streaks", int(today))
+        if key not in agg.derived:
+            met = self.goal_attainment(user) >= 1.0
+            if not met.any():
+                result = {"current": 0, "longest": 0}
+            else:
+                # Run lengths of True between False boundaries
+                padded = np.concatenate([[False], met, [False]]).astype(np.int8)
+                edges = np.flatnonzero(np.diff(padded))
+                runs = edges[1::2] - edges[::2]
+                result = {"current": self._current_streak(met, today - agg.day0), "longest": int(runs.max())}
+            agg.derived[key] = result
+        return agg.derived[key]
+
+    @staticmethod
+    def _current_streak(met, today):
+        """Length of the run of met days ending today or yesterday (`today` indexes met)."""
+        if today < 0:
+            return 0
+        met = met[:today + 1]
+        if len(met) == today + 1 and not met[-1]:
+            met = met[:-1]  # today is not over yet
+        if len(met) < today or not met[-1]:
+            return 0
+        missed = np.flatnonzero(~met)
+        return int(len(met) - 1 - missed[-1]) if len(missed) else len(met)
+
+    def hourly_heatmap(self, user=DEFAULT_USER):
+        """7 x 24 liters by weekday (Monday = 0) and hour of day."""
+        return self._agg(user).heatmap
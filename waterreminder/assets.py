@@ -0,0 +1,69 @@
+"""Image assets: decoded once per process, resized once per machine.
+
+Resized variants (e.g. the 300x150 logo) are rendered with Pillow on
+first use and stored as PNGs in a cache directory, named after a hash of
+the source file's contents and the target size, so an edited source never
+serves a stale variant. From then on an image is just a PNG that Tk
+decodes itself: neither Pillow nor a resample is on the startup path.
+
+Each (source, size) becomes one PhotoImage per process, shared by every
+window and dialog that shows it.
+"""
+import hashlib
+import os
+import tempfile
+
+
+class ImageAssets:
+    def __init__(self, cache_dir, make_photo):
+        """make_photo: make_photo(file=path) -> image object, e.g. tk.PhotoImage."""
+        self.cache_dir = cache_dir
+        self.make_photo = make_photo
+        self._photos = {}
+        self._digests = {}  # path -> ((mtime_ns, size), content hash)
+
+    def photo(self, path, size=None):
+        """Shared image object for `path`, optionally resized to size=(w, h)."""
+        key = (path, size)
+        image = self._photos.get(key)
+        if image is None:
+            source = path if size is None else self.variant(path, size)
+            image = self._photos[key] = self.make_photo(file=source)
+        return image
+
+    def variant(self, path, size):
+        """Path of a PNG of `path` resized to `size`, rendering it if not cached yet."""
+        name = f"{self._digest(path)}-{size[0]}x{size[1]}.png"
+        target = os.path.join(self.cache_dir, name)
+        if os.path.exists(target):
+            return target
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _render(path, size, target)
+        except OSError:
+            # Read-only install: keep the variants in the temp directory instead
+            target = os.path.join(tempfile.gettempdir(), "water-reminder-images", name)
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                _render(path, size, target)
+        return target
+
+    def _digest(self, path):
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._digests.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:16]
+        self._digests[path] = (stamp, digest)
+        return digest
+
+
+def _render(path, size, target):
+    from PIL import Image
+
+    tmp = target + ".tmp"
+    with Image.open(path) as image:
+        image.resize(size, Image.Resampling.LANCZOS).save(tmp, "PNG")
+    os.replace(tmp, target)
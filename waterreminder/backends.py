@@ -0,0 +1,213 @@
+"""Platform backends for notifications, sound, the tray icon and autostart.
+
+Nothing platform specific is imported until a backend is first used, so
+the core (and the window) comes up without paying for pygame, pystray or
+the Windows COM modules, and the app loads on Linux at all. Where a real
+implementation is missing, a null/console one is used instead.
+
+Set WATER_REMINDER_HEADLESS=1 to force the null/console backends.
+"""
+import os
+import sys
+import threading
+
+
+def _headless():
+    return os.environ.get("WATER_REMINDER_HEADLESS", "") not in ("", "0")
+
+
+# ---------- Notifications ----------
+
+class ToastNotifierBackend:
+    def __init__(self):
+        from win10toast import ToastNotifier
+        self._notifier = ToastNotifier()
+
+    def notify(self, title, message, icon_path=None):
+        # Blocks for the toast's duration; callers run this on the
+        # notification dispatcher's toast worker, not the Tk thread.
+        self._notifier.show_toast(
+            title,
+            message,
+            icon_path=icon_path,
+            duration=5,
+            threaded=False
+        )
+
+
+class ConsoleNotifier:
+    def notify(self, title, message, icon_path=None):
+        print(f"[{title}] {message}", flush=True)
+
+
+# ---------- Sound ----------
+
+class PygameSound:
+    def __init__(self):
+        import pygame
+        pygame.mixer.init()
+        self._pygame = pygame
+        self._music = pygame.mixer.music
+        self._channel = None
+
+    def play(self, path):
+        self._music.stop()
+        self._music.load(path)
+        self._music.play()
+
+    def decode(self, path):
+        """Decode a file into a sample buffer; returns (handle, size in bytes)."""
+        sound = self._pygame.mixer.Sound(path)
+        return sound, len(sound.get_raw())
+
+    def play_decoded(self, handle):
+        if self._channel is not None:
+            self._channel.stop()
+        self._channel = handle.play()
+
+
+class NullSound:
+    def play(self, path):
+        pass
+
+    def decode(self, path):
+        return path, 0
+
+    def play_decoded(self, handle):
+        pass
+
+
+# ---------- Tray ----------
+
+class PystrayTray:
+    available = True
+
+    def __init__(self, icon_path, title="WaterReminderApp"):
+        import pystray
+        from PIL import Image
+        self._pystray = pystray
+        self._image = Image.open(icon_path)
+        self._title = title
+        self._icon = None
+        self._thread = None
+
+    def start(self, menu_items):
+        """Show the tray icon on its own thread. menu_items: [(label, callback)].
+
+        The callbacks run on the tray thread, so they must not touch Tk.
+        """
+        self.stop()
+        pystray = self._pystray
+        self._icon = pystray.Icon(
+            self._title,
+            self._image,
+            menu=pystray.Menu(*(pystray.MenuItem(label, cb) for label, cb in menu_items))
+        )
+        self._thread = threading.Thread(target=self._icon.run, name="tray", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._icon is not None:
+            self._icon.stop()
+            self._icon = None
+        if self._thread is not None:
+            if self._thread is not threading.current_thread():
+                self._thread.join(timeout=2)
+            self._thread = None
+
+
+class NullTray:
+    """No tray available: the caller keeps the window iconified instead."""
+
+    available = False
+
+    def start(self, menu_items):
+        pass
+
+    def stop(self):
+        pass
+
+
+# ---------- Autostart ----------
+
+class WindowsAutostart:
+    SHORTCUT_NAME = "WaterReminder.lnk"
+
+    def __init__(self):
+        import winshell
+        from win32com.client import Dispatch
+        self._winshell = winshell
+        self._dispatch = Dispatch
+
+    def _shortcut_path(self):
+        return os.path.join(self._winshell.startup(), self.SHORTCUT_NAME)
+
+    def enable(self, exe_path):
+        shell = self._dispatch("WScript.Shell")
+        shortcut = shell.CreateShortCut(self._shortcut_path())
+        shortcut.Targetpath = exe_path
+        shortcut.WorkingDirectory = os.path.dirname(exe_path)
+        shortcut.IconLocation = exe_path
+        shortcut.save()
+
+    def disable(self):
+        path = self._shortcut_path()
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class NullAutostart:
+    def enable(self, exe_path):
+        pass
+
+    def disable(self):
+        pass
+
+
+# ---------- Selection ----------
+
+def _first_available(*factories):
+    for factory in factories:
+        try:
+            return factory()
+        except Exception:
+            continue
+    raise RuntimeError("no backend available")
+
+
+class Backends:
+    """Picks and creates each backend on first access."""
+
+    def __init__(self, tray_icon_path=None, headless=None):
+        self.tray_icon_path = tray_icon_path
+        self.headless = _headless() if headless is None else headless
+        self.windows = sys.platform == "win32"
+        self._cache = {}
+
+    def _get(self, name, real, fallback):
+        backend = self._cache.get(name)
+        if backend is None:
+            if self.headless or real is None:
+                backend = fallback()
+            else:
+                backend = _first_available(real, fallback)
+            self._cache[name] = backend
+        return backend
+
+    @property
+    def notifier(self):
+        return self._get("notifier", ToastNotifierBackend if self.windows else None, ConsoleNotifier)
+
+    @property
+    def sound(self):
+        return self._get("sound", PygameSound, NullSound)
+
+    @property
+    def tray(self):
+        def real():
+            return PystrayTray(self.tray_icon_path)
+        return self._get("tray", real if self.tray_icon_path else None, NullTray)
+
+    @property
+    def autostart(self):
+        return self._get("autostart", WindowsAutostart if self.windows else None, NullAutostart)
@@ -0,0 +1,222 @@
+"""Compact fixed-width binary intake log.
+
+Layout: an 8-byte header followed by 13-byte little-endian records
+
+    int64  wall-clock seconds since 1970-01-01 (the naive local timestamp
+           read as if it were UTC, so it round-trips exactly)
+    uint8  event type code (see EVENT_TYPES)
+    int32  amount in millilitres
+
+Records are appended in time order, so readers mmap the file and bisect
+on the timestamp column without parsing anything. import_jsonl() and
+export_jsonl() convert to and from the regular JSONL format without
+losing anything: an imported entry comes back with the same keys, values
+and value types (amounts are floats, as the app writes them). Amounts
+appended to the store are rounded to whole millilitres.
+"""
+import bisect
+import json
+import mmap
+import os
+import struct
+from datetime import date, datetime, timedelta
+
+MAGIC = b"WRBLOG1\x00"
+RECORD = struct.Struct("<qBi")
+HEADER_SIZE = len(MAGIC)
+
+EVENT_TYPES = {"drink": 1}
+EVENT_NAMES = {v: k for k, v in EVENT_TYPES.items()}
+
+_EPOCH = datetime(1970, 1, 1)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+# ---------- Conversion ----------
+
+def timestamp_to_seconds(ts):
+    return int((datetime.fromisoformat(ts) - _EPOCH).total_seconds())
+
+
+def seconds_to_timestamp(seconds):
+    return (_EPOCH + timedelta(seconds=seconds)).strftime(TIMESTAMP_FORMAT)
+
+
+def pack_entry(entry, exact=True):
+    """Pack a log entry dict.
+
+    exact=True (imports): raises ValueError unless unpack_entry() gives the
+    entry back unchanged. exact=False (appends): the amount is rounded to
+    whole millilitres.
+    """
+    try:
+        code = EVENT_TYPES[entry["type"]]
+        seconds = timestamp_to_seconds(entry["timestamp"])
+        amount = float(entry["amount"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"unsupported log entry {entry!r}") from e
+
+    if set(entry) != {"timestamp", "type", "amount"} or seconds_to_timestamp(seconds) != entry["timestamp"]:
+        raise ValueError(f"log entry would not round-trip: {entry!r}")
+    ml = round(amount * 1000)
+    if exact:
+        if not isinstance(entry["amount"], float):
+            # 1 would come back as 1.0
+            raise ValueError(f"amount {entry['amount']!r} is not a float")
+        if ml / 1000 != amount:
+            raise ValueError(f"amount {amount} is not a whole number of millilitres")
+    return RECORD.pack(seconds, code, ml)
+
+
+def unpack_entry(seconds, code, ml):
+    return {
+        "timestamp": seconds_to_timestamp(seconds),
+        "type": EVENT_NAMES.get(code, str(code)),
+        "amount": ml / 1000
+    }
+
+
+# ---------- Store ----------
+
+class _Timestamps:
+    """Sequence view over the timestamp column of an mmap, for bisect."""
+
+    def __init__(self, buf, count):
+        self.buf = buf
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        return struct.unpack_from("<q", self.buf, HEADER_SIZE + i * RECORD.size)[0]
+
+
+class BinaryLog:
+    def __init__(self, path, read_only=False):
+        """read_only: don't create the file or drop a torn last record (readers skip it anyway)."""
+        self.path = path
+        if read_only:
+            with open(path, "rb") as f:
+                header = f.read(HEADER_SIZE)
+            if len(header) == HEADER_SIZE and header != MAGIC:
+                raise ValueError(f"{path} is not a binary water log")
+        elif not os.path.exists(path) or os.path.getsize(path) < HEADER_SIZE:
+            with open(path, "wb") as f:
+                f.write(MAGIC)
+        else:
+            with open(path, "rb+") as f:
+                if f.read(HEADER_SIZE) != MAGIC:
+                    raise ValueError(f"{path} is not a binary water log")
+                # Drop a torn record left by a crash mid-append
+                torn = (os.path.getsize(path) - HEADER_SIZE) % RECORD.size
+                if torn:
+                    f.truncate(os.path.getsize(path) - torn)
+
+    def __len__(self):
+        return (os.path.getsize(self.path) - HEADER_SIZE) // RECORD.size
+
+    def append(self, entry):
+        record = pack_entry(entry, exact=False)
+        with open(self.path, "ab") as f:
+            f.write(record)
+
+    def clear(self):
+        with open(self.path, "wb") as f:
+            f.write(MAGIC)
+
+    def _map(self):
+        """Return (mmap or None, record count)."""
+        count = len(self)
+        if count <= 0:
+            return None, 0
+        with open(self.path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), count
+
+    def records(self, start=0, stop=None):
+        """Raw (seconds, code, ml) tuples for record indexes [start, stop)."""
+        buf, count = self._map()
+        if buf is None:
+            return []
+        try:
+            stop = count if stop is None else min(stop, count)
+            if start >= stop:
+                return []
+            view = memoryview(buf)[HEADER_SIZE + start * RECORD.size:HEADER_SIZE + stop * RECORD.size]
+            try:
+                return list(RECORD.iter_unpack(view))
+            finally:
+                view.release()
+        finally:
+            buf.close()
+
+    def bisect_seconds(self, seconds):
+        """Index of the first record at or after the given epoch second."""
+        buf, count = self._map()
+        if buf is None:
+            return 0
+        try:
+            return bisect.bisect_left(_Timestamps(buf, count), seconds)
+        finally:
+            buf.close()
+
+    def iter_range(self, start=None, end=None):
+        """Yield entry dicts for the inclusive day range (None = open-ended)."""
+        lo = 0
+        hi = None
+        if start is not None:
+            lo = self.bisect_seconds(timestamp_to_seconds(f"{start} 00:00:00"))
+        if end is not None:
+            next_day = date.fromisoformat(str(end)) + timedelta(days=1)
+            hi = self.bisect_seconds(timestamp_to_seconds(f"{next_day} 00:00:00"))
+        for rec in self.records(lo, hi):
+            yield unpack_entry(*rec)
+
+    def daily_totals(self, start=None, end=None):
+        totals = {}
+        for entry in self.iter_range(start, end):
+            if entry["type"] == "drink":
+                day = entry["timestamp"][:10]
+                totals[day] = totals.get(day, 0.0) + entry["amount"]
+        return totals
+
+    def day_progress(self, day):
+        """(total litres, drink count, last drink timestamp or None); bisects to the day."""
+        from .intake_log import day_progress_of
+        day = str(day)
+        return day_progress_of(self.iter_range(day, day), day)
+
+    def line_source(self):
+        from .log_index import BinaryLineSource
+        return BinaryLineSource(self)
+
+
+# ---------- JSONL import / export ----------
+
+def import_jsonl(src_path, log):
+    """Append every entry of a JSONL log to a BinaryLog.
+
+    Fails before writing anything if a line can't be stored losslessly.
+    Returns the number of records written.
+    """
+    records = []
+    with open(src_path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(pack_entry(json.loads(line)))
+            except ValueError as e:
+                raise ValueError(f"{src_path}:{lineno}: {e}") from None
+
+    with open(log.path, "ab") as f:
+        f.write(b"".join(records))
+    return len(records)
+
+
+def export_jsonl(log, dest_path):
+    """Write a BinaryLog back out in the regular water_intake_log.txt format."""
+    with open(dest_path, "w", encoding="utf-8") as f:
+        for rec in log.records():
+            f.write(json.dumps(unpack_entry(*rec), ensure_ascii=False) + "\n")
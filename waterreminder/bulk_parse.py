@@ -0,0 +1,198 @@
+"""Parallel bulk parser for large JSONL intake logs.
+
+For columnar loads (analytics) of logs too big for a line-by-line
+json.loads loop:
+
+    1. the file is split into byte ranges that end on a newline,
+    2. each range is parsed in a worker process: lines in the fixed
+       {"timestamp", "type", "amount"} shape the app writes go through a
+       regex fast path, anything else through json.loads,
+    3. the per-chunk columns are concatenated in file order.
+
+Entries with a timestamp, a known type and an amount land in the columns
+(naive wall-clock epoch seconds, litres, type code, user code). Lines
+that don't fit (other event types, unparseable text) are kept aside in
+`odd` with their line number, as parsed dicts or raw strings; that is
+what the log pane shows raw.
+
+The store migrations don't use it: they keep every line verbatim (or,
+for the binary log, its exact value types), which columns don't carry.
+"""
+import json
+import os
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+DEFAULT_CHUNK_BYTES = 8 * 1024 * 1024
+TYPE_CODES = {"drink": 1, "day_summary": 2}
+TYPE_NAMES = {v: k for k, v in TYPE_CODES.items()}
+
+_FAST_LINE = re.compile(
+    rb'\{"timestamp": "(\d{4}-\d\d-\d\d) (\d\d):(\d\d):(\d\d)", '
+    rb'"type": "(drink|day_summary)", "amount": (-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)'
+    rb'(?:, "count": \d+)?\}'  # day_summary records carry a drink count
+)
+_FAST_TYPES = {b"drink": 1, b"day_summary": 2}
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class Columns:
+    """Parsed log as parallel arrays, plus the lines that didn't fit them."""
+
+    def __init__(self):
+        self.seconds = array("q")
+        self.amounts = array("d")
+        self.types = array("B")
+        self.users = array("i")
+        self.user_names = [""]  # user code -> name; "" is the desktop app
+        self.odd = []           # [(line number, dict or raw str)]
+        self.lines = 0          # non-blank lines seen
+
+    def __len__(self):
+        return len(self.seconds)
+
+    def extend(self, other):
+        """Append another chunk's columns (the chunk that follows in the file)."""
+        if other.user_names == self.user_names[:len(other.user_names)]:
+            self.users.extend(other.users)
+        else:
+            codes = self._user_codes()
+            remap = [codes.setdefault(name, len(codes)) for name in other.user_names]
+            self.user_names = list(codes)
+            self.users.extend(remap[code] for code in other.users)
+        self.seconds.extend(other.seconds)
+        self.amounts.extend(other.amounts)
+        self.types.extend(other.types)
+        self.odd.extend((self.lines + n, value) for n, value in other.odd)
+        self.lines += other.lines
+
+    def _user_codes(self):
+        return {name: code for code, name in enumerate(self.user_names)}
+
+
+# ---------- Splitting ----------
+
+def chunk_ranges(path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """[(start, end)] byte ranges covering the file, each ending after a newline."""
+    size = os.path.getsize(path)
+    ranges = []
+    start = 0
+    with open(path, "rb") as f:
+        while start < size:
+            end = start + chunk_bytes
+            if end >= size:
+                end = size
+            else:
+                f.seek(end)
+                f.readline()  # finish the line the cut fell into
+                end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+# ---------- Parsing ----------
+
+def _day_seconds(day, cache):
+    seconds = cache.get(day)
+    if seconds is None:
+        seconds = cache[day] = (date.fromisoformat(day.decode()).toordinal() - _EPOCH_ORDINAL) * 86400
+    return seconds
+
+
+def parse_chunk(path, start, end):
+    """Parse bytes [start, end) of a JSONL log into Columns."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return parse_lines(data.split(b"\n"))
+
+
+def parse_lines(lines):
+    """Parse an iterable of raw log lines (bytes or str) into Columns."""
+    out = Columns()
+    seconds, amounts, types, users = out.seconds, out.amounts, out.types, out.users
+    user_codes = {"": 0}
+    days = {}
+    fast = _FAST_LINE.fullmatch
+    n = 0
+    for line in lines:
+        if isinstance(line, str):
+            line = line.encode("utf-8")
+        line = line.strip()
+        if not line:
+            continue
+        m = fast(line)
+        if m is not None:
+            day, hh, mm, ss, kind, amount = m.groups()
+            try:
+                day_start = _day_seconds(day, days)
+            except ValueError:
+                m = None  # impossible date such as 2026-02-30; the slow path keeps it in odd
+        if m is not None:
+            seconds.append(day_start + int(hh) * 3600 + int(mm) * 60 + int(ss))
+            amounts.append(float(amount))
+            types.append(_FAST_TYPES[kind])
+            users.append(0)
+        else:
+            parsed = _parse_slow(line, days)
+            if parsed is None:
+                out.odd.append((n, _decode_odd(line)))
+            else:
+                ts, amount, kind, user = parsed
+                seconds.append(ts)
+                amounts.append(amount)
+                types.append(kind)
+                users.append(user_codes.setdefault(user, len(user_codes)))
+        n += 1
+    out.lines = n
+    out.user_names = list(user_codes)
+    return out
+
+
+def _parse_slow(line, days):
+    """(seconds, amount, type code, user) via json, or None if the entry doesn't fit."""
+    try:
+        entry = json.loads(line)
+        kind = TYPE_CODES[entry["type"]]
+        ts = entry["timestamp"]
+        seconds = (_day_seconds(ts[:10].encode(), days)
+                   + int(ts[11:13]) * 3600 + int(ts[14:16]) * 60 + int(ts[17:19]))
+        return seconds, float(entry.get("amount", 0)), kind, str(entry.get("user", ""))
+    except (ValueError, KeyError, TypeError, IndexError, AttributeError):
+        return None
+
+
+def _decode_odd(line):
+    text = line.decode("utf-8", errors="replace")
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+# ---------- Loading ----------
+
+def load_columns(path, workers=None, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Parse a whole JSONL log into Columns, in `workers` processes.
+
+    workers=None uses every core; 1 (or a file of a single chunk) parses
+    in this process without starting a pool.
+    """
+    out = Columns()
+    if not os.path.exists(path):
+        return out
+    ranges = chunk_ranges(path, chunk_bytes)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(ranges) <= 1:
+        for start, end in ranges:
+            out.extend(parse_chunk(path, start, end))
+        return out
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        for columns in pool.map(parse_chunk, [path] * len(ranges),
+                                [r[0] for r in ranges], [r[1] for r in ranges]):
+            out.extend(columns)
+    return out
@@ -0,0 +1,290 @@
+"""Streaming export of intake history to CSV, Parquet or SQLite.
+
+Events are read from the log stores one user at a time through
+iter_range() and written in batches of `batch_size` rows, so memory use
+does not grow with the size of the history:
+
+    user       user id ("local" for the desktop app)
+    timestamp  "YYYY-MM-DD HH:MM:SS"
+    type       event type, e.g. "drink" or "day_summary"
+    amount     litres (empty if the event has none)
+    data       any other fields of the event as JSON, e.g. {"count": 9}
+
+Stores are opened read-only: nothing is migrated, compacted, repaired or
+created, and users without a log are skipped. SQLite is opened with
+mode=ro; like any WAL reader it may leave empty -wal/-shm files behind. The output is written to a
+temp file and renamed into place when the export completes.
+
+    python -m waterreminder.export --data-dir ./service-data --output history.csv
+    python -m waterreminder.export --app-dir . --output history.parquet --start 2026-01-01
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+from datetime import date
+
+DEFAULT_BATCH_SIZE = 10_000
+APP_USER = "local"
+COLUMNS = ("user", "timestamp", "type", "amount", "data")
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".db": "sqlite", ".sqlite": "sqlite"}
+
+_FIELDS = frozenset(("timestamp", "type", "amount", "user"))
+
+
+# ---------- Sources ----------
+
+def detect_storage(directory):
+    """Which log store holds the history in `directory`, or None if there is none."""
+    try:
+        with open(os.path.join(directory, "settings.json"), "r", encoding="utf-8") as f:
+            storage = json.load(f).get("log_storage")
+    except (OSError, ValueError, AttributeError):
+        storage = None
+    paths = {
+        "sqlite": os.path.join(directory, "water_intake.db"),
+        "binary": os.path.join(directory, "water_intake_log.bin"),
+        "segmented": os.path.join(directory, "logs"),
+        "jsonl": os.path.join(directory, "water_intake_log.txt"),
+    }
+    if storage in paths and os.path.exists(paths[storage]):
+        return storage
+    for storage, path in paths.items():
+        if os.path.exists(path):
+            return storage
+    if os.path.isdir(os.path.join(directory, "archive")):
+        return "jsonl"
+    return None
+
+
+def open_existing_store(directory):
+    """Open the log store in `directory` for reading, or return None if there is none."""
+    storage = detect_storage(directory)
+    if storage == "sqlite":
+        from .sqlite_log import SqliteLog
+        return SqliteLog(os.path.join(directory, "water_intake.db"), read_only=True)
+    if storage == "binary":
+        from .binary_log import BinaryLog
+        return BinaryLog(os.path.join(directory, "water_intake_log.bin"), read_only=True)
+    if storage == "segmented":
+        from .log_segments import SegmentedLog
+        return SegmentedLog(os.path.join(directory, "logs"), read_only=True)
+    if storage == "jsonl":
+        # iter_range() only reads; without a writer or day_progress() close() writes nothing
+        from .intake_log import JsonlLog
+        archive_dir = os.path.join(directory, "archive")
+        return JsonlLog(
+            os.path.join(directory, "water_intake_log.txt"),
+            archive_dir=archive_dir if os.path.isdir(archive_dir) else None
+        )
+    return None
+
+
+def _user_sources(user_dirs):
+    for user, directory in user_dirs:
+        store = open_existing_store(directory)
+        if store is None:
+            continue
+        try:
+            yield user, store
+        finally:
+            close = getattr(store, "close", None)
+            if close is not None:
+                close()
+
+
+def app_sources(base_dir, user=APP_USER):
+    """(user, store) for the desktop app's log in `base_dir`."""
+    return _user_sources([(user, base_dir)])
+
+
+def service_sources(data_dir, users=None):
+    """(user, store) for each user of the service (see service.py), one open at a time."""
+    from .service import USER_ID_RE
+
+    users_root = os.path.join(data_dir, "users")
+    if users is None:
+        names = sorted(os.listdir(users_root)) if os.path.isdir(users_root) else []
+    else:
+        names = list(users)
+    return _user_sources(
+        (name, os.path.join(users_root, name)) for name in names
+        if USER_ID_RE.match(name) and os.path.isdir(os.path.join(users_root, name))
+    )
+
+
+# ---------- Rows ----------
+
+def row_for(user, entry):
+    amount = entry.get("amount")
+    try:
+        amount = None if amount is None else float(amount)
+    except (TypeError, ValueError):
+        amount = None
+    extra = {k: v for k, v in entry.items() if k not in _FIELDS}
+    return (
+        str(entry.get("user", user)), str(entry.get("timestamp", "")), entry.get("type"), amount,
+        json.dumps(extra, ensure_ascii=False) if extra else ""
+    )
+
+
+def iter_batches(sources, start=None, end=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Lists of at most `batch_size` row tuples (see COLUMNS) from (user, store) pairs."""
+    batch = []
+    for user, store in sources:
+        for entry in store.iter_range(start, end):
+            batch.append(row_for(user, entry))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+# ---------- Writers ----------
+
+class CsvWriter:
+    def __init__(self, path):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._csv = csv.writer(self._file)
+        self._csv.writerow(COLUMNS)
+
+    def write(self, rows):
+        self._csv.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    """One row group per batch, with a real timestamp column (ms precision in the file)."""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export needs pyarrow: pip install pyarrow") from None
+        self._pa, self._pc = pa, pc
+        self.schema = pa.schema([
+            ("user", pa.string()),
+            ("timestamp", pa.timestamp("s")),
+            ("type", pa.string()),
+            ("amount", pa.float64()),
+            ("data", pa.string()),
+        ])
+        self._writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, rows):
+        pa = self._pa
+        users, timestamps, types, amounts, data = zip(*rows)
+        timestamps = self._pc.strptime(
+            pa.array(timestamps, pa.string()), format="%Y-%m-%d %H:%M:%S", unit="s", error_is_null=True
+        )
+        self._writer.write_table(pa.Table.from_arrays([
+            pa.array(users, pa.string()), timestamps, pa.array(types, pa.string()),
+            pa.array(amounts, pa.float64()), pa.array(data, pa.string()),
+        ], schema=self.schema))
+
+    def close(self):
+        self._writer.close()
+
+
+class SqliteWriter:
+    """One transaction per batch; the (user, timestamp) index is built at the end."""
+
+    def __init__(self, path):
+        self._db = sqlite3.connect(path)
+        # A throwaway file until the final rename; no need for a rollback journal
+        self._db.execute("PRAGMA journal_mode=OFF")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute(
+            "CREATE TABLE events (user TEXT NOT NULL, timestamp TEXT NOT NULL,"
+            " type TEXT, amount REAL, data TEXT NOT NULL)"
+        )
+
+    def write(self, rows):
+        with self._db:
+            self._db.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?)", rows)
+
+    def close(self):
+        with self._db:
+            self._db.execute("CREATE INDEX events_user_timestamp ON events (user, timestamp)")
+        self._db.close()
+
+
+WRITERS = {"csv": CsvWriter, "parquet": ParquetWriter, "sqlite": SqliteWriter}
+
+
+def format_for(path):
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"can't tell the export format from {path!r}; use one of {sorted(FORMATS)}")
+    return fmt
+
+
+def export(sources, path, fmt=None, start=None, end=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Write every event of `sources` in the inclusive day range to `path`.
+
+    fmt: "csv", "parquet" or "sqlite" (default: from the file extension).
+    Returns the number of events written.
+    """
+    fmt = fmt or format_for(path)
+    if fmt not in WRITERS:
+        raise ValueError(f"export format must be one of {tuple(WRITERS)}, not {fmt!r}")
+    tmp = path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    writer = WRITERS[fmt](tmp)
+    count = 0
+    try:
+        for rows in iter_batches(sources, start, end, batch_size):
+            writer.write(rows)
+            count += len(rows)
+        writer.close()
+    except BaseException:
+        writer.close()
+        os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    return count
+
+
+# ---------- Command line ----------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export Water Reminder intake history")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument("--data-dir", help="service data directory (one log per user)")
+    where.add_argument("--app-dir", help="desktop app directory (water_intake_log.txt, ...)")
+    parser.add_argument("--output", required=True, help=".csv, .parquet, .db or .sqlite")
+    parser.add_argument("--format", choices=sorted(WRITERS), help="default: from --output")
+    parser.add_argument("--start", type=date.fromisoformat, help="first day, YYYY-MM-DD")
+    parser.add_argument("--end", type=date.fromisoformat, help="last day, YYYY-MM-DD")
+    parser.add_argument("--user", action="append", dest="users",
+                        help="only this user (repeatable; --data-dir only)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.data_dir:
+        sources = service_sources(args.data_dir, args.users)
+    else:
+        if args.users:
+            parser.error("--user only applies to --data-dir")
+        sources = app_sources(args.app_dir)
+    try:
+        count = export(sources, args.output, args.format,
+                       args.start and args.start.isoformat(), args.end and args.end.isoformat(),
+                       args.batch_size)
+    except (ImportError, ValueError) as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Exported {count} events to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
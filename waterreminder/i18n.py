@@ -0,0 +1,115 @@
+"""Translation catalogs.
+
+Each locales/<code>.json file is loaded once, on first use, into a
+Catalog of pre-parsed templates and kept for the rest of the process, so
+switching back and forth between languages does no disk I/O. Every
+locale is checked against en-US.json when it loads: missing keys and
+keys whose placeholders differ from the English ones are reported and
+fall back to the English template; extra keys are reported.
+"""
+import json
+import os
+import string
+import sys
+
+REFERENCE_LANG = "en-US"
+
+_formatter = string.Formatter()
+
+
+class Template:
+    __slots__ = ("text", "fields")
+
+    def __init__(self, text):
+        self.text = text
+        # None means "no placeholders": the text is returned as is
+        fields = frozenset(f for _lit, f, _spec, _conv in _formatter.parse(text) if f is not None)
+        self.fields = fields or None
+
+    def render(self, kwargs):
+        if self.fields is None:
+            return self.text
+        try:
+            return self.text.format_map(kwargs)
+        except KeyError:
+            # ignore missing params, same as before
+            return self.text
+
+
+class Catalog:
+    def __init__(self, code, templates, problems=()):
+        self.code = code
+        self.templates = templates
+        self.problems = list(problems)
+
+    def gettext(self, key, kwargs=None):
+        template = self.templates.get(key)
+        if template is None:
+            return key
+        if kwargs:
+            return template.render(kwargs)
+        return template.text
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class Catalogs:
+    def __init__(self, locales_dir):
+        self.locales_dir = locales_dir
+        self._loaded = {}
+        self._reference = None
+
+    def path(self, code):
+        return os.path.join(self.locales_dir, f"{code}.json")
+
+    def available(self):
+        return sorted(n[:-len(".json")] for n in os.listdir(self.locales_dir) if n.endswith(".json"))
+
+    def _reference_templates(self):
+        if self._reference is None:
+            self._reference = {k: Template(v) for k, v in _read(self.path(REFERENCE_LANG)).items()}
+        return self._reference
+
+    def _compile(self, code):
+        reference = self._reference_templates()
+        if code == REFERENCE_LANG:
+            return Catalog(code, dict(reference))
+
+        templates = {}
+        problems = []
+        for key, text in _read(self.path(code)).items():
+            template = Template(text)
+            ref = reference.get(key)
+            if ref is None:
+                problems.append(f"{code}: '{key}' is not in {REFERENCE_LANG}")
+            elif template.fields != ref.fields:
+                problems.append(f"{code}: '{key}' placeholders {sorted(template.fields or ())} "
+                                f"!= {sorted(ref.fields or ())} in {REFERENCE_LANG}")
+                template = ref
+            templates[key] = template
+
+        for key in reference.keys() - templates.keys():
+            problems.append(f"{code}: missing '{key}', using {REFERENCE_LANG}")
+            templates[key] = reference[key]
+
+        for problem in problems:
+            print(f"Translation problem: {problem}", file=sys.stderr)
+        return Catalog(code, templates, problems)
+
+    def get(self, code):
+        """Catalog for `code`, loading it on first use; unknown codes give en-US."""
+        catalog = self._loaded.get(code)
+        if catalog is None:
+            if not os.path.exists(self.path(code)):
+                return self.get(REFERENCE_LANG)
+            catalog = self._compile(code)
+            self._loaded[code] = catalog
+        return catalog
+
+    def preload(self):
+        """Load every locale now so later switches never hit the disk."""
+        for code in self.available():
+            self.get(code)
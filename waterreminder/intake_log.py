@@ -0,0 +1,356 @@
+import json
+import os
+import sys
+
+# ---------- Formatting ----------
+
+def format_log_line(line, translate):
+    """Turn one raw log line into the text shown in the log pane.
+
+    Drink entries go through the "log_drink" translation, anything else
+    (other event types, unparseable lines) is shown raw. Blank lines
+    return None.
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    try:
+        entry = json.loads(line)
+    except json.JSONDecodeError:
+        return line
+
+    if isinstance(entry, dict) and entry.get("type") == "drink":
+        ts = entry.get("timestamp", "")
+        amount = entry.get("amount", 0)
+        return translate("log_drink", time=ts, amount=amount)
+    if isinstance(entry, dict) and entry.get("type") == "day_summary":
+        # Compacted day from the archive (see retention.py)
+        day = str(entry.get("timestamp", ""))[:10]
+        return translate("log_day_summary", date=day, amount=entry.get("amount", 0),
+                         count=entry.get("count", 0))
+    return line
+
+# ---------- Day progress ----------
+
+REVERSE_BLOCK_SIZE = 64 * 1024
+
+
+def day_progress_of(entries, day):
+    """(total litres, drink count, last drink timestamp or None) of `day`'s drinks."""
+    total = 0.0
+    count = 0
+    last = None
+    for entry in entries:
+        if not isinstance(entry, dict) or entry.get("type") != "drink":
+            continue
+        ts = str(entry.get("timestamp", ""))
+        if ts[:10] != day:
+            continue
+        total += float(entry.get("amount", 0))
+        count += 1
+        if last is None or ts > last:
+            last = ts
+    return total, count, last
+
+
+def iter_lines_reversed(path, block_size=REVERSE_BLOCK_SIZE):
+    """Yield the lines of a file last to first, reading it backwards in blocks."""
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        rest = b""
+        while pos > 0:
+            size = min(block_size, pos)
+            pos -= size
+            f.seek(pos)
+            lines = (f.read(size) + rest).split(b"\n")
+            rest = lines[0]
+            for line in reversed(lines[1:]):
+                yield line.decode("utf-8", errors="replace")
+        if rest:
+            yield rest.decode("utf-8", errors="replace")
+
+
+def _parse_entries(lines):
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            continue
+
+# ---------- Flat JSONL store ----------
+
+class JsonlLog:
+    """The classic single water_intake_log.txt file.
+
+    Exposes the same reader/writer API as SegmentedLog so the GUI and
+    exporters don't care which one is in use; range queries here are a
+    linear scan.
+    """
+
+    def __init__(self, path, writer=None, archive_dir=None):
+        """
+        writer:      optional LogWriter that performs appends in the background.
+        archive_dir: compacted history (see retention.py), read before the file.
+        """
+        self.path = path
+        self.writer = writer
+        self.archive_dir = archive_dir
+        self.checkpoint_path = path + ".checkpoint"
+        # [day, total, count, last] once day_progress() ran; kept current by append()
+        self._progress = None
+
+    def _archived_lines(self):
+        if self.archive_dir is None:
+            return iter(())
+        from .retention import iter_archive_lines
+        return iter_archive_lines(self.archive_dir)
+
+    def append(self, entry):
+        if self._progress is not None:
+            total, count, last = day_progress_of([entry], self._progress[0])
+            if count:
+                self._progress[1] += total
+                self._progress[2] += count
+                self._progress[3] = max(self._progress[3] or "", last)
+        if self.writer is not None:
+            self.writer.append(entry)
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def clear(self):
+        if self._progress is not None:
+            self._progress[1:] = [0.0, 0, None]
+        if self.writer is not None:
+            self.writer.truncate()
+        else:
+            open(self.path, "w").close()
+        if self.archive_dir is not None:
+            from .retention import archive_segments
+            for path in archive_segments(self.archive_dir):
+                os.remove(path)
+
+    def line_source(self):
+        from .log_index import JsonlLineSource
+        return JsonlLineSource(self)
+
+    def _iter_lines(self):
+        yield from self._archived_lines()
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                yield from f
+
+    def iter_range(self, start=None, end=None):
+        start = str(start) if start is not None else None
+        end = str(end) if end is not None else None
+        for line in self._iter_lines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(entry, dict):
+                continue
+            day = str(entry.get("timestamp", ""))[:10]
+            if (start is None or day >= start) and (end is None or day <= end):
+                yield entry
+
+    def bulk_columns(self, workers=None):
+        """The whole history as bulk_parse.Columns, the file parsed in `workers` processes."""
+        from .bulk_parse import load_columns, parse_lines
+
+        if self.writer is not None:
+            self.writer.sync()
+        columns = parse_lines(self._archived_lines())
+        columns.extend(load_columns(self.path, workers))
+        return columns
+
+    def daily_totals(self, start=None, end=None):
+        totals = {}
+        for entry in self.iter_range(start, end):
+            if entry.get("type") in ("drink", "day_summary"):
+                day = entry["timestamp"][:10]
+                totals[day] = totals.get(day, 0.0) + float(entry.get("amount", 0))
+        return totals
+
+    # ---------- Day progress ----------
+
+    def day_progress(self, day):
+        """(total litres, drink count, last drink timestamp or None) for `day`.
+
+        Starts from the checkpoint when it is for the same day and still
+        matches the file, reading only what was appended since. Otherwise
+        the file is read backwards and the scan stops at the first entry
+        of an earlier day, so the cost follows the day's entries, not the
+        history. Either way a fresh checkpoint is written.
+        """
+        day = str(day)
+        if self.writer is not None:
+            self.writer.sync()
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+
+        checkpoint = self._load_checkpoint(day, size)
+        if checkpoint is not None:
+            total, count, last = checkpoint["total"], checkpoint["count"], checkpoint["last"]
+            with open(self.path, "rb") as f:
+                f.seek(checkpoint["size"])
+                added = f.read(size - checkpoint["size"]).decode("utf-8", errors="replace")
+            more = day_progress_of(_parse_entries(added.splitlines()), day)
+            total, count = total + more[0], count + more[1]
+            last = max(last or "", more[2] or "") or None
+        else:
+            total, count, last = day_progress_of(self._entries_since(day), day)
+
+        self._progress = [day, total, count, last]
+        self.save_checkpoint(size)
+        return total, count, last
+
+    def _entries_since(self, day):
+        if not os.path.exists(self.path):
+            return
+        for entry in _parse_entries(iter_lines_reversed(self.path)):
+            if isinstance(entry, dict) and str(entry.get("timestamp", ""))[:10] < day:
+                return  # the log is in time order: everything before is older
+            yield entry
+
+    def _load_checkpoint(self, day, size):
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            if checkpoint["day"] != day or not 0 < checkpoint["size"] <= size:
+                return None
+            # The file must still end the checkpointed part with the same line
+            tail = checkpoint["tail"].encode("latin-1")
+            with open(self.path, "rb") as f:
+                f.seek(checkpoint["size"] - len(tail))
+                if f.read(len(tail)) != tail:
+                    return None
+            return checkpoint
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save_checkpoint(self, size=None):
+        """Persist the tracked day progress for the next day_progress() call."""
+        if self._progress is None:
+            return
+        if size is None:
+            if self.writer is not None:
+                self.writer.sync()
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if size == 0:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(max(0, size - 256))
+            tail = f.read(size - f.tell())
+        # Last complete line (with its newline), used to recognise the file later
+        start = tail.rfind(b"\n", 0, len(tail) - 1) + 1
+        day, total, count, last = self._progress
+        checkpoint = {"day": day, "total": total, "count": count, "last": last,
+                      "size": size, "tail": tail[start:].decode("latin-1")}
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.save_checkpoint()
+
+
+LOG_STORAGES = ("jsonl", "segmented", "binary", "sqlite")
+
+
+def open_log_store(storage, base_dir, durability=None, retention_days=0, archive_compression="gzip"):
+    """Build the log store selected by the "log_storage" setting.
+
+    Switching away from "jsonl" migrates an existing water_intake_log.txt
+    once; the old file is then renamed to water_intake_log.txt.migrated.
+    With a `durability` mode the JSONL log is written by a background
+    LogWriter (see log_writer.py); a torn last line is repaired first.
+    With `retention_days` > 0, older JSONL days are compacted into
+    archive/ first (see retention.py).
+    """
+    log_path = os.path.join(base_dir, "water_intake_log.txt")
+    if storage == "segmented":
+        from .log_segments import SegmentedLog, migrate_jsonl
+
+        store = SegmentedLog(os.path.join(base_dir, "logs"))
+        if os.path.exists(log_path) and not store.segments():
+            migrate_jsonl(log_path, store)
+            os.replace(log_path, log_path + ".migrated")
+        return store
+
+    if storage == "binary":
+        from .binary_log import BinaryLog, import_jsonl
+
+        store = BinaryLog(os.path.join(base_dir, "water_intake_log.bin"))
+        if os.path.exists(log_path) and len(store) == 0:
+            try:
+                import_jsonl(log_path, store)
+            except ValueError as e:
+                # Not representable in the packed format; stay on JSONL
+                print(f"Keeping JSONL log storage: {e}", file=sys.stderr)
+                return _open_jsonl_store(base_dir, durability, retention_days, archive_compression)
+            os.replace(log_path, log_path + ".migrated")
+        return store
+
+    if storage == "sqlite":
+        import atexit
+        from .sqlite_log import SqliteLog, migrate_lines
+
+        store = SqliteLog(os.path.join(base_dir, "water_intake.db"))
+        atexit.register(store.close)
+        if os.path.exists(log_path) and len(store) == 0:
+            # Archived days (see retention.py) come along, oldest first
+            archive_dir = os.path.join(base_dir, "archive")
+            old = JsonlLog(log_path, archive_dir=archive_dir if os.path.isdir(archive_dir) else None)
+            migrate_lines(old._iter_lines(), store)
+            os.replace(log_path, log_path + ".migrated")
+        return store
+
+    return _open_jsonl_store(base_dir, durability, retention_days, archive_compression)
+
+
+def _open_jsonl_store(base_dir, durability, retention_days, archive_compression):
+    log_path = os.path.join(base_dir, "water_intake_log.txt")
+    if durability is not None:
+        from .log_writer import repair_torn_tail
+        repair_torn_tail(log_path)
+
+    archive_dir = os.path.join(base_dir, "archive")
+    if retention_days:
+        from .retention import compact
+        compact(log_path, archive_dir, retention_days, compression=archive_compression)
+    if not os.path.isdir(archive_dir):
+        archive_dir = None
+
+    import atexit
+
+    if durability is None:
+        store = JsonlLog(log_path, archive_dir=archive_dir)
+    else:
+        from .log_writer import LogWriter
+        store = JsonlLog(log_path, LogWriter(log_path, durability), archive_dir)
+    # Flushes the writer, then leaves a day-progress checkpoint for the next start
+    atexit.register(store.close)
+    return store
+
+
+def close_log_store(store):
+    """Close a store from open_log_store() before exit (and drop its atexit hook)."""
+    import atexit
+
+    close = getattr(store, "close", None)
+    if close is not None:
+        atexit.unregister(close)
+        close()
@@ -0,0 +1,291 @@
+"""Row sources for the virtual log view.
+
+A row source exposes the log as numbered lines, `len(source)` and
+`source.lines(start, stop)`, without holding the history in memory:
+
+    JsonlLineSource      hot water_intake_log.txt through an on-disk
+                         LineIndex (+ the small archived summaries)
+    SegmentedLineSource  per-day segments through their sidecar offsets
+    BinaryLineSource     fixed-width records, addressed directly
+    SqliteLineSource     rows by id through the primary key
+
+`refresh()` picks up appended lines and returns True when the log was
+truncated or replaced and the view has to start over.
+"""
+import bisect
+import json
+import os
+import struct
+from array import array
+
+from .binary_log import unpack_entry
+from .log_segments import UNDATED
+
+INDEX_MAGIC = b"WRIDX1\x00\x00"
+INDEX_HEADER = struct.Struct("<8sQ")  # magic, log bytes covered by the index
+OFFSET = struct.Struct("<Q")
+
+
+class LineIndex:
+    """Start offsets of the non-blank lines of a text file, kept in `<file>.idx`.
+
+    Only the 16-byte header and the offsets a reader asks for are read,
+    so memory use does not depend on the number of lines.
+    """
+
+    def __init__(self, log_path, index_path=None):
+        self.log_path = log_path
+        self.index_path = index_path or log_path + ".idx"
+        self.indexed_size = 0
+        self.count = 0
+        self._load()
+
+    def __len__(self):
+        return self.count
+
+    # ---------- Maintenance ----------
+
+    def _load(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                magic, size = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+            count = (os.path.getsize(self.index_path) - INDEX_HEADER.size) // OFFSET.size
+        except (OSError, struct.error):
+            magic, size, count = None, 0, 0
+
+        if magic != INDEX_MAGIC or not self._looks_valid(size, count):
+            self._reset()
+            return
+        self.indexed_size = size
+        self.count = count
+
+    def _looks_valid(self, size, count):
+        """Cheap check that the index still describes the log's first `size` bytes."""
+        try:
+            log_size = os.path.getsize(self.log_path)
+        except OSError:
+            return size == 0
+        if size > log_size:
+            return False
+        if size == 0:
+            return count == 0
+        with open(self.log_path, "rb") as log:
+            log.seek(size - 1)
+            if log.read(1) != b"\n":
+                return False
+            if count:
+                with open(self.index_path, "rb") as idx:
+                    idx.seek(INDEX_HEADER.size + (count - 1) * OFFSET.size)
+                    last = OFFSET.unpack(idx.read(OFFSET.size))[0]
+                if last:
+                    log.seek(last - 1)
+                    if log.read(1) != b"\n":
+                        return False
+        return True
+
+    def _reset(self):
+        with open(self.index_path, "wb") as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, 0))
+        self.indexed_size = 0
+        self.count = 0
+
+    def refresh(self):
+        """Index lines appended since last time. Returns True if the index was rebuilt."""
+        try:
+            size = os.path.getsize(self.log_path)
+        except OSError:
+            size = 0
+
+        restarted = False
+        if size < self.indexed_size:
+            self._reset()
+            restarted = True
+        if size == self.indexed_size:
+            return restarted
+
+        offsets = array("Q")
+        pos = self.indexed_size
+        with open(self.log_path, "rb") as log:
+            log.seek(pos)
+            for raw in log:
+                if not raw.endswith(b"\n"):
+                    break  # half-written line; picked up next time
+                if raw.strip():
+                    offsets.append(pos)
+                pos += len(raw)
+
+        if pos == self.indexed_size:
+            return restarted
+        with open(self.index_path, "r+b") as idx:
+            idx.seek(0, os.SEEK_END)
+            idx.write(offsets.tobytes())
+            idx.seek(0)
+            idx.write(INDEX_HEADER.pack(INDEX_MAGIC, pos))
+        self.indexed_size = pos
+        self.count += len(offsets)
+        return restarted
+
+    # ---------- Reading ----------
+
+    def lines(self, start, stop):
+        start = max(0, start)
+        stop = min(stop, self.count)
+        if start >= stop:
+            return []
+        with open(self.index_path, "rb") as idx:
+            idx.seek(INDEX_HEADER.size + start * OFFSET.size)
+            offsets = array("Q")
+            offsets.frombytes(idx.read((stop - start) * OFFSET.size))
+        out = []
+        with open(self.log_path, "rb") as log:
+            for offset in offsets:
+                log.seek(offset)
+                out.append(log.readline().decode("utf-8", errors="replace").rstrip("\r\n"))
+        return out
+
+
+class JsonlLineSource:
+    def __init__(self, store):
+        self.store = store
+        self.index = LineIndex(store.path)
+        self.archived = []
+        self._archive_loaded = False
+
+    def __len__(self):
+        return len(self.archived) + len(self.index)
+
+    def refresh(self):
+        if self.store.writer is not None:
+            self.store.writer.sync()
+        restarted = self.index.refresh()
+        if restarted or not self._archive_loaded:
+            # Archives hold one summary per day, so this stays small
+            self.archived = list(self.store._archived_lines())
+            self._archive_loaded = True
+        return restarted
+
+    def lines(self, start, stop):
+        n = len(self.archived)
+        out = self.archived[start:min(stop, n)] if start < n else []
+        if stop > n:
+            out.extend(self.index.lines(max(0, start - n), stop - n))
+        return out
+
+
+class SegmentedLineSource:
+    def __init__(self, log):
+        self.log = log
+        self.days = []
+        self.counts = []  # records per day
+        self.sizes = []  # segment bytes per day, to spot changes without reading sidecars
+        self.starts = []  # row number of each day's first record
+        self.total = 0
+
+    def __len__(self):
+        return self.total
+
+    def refresh(self):
+        # Most appends go to the newest day (or start a new one), which only
+        # adds rows at the end. An entry with an older timestamp lands in an
+        # older segment (or starts a new older day), and undated lines grow
+        # the segment listed first; both shift the rows after them, so any
+        # change before the newest day starts the view over.
+        sizes = self.log.segment_sizes()
+        days = sorted(day for day in sizes if day != UNDATED)
+        if UNDATED in sizes:
+            days.insert(0, UNDATED)
+        known = len(self.days)
+        restarted = days[:known] != self.days or any(
+            sizes[day] != size for day, size in zip(self.days[:-1], self.sizes[:-1]))
+        if not restarted and known:
+            restarted = sizes[days[known - 1]] < self.sizes[-1]
+        if restarted:
+            self.days, self.counts, self.sizes, self.starts, self.total = [], [], [], [], 0
+            known = 0
+        elif known and sizes[days[known - 1]] != self.sizes[-1]:
+            count = self.log.day_count(days[known - 1])
+            self.total += count - self.counts[-1]
+            self.counts[-1] = count
+            self.sizes[-1] = sizes[days[known - 1]]
+        for day in days[known:]:
+            count = self.log.day_count(day)
+            self.days.append(day)
+            self.starts.append(self.total)
+            self.counts.append(count)
+            self.sizes.append(sizes[day])
+            self.total += count
+        return restarted
+
+    def lines(self, start, stop):
+        out = []
+        row = max(0, start)
+        stop = min(stop, self.total)
+        while row < stop:
+            d = bisect.bisect_right(self.starts, row) - 1
+            first = row - self.starts[d]
+            last = min(stop - self.starts[d], self.counts[d])
+            out.extend(self.log.read_day_range(self.days[d], first, last))
+            row = self.starts[d] + last
+        return out
+
+
+class BinaryLineSource:
+    def __init__(self, log):
+        self.log = log
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def refresh(self):
+        count = len(self.log)
+        restarted = count < self.count
+        self.count = count
+        return restarted
+
+    def lines(self, start, stop):
+        return [json.dumps(unpack_entry(*r), ensure_ascii=False)
+                for r in self.log.records(max(0, start), min(stop, self.count))]
+
+
+class SqliteLineSource:
+    def __init__(self, log):
+        self.log = log
+        self.count = 0
+        self.first_id = None
+        self.last_id = 0
+        self.generation = None
+        # Ids of a single-user log have no gaps, so row n is id first_id + n
+        self.dense = True
+
+    def __len__(self):
+        return self.count
+
+    def refresh(self):
+        generation = self.log.generation()
+        restarted = self.generation is not None and generation != self.generation
+        if restarted:
+            self.count, self.first_id, self.last_id, self.dense = 0, None, 0, True
+        self.generation = generation
+
+        added, last_id = self.log.count_after(self.last_id)
+        if added:
+            if self.first_id is None:
+                self.first_id = self.log.lines_after(0, 1)[0][0]
+                self.dense = last_id - self.first_id + 1 == added
+            else:
+                self.dense = self.dense and last_id - self.last_id == added
+            self.count += added
+            self.last_id = last_id
+        return restarted
+
+    def lines(self, start, stop):
+        start = max(0, start)
+        stop = min(stop, self.count)
+        if start >= stop:
+            return []
+        if self.dense:
+            rows = self.log.lines_after(self.first_id + start - 1, stop - start)
+        else:
+            rows = self.log.lines_at(start, stop - start)
+        return [line for _id, line in rows]
@@ -0,0 +1,280 @@
+"""Day-segmented intake log.
+
+Each day's entries live in their own `YYYY-MM-DD.jsonl` file (same line
+format as water_intake_log.txt) next to a small sidecar index
+`YYYY-MM-DD.idx.json` holding the record count, the byte offset of every
+record and the day's total. Range reads only open the segments they need
+and per-day totals come straight from the sidecars. Lines without a usable
+timestamp go to `undated.jsonl`, which open-ended reads and the log view
+list before the first day.
+"""
+import json
+import os
+import shutil
+from collections import OrderedDict
+from datetime import date
+
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".idx.json"
+UNDATED = "undated"  # pseudo-day of the segment without timestamps
+UNDATED_SEGMENT = UNDATED + SEGMENT_SUFFIX
+INDEX_CACHE_DAYS = 32  # sidecars kept in memory, most recently used first
+
+
+def entry_day(entry):
+    """Return the YYYY-MM-DD day of a log entry, or None if it has no usable timestamp."""
+    if not isinstance(entry, dict):
+        return None
+    ts = entry.get("timestamp")
+    if not isinstance(ts, str) or len(ts) < 10:
+        return None
+    try:
+        return date.fromisoformat(ts[:10]).isoformat()
+    except ValueError:
+        return None
+
+
+def _as_day(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    if value == UNDATED:
+        return value
+    return date.fromisoformat(value).isoformat()
+
+
+class SegmentedLog:
+    def __init__(self, directory, read_only=False):
+        """read_only: don't create the directory; stale sidecars are rebuilt in memory only."""
+        self.directory = directory
+        self.read_only = read_only
+        if not read_only:
+            os.makedirs(directory, exist_ok=True)
+        self._index_cache = OrderedDict()
+
+    # ---------- Paths ----------
+
+    def segment_path(self, day):
+        return os.path.join(self.directory, day + SEGMENT_SUFFIX)
+
+    def index_path(self, day):
+        return os.path.join(self.directory, day + INDEX_SUFFIX)
+
+    def days(self):
+        """All days that have a segment, oldest first."""
+        out = []
+        for name in os.listdir(self.directory):
+            if name.endswith(SEGMENT_SUFFIX) and name != UNDATED_SEGMENT:
+                out.append(name[:-len(SEGMENT_SUFFIX)])
+        out.sort()
+        return out
+
+    def segments(self):
+        """days(), preceded by UNDATED if there are lines without a usable timestamp."""
+        days = self.days()
+        if os.path.exists(self.segment_path(UNDATED)):
+            days.insert(0, UNDATED)
+        return days
+
+    def segment_sizes(self):
+        """{day: segment size in bytes} for every segment (UNDATED included), from one directory scan."""
+        sizes = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(SEGMENT_SUFFIX):
+                    sizes[entry.name[:-len(SEGMENT_SUFFIX)]] = entry.stat().st_size
+        return sizes
+
+    # ---------- Index ----------
+
+    def _build_index(self, day):
+        offsets = []
+        total = 0.0
+        pos = 0
+        path = self.segment_path(day)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for raw in f:
+                    if raw.strip():
+                        offsets.append(pos)
+                        try:
+                            entry = json.loads(raw)
+                        except json.JSONDecodeError:
+                            entry = None
+                        if isinstance(entry, dict) and entry.get("type") == "drink":
+                            total += float(entry.get("amount", 0))
+                    pos += len(raw)
+        return {"count": len(offsets), "size": pos, "offsets": offsets, "total": total}
+
+    def _write_index(self, day, index):
+        with open(self.index_path(day), "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        self._cache_index(day, index)
+
+    def _cache_index(self, day, index):
+        self._index_cache[day] = index
+        self._index_cache.move_to_end(day)
+        while len(self._index_cache) > INDEX_CACHE_DAYS:
+            self._index_cache.popitem(last=False)
+
+    def load_index(self, day):
+        """Return the sidecar index for a day, rebuilding it if missing or stale."""
+        day = _as_day(day)
+        seg = self.segment_path(day)
+        try:
+            size = os.path.getsize(seg)
+        except OSError:
+            return {"count": 0, "size": 0, "offsets": [], "total": 0.0}
+
+        index = self._index_cache.get(day)
+        if index is None:
+            try:
+                with open(self.index_path(day), "r", encoding="utf-8") as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = None
+
+        if index is None or index.get("size") != size:
+            index = self._build_index(day)
+            if not self.read_only:
+                self._write_index(day, index)
+        self._cache_index(day, index)
+        return index
+
+    def day_count(self, day):
+        return self.load_index(day)["count"]
+
+    # ---------- Writing ----------
+
+    def append(self, entry):
+        day = entry_day(entry)
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+
+        if day is None:
+            with open(os.path.join(self.directory, UNDATED_SEGMENT), "ab") as f:
+                f.write(line)
+            return
+
+        index = self.load_index(day)
+        with open(self.segment_path(day), "ab") as f:
+            f.write(line)
+
+        index["offsets"].append(index["size"])
+        index["count"] += 1
+        index["size"] += len(line)
+        if entry.get("type") == "drink":
+            index["total"] += float(entry.get("amount", 0))
+        self._write_index(day, index)
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(SEGMENT_SUFFIX) or name.endswith(INDEX_SUFFIX):
+                os.remove(os.path.join(self.directory, name))
+        self._index_cache.clear()
+
+    # ---------- Reading ----------
+
+    def _days_between(self, start, end):
+        days = self.days()
+        start = _as_day(start) if start is not None else None
+        end = _as_day(end) if end is not None else None
+        return [d for d in days if (start is None or d >= start) and (end is None or d <= end)]
+
+    def read_day_lines(self, day):
+        path = self.segment_path(_as_day(day))
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            return [line.rstrip("\n") for line in f if line.strip()]
+
+    def read_day_range(self, day, first, last):
+        """Raw lines of records [first, last) of a day, located via the sidecar offsets."""
+        day = _as_day(day)
+        offsets = self.load_index(day)["offsets"][first:last]
+        out = []
+        with open(self.segment_path(day), "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                out.append(f.readline().decode("utf-8", errors="replace").rstrip("\r\n"))
+        return out
+
+    def iter_range(self, start=None, end=None):
+        """Yield parsed entries for the inclusive day range (None = open-ended).
+
+        Without a start the undated entries come first, as in JsonlLog.
+        """
+        days = self._days_between(start, end)
+        if start is None and os.path.exists(self.segment_path(UNDATED)):
+            days.insert(0, UNDATED)
+        for day in days:
+            for line in self.read_day_lines(day):
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def daily_totals(self, start=None, end=None):
+        """{day: total liters} for the range, read from the sidecar indexes only."""
+        return {day: self.load_index(day)["total"] for day in self._days_between(start, end)}
+
+    def day_progress(self, day):
+        """(total litres, drink count, last drink timestamp or None); reads only that day."""
+        from .intake_log import day_progress_of
+        day = _as_day(day)
+        return day_progress_of(self.iter_range(day, day), day)
+
+    def line_source(self):
+        from .log_index import SegmentedLineSource
+        return SegmentedLineSource(self)
+
+
+def migrate_jsonl(src_path, log):
+    """One-shot import of a flat JSONL log into an empty SegmentedLog.
+
+    Lines are streamed into the segments of a scratch directory next to
+    the log, which replaces the log directory only once every segment and
+    sidecar is written. An interrupted migration therefore leaves the log
+    empty and is simply redone next time. Lines without a parseable
+    timestamp are kept in `undated.jsonl`. Returns the number of lines
+    imported.
+    """
+    if log.segments():
+        raise ValueError(f"{log.directory} already holds log segments")
+    scratch = log.directory.rstrip("\\/") + ".migrating"
+    if os.path.isdir(scratch):
+        shutil.rmtree(scratch)  # left over from an interrupted run
+    staged = SegmentedLog(scratch)
+
+    count = 0
+    day, out = False, None  # the log is chronological, so the open segment rarely changes
+    try:
+        with open(src_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                count += 1
+                try:
+                    line_day = entry_day(json.loads(line))
+                except json.JSONDecodeError:
+                    line_day = None
+                if line_day != day:
+                    if out is not None:
+                        out.close()
+                    day = line_day
+                    out = open(staged.segment_path(day or UNDATED), "a", encoding="utf-8")
+                out.write(line + "\n")
+    finally:
+        if out is not None:
+            out.close()
+
+    for day in staged.days():
+        staged.load_index(day)  # writes the sidecar
+    for name in os.listdir(scratch):
+        with open(os.path.join(scratch, name), "ab") as f:
+            os.fsync(f.fileno())
+
+    # Empty, or we'd have refused above; a crash after this just means an empty log again
+    os.rmdir(log.directory)
+    os.replace(scratch, log.directory)
+    log._index_cache.clear()
+    return count
@@ -0,0 +1,249 @@
+"""Background writer for the JSONL intake log.
+
+Appends are queued and written by one thread that keeps the file open,
+so callers (the Tk thread, bulk imports) never block on open/write/close.
+Whatever has queued up is written with a single write() call. The
+durability mode decides when the data is forced to disk:
+
+    "buffered"  write + flush to the OS, no fsync (the old behaviour)
+    "fsync"     every record is written and fsynced on its own
+    "group"     records reach the OS straight away; one fsync covers
+                everything written in the last `group_interval` seconds
+
+A failed write (disk full, ...) doesn't stop the thread: the part of the
+batch that reached the file is cut off again, and the error is raised
+from the next append() or wait_written() so the caller can report it.
+
+repair_torn_tail() fixes a half-written last line left by a crash.
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+from .metrics import metrics
+
+DURABILITY_MODES = ("buffered", "group", "fsync")
+SYNC_TIMEOUT = 5.0  # seconds the Tk thread waits for the writer at most
+
+_TRUNCATE = object()
+
+
+def repair_torn_tail(path):
+    """Make sure the log ends on a complete line.
+
+    A trailing fragment that is valid JSON just gets its newline; anything
+    else is cut off and saved next to the log as <path>.torn.
+    Returns True if something was repaired.
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return False
+    if size == 0:
+        return False
+
+    with open(path, "rb+") as f:
+        # Find the last newline, reading backwards in blocks
+        pos = size
+        cut = 0
+        while pos > 0:
+            step = min(4096, pos)
+            f.seek(pos - step)
+            block = f.read(step)
+            if pos == size and block.endswith(b"\n"):
+                return False
+            i = block.rfind(b"\n")
+            if i != -1:
+                cut = pos - step + i + 1
+                break
+            pos -= step
+
+        f.seek(cut)
+        fragment = f.read()
+        try:
+            json.loads(fragment)
+        except ValueError:
+            with open(path + ".torn", "ab") as torn:
+                torn.write(fragment + b"\n")
+            f.truncate(cut)
+        else:
+            f.seek(0, os.SEEK_END)
+            f.write(b"\n")
+    return True
+
+
+class LogWriter:
+    def __init__(self, path, durability="buffered", group_interval=0.2):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {DURABILITY_MODES}, not {durability!r}")
+        self.path = path
+        self.durability = durability
+        self.group_interval = group_interval
+        self._file = open(path, "ab")
+        self._cond = threading.Condition()
+        self._pending = []
+        self._enqueued = 0
+        self._written = 0
+        self._closed = False
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    # ---------- Caller side ----------
+
+    def append(self, entry):
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        self._submit(line)
+
+    def append_many(self, entries):
+        lines = [(json.dumps(e, ensure_ascii=False) + "\n").encode("utf-8") for e in entries]
+        with self._cond:
+            self._check_open()
+            self._raise_error()
+            self._pending.extend(lines)
+            self._enqueued += len(lines)
+            self._cond.notify_all()
+
+    def truncate(self):
+        """Empty the log, ordered after everything queued before it."""
+        self._submit(_TRUNCATE)
+        self.sync()
+
+    def wait_written(self, timeout=None):
+        """Block until everything queued so far has been handed to the OS.
+
+        Returns False on timeout. Raises the error of a failed write (once).
+        """
+        with self._cond:
+            target = self._enqueued
+            done = self._cond.wait_for(lambda: self._written >= target, timeout)
+            self._raise_error()
+            return done
+
+    def sync(self):
+        """wait_written() for readers on the Tk thread: gives up after SYNC_TIMEOUT."""
+        return self.wait_written(SYNC_TIMEOUT)
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _check_open(self):
+        if self._closed:
+            raise ValueError("log writer is closed")
+
+    def _raise_error(self):
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _submit(self, item):
+        with self._cond:
+            self._check_open()
+            self._raise_error()
+            self._pending.append(item)
+            self._enqueued += 1
+            self._cond.notify_all()
+
+    # ---------- Writer thread ----------
+
+    def _run(self):
+        f = self._file
+        group = self.durability == "group"
+        unsynced = False
+        last_sync = time.monotonic()
+
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    timeout = None
+                    if group and unsynced:
+                        timeout = last_sync + self.group_interval - time.monotonic()
+                        if timeout <= 0:
+                            break
+                    self._cond.wait(timeout)
+                batch = self._pending
+                self._pending = []
+                closing = self._closed
+
+            if batch:
+                size = None
+                try:
+                    if f is None:
+                        f = open(self.path, "ab")
+                    size = os.fstat(f.fileno()).st_size
+                    with metrics.timer("log_writer_batch"):
+                        self._write_batch(f, batch)
+                except Exception as e:
+                    f = self._failed(f, size, e, len(batch))
+                    unsynced = False
+                else:
+                    metrics.inc("log_records_written", len(batch))
+                    unsynced = self.durability == "group"
+                with self._cond:
+                    self._written += len(batch)
+                    self._cond.notify_all()
+
+            if unsynced and (closing or time.monotonic() - last_sync >= self.group_interval):
+                try:
+                    with metrics.timer("log_group_fsync"):
+                        os.fsync(f.fileno())
+                except OSError as e:
+                    f = self._failed(f, None, e, 0)
+                unsynced = False
+                last_sync = time.monotonic()
+
+            if closing:
+                with self._cond:
+                    if not self._pending:
+                        break
+
+        if f is not None:
+            f.close()
+
+    def _failed(self, f, size, error, lost):
+        """Record a write error; returns the file to go on with (None = reopen next time)."""
+        print(f"Writing {self.path} failed, {lost} record(s) not saved: {error}", file=sys.stderr)
+        metrics.inc("log_write_errors")
+        with self._cond:
+            self._error = error
+        if f is not None:
+            try:
+                f.close()  # drops whatever is still buffered
+            except OSError:
+                pass
+        if size is not None:
+            # Cut off the part of the batch that made it, so no half line is left
+            try:
+                if os.path.getsize(self.path) > size:
+                    os.truncate(self.path, size)
+            except OSError:
+                pass
+        return None
+
+    def _write_batch(self, f, batch):
+        per_record = self.durability == "fsync"
+        chunk = []
+        for item in batch:
+            if item is _TRUNCATE:
+                if chunk:
+                    f.write(b"".join(chunk))
+                    chunk = []
+                f.flush()
+                f.truncate(0)
+                continue
+            if per_record:
+                f.write(item)
+                f.flush()
+                os.fsync(f.fileno())
+            else:
+                chunk.append(item)
+        if chunk:
+            f.write(b"".join(chunk))
+        f.flush()
@@ -0,0 +1,208 @@
+"""Low-overhead instrumentation.
+
+A process-wide registry (`metrics`) of counters and timers that the hot
+paths report into: scheduler ticks, reminder dispatch, log writes and
+rendering, settings saves, and reminder jitter against the intended
+deadline. MetricsExporter writes a snapshot periodically as JSON, or as
+Prometheus text when the file name ends in .prom. ProfilerControl wraps
+an opt-in cProfile capture. process_activity() reads the process's CPU
+time and wakeups for the idle measurements.
+"""
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the timer histogram buckets
+BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class _Timer:
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._timers = {}
+        self.started = time.time()
+
+    def inc(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        """Record one duration (or any seconds value, e.g. jitter)."""
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = self._timers[name] = _Timer()
+            timer.observe(seconds)
+
+    @contextmanager
+    def timer(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+    # ---------- Export ----------
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "uptime_seconds": time.time() - self.started,
+                "counters": dict(self._counters),
+                "timers": {
+                    name: {
+                        "count": t.count,
+                        "sum": t.total,
+                        "max": t.max,
+                        "mean": t.total / t.count if t.count else 0.0,
+                        "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], t.buckets)),
+                    }
+                    for name, t in self._timers.items()
+                },
+            }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix="water_reminder_"):
+        snap = self.snapshot()
+        out = [f"{prefix}uptime_seconds {snap['uptime_seconds']:.3f}"]
+        for name, value in sorted(snap["counters"].items()):
+            out.append(f"# TYPE {prefix}{name}_total counter")
+            out.append(f"{prefix}{name}_total {value}")
+        for name, t in sorted(snap["timers"].items()):
+            metric = f"{prefix}{name}_seconds"
+            out.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in t["buckets"].items():
+                cumulative += count
+                out.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            out.append(f"{metric}_sum {t['sum']:.6f}")
+            out.append(f"{metric}_count {t['count']}")
+        return "\n".join(out) + "\n"
+
+
+metrics = Metrics()
+
+
+def process_activity():
+    """(CPU seconds, voluntary context switches or None) used by this process so far.
+
+    Voluntary context switches approximate wakeups: each one is the
+    process blocking and later being woken up again.
+    """
+    cpu = time.process_time()
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        return cpu, psutil.Process().num_ctx_switches().voluntary
+    try:
+        import resource
+    except ImportError:
+        return cpu, None
+    return cpu, resource.getrusage(resource.RUSAGE_SELF).ru_nvcsw
+
+
+class MetricsExporter:
+    """Writes the registry to `path` every `interval` seconds from a daemon thread."""
+
+    def __init__(self, path, interval=60.0, registry=metrics):
+        self.path = path
+        self.interval = interval
+        self.registry = registry
+        self._stop = threading.Event()
+        self._thread = None
+
+    def write(self):
+        if self.path.endswith(".prom"):
+            text = self.registry.to_prometheus()
+        else:
+            text = self.registry.to_json()
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, self.path)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="metrics-export", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError:
+                pass
+
+
+class ProfilerControl:
+    """Start/stop a cProfile capture of the calling (Tk) thread."""
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self._profile = None
+
+    @property
+    def running(self):
+        return self._profile is not None
+
+    def start(self):
+        if self._profile is None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self):
+        """Stop and dump the capture; returns the .prof path (None if not running)."""
+        if self._profile is None:
+            return None
+        self._profile.disable()
+        path = os.path.join(self.out_dir, time.strftime("profile-%Y%m%d-%H%M%S.prof"))
+        self._profile.dump_stats(path)
+        self._profile = None
+        return path
+
+    def toggle(self):
+        if self.running:
+            return self.stop()
+        self.start()
+        return None
@@ -0,0 +1,248 @@
+"""Reminder notification pipeline.
+
+    dispatcher.submit(key, title, message)
+        -> dedup by key within `dedup_window` seconds
+        -> per sink: token-bucket rate limit, bounded queue
+        -> one long-lived worker thread per sink calls sink.deliver()
+
+A scheduled reminder is submitted under a key derived from its deadline,
+so it reaches every sink exactly once however often it is submitted.
+The thread count is one per sink, whatever the reminder rate; a sink that
+falls behind drops notifications instead of blocking the caller.
+
+Sinks are plain objects with a `deliver(notification)` method: toast (or
+the console fallback) through the notifier backend, sound, console,
+webhook, and MemorySink for tests and benchmarks.
+"""
+import json
+import queue
+import sys
+import threading
+import time
+import urllib.request
+
+from .metrics import metrics
+
+DEFAULT_DEDUP_WINDOW = 60.0  # seconds
+DEFAULT_QUEUE_SIZE = 16
+
+
+class Notification:
+    __slots__ = ("key", "title", "message", "icon_path", "submitted")
+
+    def __init__(self, key, title, message, icon_path=None, submitted=None):
+        self.key = key
+        self.title = title
+        self.message = message
+        self.icon_path = icon_path
+        self.submitted = time.perf_counter() if submitted is None else submitted
+
+
+# ---------- Sinks ----------
+
+class NotifierSink:
+    """Desktop notification through a Backends notifier (toast or console)."""
+
+    name = "toast"
+
+    def __init__(self, get_notifier):
+        self._get_notifier = get_notifier
+
+    def deliver(self, notification):
+        with metrics.timer("toast_dispatch"):
+            self._get_notifier().notify(
+                notification.title, notification.message, icon_path=notification.icon_path
+            )
+
+
+class SoundSink:
+    """Plays the selected reminder sound through a SoundPlayer."""
+
+    name = "sound"
+
+    def __init__(self, player):
+        self.player = player
+
+    def deliver(self, notification):
+        self.player.play()
+
+
+class ConsoleSink:
+    name = "console"
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def deliver(self, notification):
+        stream = self.stream or sys.stdout
+        print(f"[{notification.title}] {notification.message}", file=stream, flush=True)
+
+
+class WebhookSink:
+    """POSTs each notification as JSON to `url`."""
+
+    name = "webhook"
+
+    def __init__(self, url, timeout=5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def deliver(self, notification):
+        body = json.dumps({
+            "key": notification.key,
+            "title": notification.title,
+            "message": notification.message,
+        }).encode("utf-8")
+        request = urllib.request.Request(
+            self.url, data=body, headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class MemorySink:
+    """Records deliveries in memory; `wait(count)` blocks until that many arrived."""
+
+    name = "memory"
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.delivered = []
+        self._cond = threading.Condition()
+
+    def deliver(self, notification):
+        if self.delay:
+            time.sleep(self.delay)
+        with self._cond:
+            self.delivered.append(notification)
+            self._cond.notify_all()
+
+    def wait(self, count, timeout=None):
+        with self._cond:
+            return self._cond.wait_for(lambda: len(self.delivered) >= count, timeout)
+
+
+# ---------- Dispatch ----------
+
+class RateLimit:
+    """Token bucket: `burst` deliveries at once, refilled at `per_minute`."""
+
+    def __init__(self, per_minute, burst=1, clock=time.monotonic):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.tokens = float(burst)
+        self.clock = clock
+        self.updated = clock()
+
+    def allow(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class _SinkWorker:
+    def __init__(self, sink, rate_limit, queue_size):
+        self.sink = sink
+        self.name = getattr(sink, "name", type(sink).__name__)
+        self.rate_limit = rate_limit
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+
+    def offer(self, notification):
+        if self.rate_limit is not None and not self.rate_limit.allow():
+            metrics.inc(f"notifications_rate_limited_{self.name}")
+            return False
+        if self.thread is None:
+            self.thread = threading.Thread(
+                target=self._run, name=f"notify-{self.name}", daemon=True
+            )
+            self.thread.start()
+        try:
+            self.queue.put_nowait(notification)
+        except queue.Full:
+            metrics.inc(f"notifications_dropped_{self.name}")
+            return False
+        return True
+
+    def _run(self):
+        while True:
+            notification = self.queue.get()
+            try:
+                if notification is None:
+                    return
+                try:
+                    self.sink.deliver(notification)
+                except Exception as e:
+                    metrics.inc(f"notifications_failed_{self.name}")
+                    print(f"Notification sink {self.name} failed: {e}", file=sys.stderr)
+                    continue
+                metrics.inc(f"notifications_delivered_{self.name}")
+                metrics.observe("notification_latency", time.perf_counter() - notification.submitted)
+            finally:
+                self.queue.task_done()
+
+    def close(self):
+        if self.thread is not None:
+            try:
+                self.queue.put_nowait(None)
+            except queue.Full:
+                pass  # stuck on a slow sink; the daemon thread ends with the process
+
+
+class NotificationDispatcher:
+    def __init__(self, dedup_window=DEFAULT_DEDUP_WINDOW, queue_size=DEFAULT_QUEUE_SIZE,
+                 clock=time.monotonic):
+        self.dedup_window = dedup_window
+        self.queue_size = queue_size
+        self.clock = clock
+        self._workers = []
+        self._seen = {}  # key -> clock() when it was last accepted
+        self._lock = threading.Lock()
+
+    @property
+    def sinks(self):
+        return [w.sink for w in self._workers]
+
+    def add_sink(self, sink, per_minute=None, burst=1):
+        """Register a sink; per_minute=None means no rate limit."""
+        rate_limit = None
+        if per_minute is not None:
+            rate_limit = RateLimit(per_minute, burst, clock=self.clock)
+        self._workers.append(_SinkWorker(sink, rate_limit, self.queue_size))
+        return sink
+
+    def submit(self, key, title, message, icon_path=None):
+        """Queue a notification for every sink. Never blocks.
+
+        Returns False when `key` was already accepted within the dedup window.
+        """
+        now = self.clock()
+        with self._lock:
+            last = self._seen.get(key)
+            if last is not None and now - last < self.dedup_window:
+                metrics.inc("notifications_deduplicated")
+                return False
+            self._seen[key] = now
+            if len(self._seen) > 256:
+                self._expire(now)
+
+            notification = Notification(key, title, message, icon_path)
+            for worker in self._workers:
+                worker.offer(notification)
+        return True
+
+    def _expire(self, now):
+        self._seen = {k: t for k, t in self._seen.items() if now - t < self.dedup_window}
+
+    def wait_idle(self):
+        """Block until every queued notification has been delivered (or failed)."""
+        for worker in self._workers:
+            worker.queue.join()
+
+    def close(self):
+        for worker in self._workers:
+            worker.close()
@@ -0,0 +1,168 @@
+"""Log retention: compaction into compressed archive segments.
+
+Raw drink events stay in the hot water_intake_log.txt for `keep_days`
+days. Older days are compacted into one per-day summary record
+
+    {"timestamp": "2026-03-14 00:00:00", "type": "day_summary", "amount": 2.25, "count": 9}
+
+(or kept raw with summarize=False) and appended to monthly archive
+segments archive/water_intake_YYYY-MM.jsonl.gz (or .zst with the
+optional zstandard module). iter_archive_lines() streams them back in
+order, so the log pane and analytics still see the whole history.
+
+Run it before the log is opened for writing; the hot file is replaced
+atomically. Compaction is idempotent: days that already have a summary in
+the archive, and raw lines already archived, are not written again, so a
+crash between the archive write and the hot-file replace does not
+double-count anything on the next run. (An entry arriving later for a day
+that is already summarized is dropped for the same reason.)
+"""
+import gzip
+import io
+import json
+import os
+import sys
+from datetime import date, timedelta
+
+ARCHIVE_PREFIX = "water_intake_"
+COMPRESSIONS = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def _open_archive_for_append(path):
+    if path.endswith(".zst"):
+        # Each run appends a new zstd frame; readers go across frames
+        return _zstd().ZstdCompressor().stream_writer(open(path, "ab"), closefd=True)
+    # Each run appends a new gzip member; gzip reads concatenated members
+    return gzip.open(path, "ab")
+
+
+def _open_archive_for_read(path):
+    if path.endswith(".zst"):
+        zstandard = _zstd()
+        if zstandard is None:
+            raise ImportError(f"reading {os.path.basename(path)} needs zstandard: pip install zstandard")
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True, closefd=True)
+        return io.TextIOWrapper(raw, encoding="utf-8")
+    return gzip.open(path, "rt", encoding="utf-8")
+
+
+def archive_segments(archive_dir):
+    """Archive files, oldest month first."""
+    if not os.path.isdir(archive_dir):
+        return []
+    names = [n for n in os.listdir(archive_dir)
+             if n.startswith(ARCHIVE_PREFIX) and n.endswith(tuple(COMPRESSIONS.values()))]
+    return [os.path.join(archive_dir, n) for n in sorted(names)]
+
+
+def iter_archive_lines(archive_dir):
+    """Stream every archived line, oldest first."""
+    for path in archive_segments(archive_dir):
+        with _open_archive_for_read(path) as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if line:
+                    yield line
+
+
+def _archived(archive_dir, month):
+    """(days with a day_summary, all lines) already in the archive for a month."""
+    days = set()
+    lines = set()
+    for path in archive_segments(archive_dir):
+        if not os.path.basename(path)[len(ARCHIVE_PREFIX):].startswith(month):
+            continue
+        with _open_archive_for_read(path) as f:
+            for line in f:
+                line = line.rstrip("\n")
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = None
+                if isinstance(entry, dict) and entry.get("type") == "day_summary":
+                    days.add(str(entry.get("timestamp", ""))[:10])
+                lines.add(line)
+    return days, lines
+
+
+def compact(log_path, archive_dir, keep_days, today=None, compression="gzip", summarize=True):
+    """Move days older than `keep_days` out of the hot log into archive segments.
+
+    Returns the number of hot-log lines that were archived.
+    """
+    if keep_days is None or keep_days <= 0 or not os.path.exists(log_path):
+        return 0
+    if compression == "zstd" and _zstd() is None:
+        print("zstandard is not installed; archiving with gzip", file=sys.stderr)
+        compression = "gzip"
+    suffix = COMPRESSIONS[compression]
+    cutoff = ((today or date.today()) - timedelta(days=keep_days - 1)).isoformat()
+
+    summaries = {}
+    raw_by_month = {}
+    moved = 0
+    tmp_path = log_path + ".compact"
+
+    with open(log_path, "r", encoding="utf-8") as src, open(tmp_path, "w", encoding="utf-8") as hot:
+        for line in src:
+            stripped = line.strip()
+            try:
+                entry = json.loads(stripped)
+                day = str(entry["timestamp"])[:10]
+                date.fromisoformat(day)
+            except (ValueError, TypeError, KeyError):
+                entry = None
+            if entry is None or day >= cutoff:
+                hot.write(line if line.endswith("\n") else line + "\n")
+                continue
+
+            moved += 1
+            if not summarize:
+                raw_by_month.setdefault(day[:7], []).append((entry["timestamp"], stripped))
+            elif entry.get("type") in ("drink", "day_summary"):
+                total, count = summaries.get(day, (0.0, 0))
+                summaries[day] = (
+                    total + float(entry.get("amount", 0)),
+                    count + int(entry.get("count", 1))
+                )
+            else:
+                # Not a drink: keep it verbatim next to the summaries
+                raw_by_month.setdefault(day[:7], []).append((entry["timestamp"], stripped))
+
+    if not moved:
+        os.remove(tmp_path)
+        return 0
+
+    by_month = raw_by_month
+    summary_lines = set()
+    for day in sorted(summaries):
+        total, count = summaries[day]
+        record = {"timestamp": f"{day} 00:00:00", "type": "day_summary",
+                  "amount": round(total, 6), "count": count}
+        line = json.dumps(record)
+        summary_lines.add(line)
+        by_month.setdefault(day[:7], []).append((record["timestamp"], line))
+
+    os.makedirs(archive_dir, exist_ok=True)
+    for month in sorted(by_month):
+        # Left over from an earlier run that stopped before replacing the hot file
+        done_days, done_lines = _archived(archive_dir, month)
+        lines = [line for ts, line in sorted(by_month[month], key=lambda item: item[0])
+                 if line not in done_lines and not (line in summary_lines and ts[:10] in done_days)]
+        if not lines:
+            continue
+        path = os.path.join(archive_dir, f"{ARCHIVE_PREFIX}{month}{suffix}")
+        with _open_archive_for_append(path) as f:
+            f.write(("\n".join(lines) + "\n").encode("utf-8"))
+
+    # Archives are written first, so a crash here leaves nothing lost; the next run skips what's archived
+    os.replace(tmp_path, log_path)
+    return moved
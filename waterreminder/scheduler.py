@@ -0,0 +1,164 @@
+"""Deadline-driven reminder scheduler.
+
+Pending reminders sit in a min-heap ordered by their wall-clock deadline.
+Nothing polls: the scheduler asks its host for a single timer that fires
+at the earliest deadline (`call_later`, e.g. Tk's `after`) or, headless,
+sleeps until then in `run_forever`. The clock is injectable so timing can
+be driven by tests and simulations without Tk.
+
+Host timers count elapsed time, deadlines are wall-clock. Whenever the
+timer fires, the wall clock is compared with a monotonic one to notice
+jumps (clock changes, sleep/resume), and the timer is simply re-armed
+against the current time; `max_timer` caps how long a single host timer
+may run, bounding how late a reminder can be after such a jump.
+"""
+import heapq
+import itertools
+import math
+import sys
+import time
+import traceback
+from datetime import datetime
+
+CLOCK_JUMP_SECONDS = 2.0
+
+
+class ReminderScheduler:
+    def __init__(self, clock=datetime.now, call_later=None, cancel_call=None,
+                 max_timer=None, on_clock_jump=None):
+        """
+        clock:         returns the current datetime.
+        call_later:    call_later(seconds, fn) -> token, arms a host timer.
+        cancel_call:   cancel_call(token), disarms it.
+        max_timer:     longest single host timer in seconds (None: up to the deadline).
+        on_clock_jump: on_clock_jump(seconds) when the wall clock moved that
+                       much more (or less) than elapsed time between timer wakeups.
+        Without call_later the owner drives the scheduler via run_due().
+        """
+        self.clock = clock
+        self._call_later = call_later
+        self._cancel_call = cancel_call
+        self.max_timer = max_timer
+        self.on_clock_jump = on_clock_jump
+        self.wakeups = 0
+        self._armed_at = None
+        self._heap = []
+        self._seq = itertools.count()
+        self._live = {}
+        self._timer = None
+        self._timer_deadline = None
+        self._running = False
+
+    # ---------- Jobs ----------
+
+    def schedule(self, key, deadline, callback):
+        """(Re)schedule job `key`; callback(deadline) runs once it is due."""
+        self.cancel(key, rearm=False)
+        entry = [deadline, next(self._seq), key, callback]
+        self._live[key] = entry
+        heapq.heappush(self._heap, entry)
+        self._arm()
+
+    def cancel(self, key, rearm=True):
+        entry = self._live.pop(key, None)
+        if entry is not None:
+            entry[3] = None  # dropped lazily when it reaches the top of the heap
+            if rearm:
+                self._arm()
+
+    def deadline(self, key):
+        entry = self._live.get(key)
+        return entry[0] if entry else None
+
+    def next_deadline(self):
+        heap = self._heap
+        while heap and heap[0][3] is None:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def seconds_until_next(self):
+        deadline = self.next_deadline()
+        if deadline is None:
+            return None
+        return max(0.0, (deadline - self.clock()).total_seconds())
+
+    # ---------- Running ----------
+
+    def run_due(self):
+        """Fire every job whose deadline has passed. Returns how many ran."""
+        now = self.clock()
+        fired = 0
+        # Callbacks usually reschedule themselves; arm the host timer once at the end
+        self._running = True
+        try:
+            while True:
+                deadline = self.next_deadline()
+                if deadline is None or deadline > now:
+                    break
+                _deadline, _seq, key, callback = heapq.heappop(self._heap)
+                del self._live[key]
+                fired += 1
+                # One failing job must not stop the others (or the timer)
+                try:
+                    callback(deadline)
+                except Exception:
+                    print(f"Reminder job {key!r} failed:", file=sys.stderr)
+                    traceback.print_exc()
+        finally:
+            self._running = False
+            self._arm()
+        return fired
+
+    def _arm(self):
+        if self._call_later is None or self._running:
+            return
+        deadline = self.next_deadline()
+        if self._timer is not None:
+            if deadline == self._timer_deadline:
+                return
+            self._cancel_call(self._timer)
+            self._timer = None
+        self._timer_deadline = deadline
+        if deadline is not None:
+            now = self.clock()
+            delay = max(0.0, (deadline - now).total_seconds())
+            if self.max_timer is not None:
+                delay = min(delay, self.max_timer)
+            self._armed_at = (now, time.monotonic())
+            self._timer = self._call_later(delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._timer_deadline = None
+        self.wakeups += 1
+        if self._armed_at is not None:
+            wall, mono = self._armed_at
+            jump = (self.clock() - wall).total_seconds() - (time.monotonic() - mono)
+            if abs(jump) > CLOCK_JUMP_SECONDS and self.on_clock_jump is not None:
+                self.on_clock_jump(jump)
+        # Early (clock set back) or capped wakeups fire nothing and just re-arm
+        self.run_due()
+
+    def resync(self):
+        """Re-arm the host timer against the current clock, firing anything overdue."""
+        if self._timer is not None:
+            self._cancel_call(self._timer)
+            self._timer = None
+            self._timer_deadline = None
+        self.run_due()
+
+    def run_forever(self, sleep=time.sleep, should_stop=lambda: False):
+        """Headless loop: sleep until the next deadline, fire, repeat."""
+        while not should_stop():
+            self.run_due()
+            delay = self.seconds_until_next()
+            if delay is None:
+                break
+            sleep(delay)
+
+
+def tk_timer(widget):
+    """call_later / cancel_call pair backed by a Tk widget's after()."""
+    def call_later(seconds, fn):
+        return widget.after(max(1, math.ceil(seconds * 1000)), fn)
+    return call_later, widget.after_cancel
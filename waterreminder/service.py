@@ -0,0 +1,317 @@
+"""Headless multi-user reminder service.
+
+One asyncio event loop holds the schedules, settings and intake logs of
+many users and fires every reminder from a single deadline heap (the same
+ReminderScheduler the desktop app uses, armed with loop.call_later).
+A small local HTTP API, on TCP or a Unix socket, logs drinks and reports
+progress:
+
+    GET  /users                      -> list of user ids
+    PUT  /users/<id>/settings        body: settings JSON (partial is fine)
+    POST /users/<id>/drink           body: {"amount": 0.25} (optional)
+    GET  /users/<id>/progress        -> today's total, goal, next reminder
+
+    python -m waterreminder.service --data-dir ./service-data --port 8765
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+
+from .intake_log import close_log_store, open_log_store
+from .scheduler import ReminderScheduler
+from .settings import load_value, validate, write_settings_file
+from .timetable import Timetable, windows_from_settings
+
+SERVICE_DEFAULTS = {
+    "start_time": "08:00",
+    "end_time": "20:00",
+    "interval": 60,
+    "daily_goal": 2.0,
+    "reminder_amount": 0.25,
+    "reminder_windows": [],
+    "log_storage": "jsonl"
+}
+
+USER_ID_RE = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+
+class UserState:
+    __slots__ = ("user_id", "settings", "timetable", "last_drink_time",
+                 "total_day", "total_today", "next_reminder_time", "fire", "_store")
+
+    def __init__(self, user_id, settings, timetable):
+        self.user_id = user_id
+        self.settings = settings
+        self.timetable = timetable
+        self.last_drink_time = None
+        self.total_day = None
+        self.total_today = 0.0
+        self.next_reminder_time = None
+        self.fire = None
+        self._store = None
+
+
+class ReminderService:
+    def __init__(self, data_dir=None, notify=None, clock=datetime.now, loop=None):
+        """
+        data_dir: where per-user settings and logs live (None = in memory only).
+        notify:   notify(user_id, deadline) called for every reminder fired.
+        """
+        self.data_dir = data_dir
+        self.notify = notify
+        self.clock = clock
+        self.users = {}
+        self.reminders_sent = 0
+        # Users with the same schedule share one expanded timetable
+        self._timetables = {}
+        self.loop = loop or asyncio.get_running_loop()
+        self.scheduler = ReminderScheduler(
+            clock=clock,
+            call_later=self.loop.call_later,
+            cancel_call=lambda handle: handle.cancel()
+        )
+
+    # ---------- Users ----------
+
+    def _user_dir(self, user_id):
+        return os.path.join(self.data_dir, "users", user_id)
+
+    def _timetable_for(self, settings):
+        key = (tuple(windows_from_settings(settings)), max(1, int(settings["interval"])))
+        timetable = self._timetables.get(key)
+        if timetable is None:
+            timetable = Timetable(key[0], timedelta(minutes=key[1]))
+            self._timetables[key] = timetable
+        return timetable
+
+    def load_users(self):
+        """Load every user saved under data_dir and schedule their reminders."""
+        users_root = os.path.join(self.data_dir, "users")
+        if not os.path.isdir(users_root):
+            return
+        for user_id in sorted(os.listdir(users_root)):
+            path = os.path.join(users_root, user_id, "settings.json")
+            if USER_ID_RE.match(user_id) and os.path.exists(path):
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        user = self.set_user(user_id, json.load(f), persist=False)
+                except ValueError as e:
+                    print(f"Skipping user {user_id!r}: {e}", file=sys.stderr)
+                    continue
+                self._restore_progress(user)
+
+    def _restore_progress(self, user):
+        """Pick up today's total and last drink from the user's log after a restart."""
+        store = self._store_for(user)
+        if store is None:
+            return
+        today = self.clock().date()
+        total, _count, last_drink = store.day_progress(today.isoformat())
+        user.total_day = today
+        user.total_today = total
+        if last_drink:
+            user.last_drink_time = datetime.fromisoformat(last_drink)
+            self._schedule(user)
+
+    def set_user(self, user_id, settings=None, persist=True):
+        if not USER_ID_RE.match(user_id):
+            raise ValueError(f"invalid user id {user_id!r}")
+        user = self.users.get(user_id)
+        merged = dict(user.settings if user else SERVICE_DEFAULTS)
+        # Nothing is applied or saved unless every value is valid
+        merged.update(validate(settings or {}))
+        timetable = self._timetable_for(merged)
+
+        if user is None:
+            user = UserState(user_id, merged, timetable)
+            user.last_drink_time = self.clock()
+            user.fire = self._make_fire(user)
+            self.users[user_id] = user
+        else:
+            if merged["log_storage"] != user.settings["log_storage"]:
+                self._close_store(user)  # reopened with the new storage on next use
+            user.settings = merged
+            user.timetable = timetable
+
+        if persist and self.data_dir:
+            os.makedirs(self._user_dir(user_id), exist_ok=True)
+            write_settings_file(os.path.join(self._user_dir(user_id), "settings.json"), merged)
+
+        self._schedule(user)
+        return user
+
+    def remove_user(self, user_id):
+        user = self.users.pop(user_id, None)
+        self.scheduler.cancel(user_id)
+        if user is not None:
+            self._close_store(user)
+
+    def _store_for(self, user):
+        if user._store is None and self.data_dir:
+            os.makedirs(self._user_dir(user.user_id), exist_ok=True)
+            user._store = open_log_store(user.settings["log_storage"], self._user_dir(user.user_id))
+        return user._store
+
+    def _close_store(self, user):
+        if user._store is not None:
+            close_log_store(user._store)
+            user._store = None
+
+    # ---------- Reminders ----------
+
+    def _schedule(self, user):
+        interval = timedelta(minutes=max(1, int(user.settings["interval"])))
+        user.next_reminder_time = user.timetable.next_reminder(user.last_drink_time + interval)
+        if user.next_reminder_time is None:
+            self.scheduler.cancel(user.user_id)
+        else:
+            self.scheduler.schedule(user.user_id, user.next_reminder_time, user.fire)
+
+    def _make_fire(self, user):
+        def fire(deadline):
+            self.reminders_sent += 1
+            if self.notify is not None:
+                self.notify(user.user_id, deadline)
+            user.last_drink_time = self.clock()
+            self._schedule(user)
+        return fire
+
+    # ---------- Drinks / progress ----------
+
+    def _roll_day(self, user, now):
+        if user.total_day != now.date():
+            user.total_day = now.date()
+            user.total_today = 0.0
+
+    def log_drink(self, user_id, amount=None):
+        user = self.users[user_id]
+        now = self.clock()
+        if amount is None:
+            amount = user.settings["reminder_amount"]
+        else:
+            amount = load_value("reminder_amount", amount)[1]
+            if amount <= 0:
+                raise ValueError(f"amount must be positive, not {amount}")
+
+        # Logged first, so a failed write never leaves the total ahead of the log
+        store = self._store_for(user)
+        if store is not None:
+            store.append({
+                "timestamp": now.strftime("%Y-%m-%d %H:%M:%S"),
+                "type": "drink",
+                "amount": amount
+            })
+        self._roll_day(user, now)
+        user.total_today += amount
+
+        user.last_drink_time = now
+        self._schedule(user)
+        return self.progress(user_id)
+
+    def progress(self, user_id):
+        user = self.users[user_id]
+        self._roll_day(user, self.clock())
+        goal = float(user.settings["daily_goal"])
+        return {
+            "user": user_id,
+            "total": user.total_today,
+            "daily_goal": goal,
+            "remaining": goal - user.total_today,
+            "next_reminder": user.next_reminder_time.strftime("%Y-%m-%d %H:%M:%S")
+            if user.next_reminder_time else None
+        }
+
+    # ---------- HTTP API ----------
+
+    def handle_request(self, method, path, body):
+        """Route one API call; returns (status, payload)."""
+        parts = [p for p in path.split("?")[0].split("/") if p]
+        try:
+            payload = json.loads(body) if body else {}
+        except json.JSONDecodeError:
+            return 400, {"error": "body is not valid JSON"}
+        if not isinstance(payload, dict):
+            return 400, {"error": "body must be a JSON object"}
+
+        try:
+            if parts == ["users"] and method == "GET":
+                return 200, sorted(self.users)
+            if len(parts) == 3 and parts[0] == "users":
+                user_id, action = parts[1], parts[2]
+                if action == "settings" and method == "PUT":
+                    return 200, self.set_user(user_id, payload).settings
+                if user_id not in self.users:
+                    return 404, {"error": f"unknown user {user_id!r}"}
+                if action == "drink" and method == "POST":
+                    return 200, self.log_drink(user_id, payload.get("amount"))
+                if action == "progress" and method == "GET":
+                    return 200, self.progress(user_id)
+        except (ValueError, TypeError, KeyError) as e:
+            return 400, {"error": str(e)}
+        return 404, {"error": "not found"}
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _sep, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", 0))
+            body = (await reader.readexactly(length)).decode("utf-8") if length else ""
+
+            if len(request_line) < 2:
+                status, payload = 400, {"error": "bad request"}
+            else:
+                status, payload = self.handle_request(request_line[0], request_line[1], body)
+
+            data = json.dumps(payload).encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + data
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, unix_socket=None):
+        if unix_socket:
+            server = await asyncio.start_unix_server(self._handle_connection, path=unix_socket)
+        else:
+            server = await asyncio.start_server(self._handle_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless multi-user Water Reminder service")
+    parser.add_argument("--data-dir", default="service-data")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", help="listen on a Unix socket instead of TCP")
+    args = parser.parse_args(argv)
+
+    async def run():
+        service = ReminderService(
+            args.data_dir,
+            notify=lambda user_id, deadline: print(f"{deadline:%H:%M:%S} reminder -> {user_id}"),
+            loop=asyncio.get_running_loop()
+        )
+        service.load_users()
+        await service.serve(args.host, args.port, args.unix_socket)
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
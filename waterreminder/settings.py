@@ -0,0 +1,269 @@
+"""User settings store.
+
+settings.json holds plain JSON values. SettingsStore validates each one
+against FIELDS when it is loaded or changed and keeps the parsed form
+next to it, so consumers never re-parse strings:
+
+    settings["start_time"]        -> "08:00"        (as saved, for entry widgets)
+    settings.value("start_time")  -> time(8, 0)
+
+update() applies a batch of changes all-or-nothing, tells subscribers
+which keys changed, and schedules a save. Saves are debounced (several
+changes within `save_delay` seconds become one write) and atomic: the
+file is written to a temp file and renamed over settings.json, so a crash
+never leaves it half written. flush() saves right away.
+"""
+import json
+import math
+import os
+import sys
+import threading
+
+from .intake_log import LOG_STORAGES
+from .log_writer import DURABILITY_MODES
+from .metrics import metrics
+from .retention import COMPRESSIONS
+from .timetable import parse_hhmm, parse_window
+
+DEFAULT_SAVE_DELAY = 0.5  # seconds
+
+
+def write_settings_file(path, settings):
+    """Write settings as JSON to `path` atomically (temp file + rename)."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(settings, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# ---------- Fields ----------
+
+class Field:
+    def __init__(self, parse, dump=None):
+        """parse: raw JSON value -> typed value (raises ValueError/TypeError);
+        dump: typed value -> JSON value to save (default: the typed value)."""
+        self.parse = parse
+        self.dump = dump
+
+    def load(self, raw):
+        """(JSON value to save, typed value) for a raw value."""
+        value = self.parse(raw)
+        return (value if self.dump is None else self.dump(value)), value
+
+
+def _number(kind, minimum=None, clamp=False):
+    def parse(raw):
+        if isinstance(raw, bool):
+            raise TypeError(f"expected a number, not {raw!r}")
+        value = kind(raw)
+        if not math.isfinite(value):
+            raise ValueError(f"must be a finite number, not {raw!r}")
+        if minimum is not None and value < minimum:
+            if not clamp:
+                raise ValueError(f"must be at least {minimum}, not {value}")
+            value = kind(minimum)
+        return value
+    return parse
+
+
+def _choice(options):
+    def parse(raw):
+        if raw not in options:
+            raise ValueError(f"must be one of {tuple(options)}, not {raw!r}")
+        return raw
+    return parse
+
+
+def _text(raw):
+    if not isinstance(raw, str):
+        raise TypeError(f"expected a string, not {raw!r}")
+    return raw
+
+
+def _optional_text(raw):
+    return None if raw is None else _text(raw)
+
+
+def _flag(raw):
+    if not isinstance(raw, bool):
+        raise TypeError(f"expected true or false, not {raw!r}")
+    return raw
+
+
+def _text_list(raw):
+    if not isinstance(raw, list):
+        raise TypeError(f"expected a list, not {raw!r}")
+    return [_text(item) for item in raw]
+
+
+def _format_hhmm(t):
+    return t.strftime("%H:%M")
+
+
+def _windows(raw):
+    if not isinstance(raw, list):
+        raise TypeError(f"expected a list, not {raw!r}")
+    return [parse_window(w) for w in raw]
+
+
+def _format_windows(windows):
+    return [f"{_format_hhmm(start)}-{_format_hhmm(end)}" for start, end in windows]
+
+
+_TIME = Field(parse_hhmm, _format_hhmm)
+
+FIELDS = {
+    "start_time": _TIME,
+    "end_time": _TIME,
+    "interval": Field(_number(int, 1, clamp=True)),  # minutes
+    "daily_goal": Field(_number(float, 0)),  # litres
+    "reminder_amount": Field(_number(float, 0)),  # litres
+    "start_with_windows": Field(_flag),
+    "sound_file": Field(_optional_text),
+    "default_language": Field(_text),
+    "log_storage": Field(_choice(LOG_STORAGES)),
+    "log_durability": Field(_choice(DURABILITY_MODES)),
+    "log_retention_days": Field(_number(int, 0)),
+    "log_archive_compression": Field(_choice(COMPRESSIONS)),
+    "metrics_file": Field(_text),
+    "metrics_interval": Field(_number(float, 1)),
+    "reminder_windows": Field(_windows, _format_windows),
+    "notification_sinks": Field(_text_list),
+    "notification_dedup_window": Field(_number(float, 0)),
+    "notification_webhook_url": Field(_text),
+}
+
+
+def load_value(key, raw, fields=FIELDS):
+    """(JSON value to save, typed value) for one setting; ValueError if it is invalid."""
+    field = fields.get(key)
+    if field is None:
+        return raw, raw  # unknown keys (newer versions, plugins) pass through
+    try:
+        return field.load(raw)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"setting {key!r}: {e}") from None
+
+
+def validate(changes, fields=FIELDS):
+    """{key: JSON value to save} for a dict of raw settings; ValueError on the first invalid one."""
+    if not isinstance(changes, dict):
+        raise ValueError("settings must be a JSON object")
+    return {key: load_value(key, raw, fields)[0] for key, raw in changes.items()}
+
+
+# ---------- Store ----------
+
+class SettingsStore:
+    def __init__(self, path, defaults, save_delay=DEFAULT_SAVE_DELAY, fields=FIELDS):
+        self.path = path
+        self.save_delay = save_delay
+        self.fields = fields
+        self._raw = {}
+        self._values = {}
+        self._subscribers = []  # [(callback, keys or None)]
+        self._lock = threading.RLock()
+        self._save_timer = None
+        self._dirty = False
+
+        for key, raw in defaults.items():
+            self._raw[key], self._values[key] = self._load(key, raw)
+        self._read_file()
+
+    def _read_file(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable settings file {self.path}: {e}", file=sys.stderr)
+            return
+        if not isinstance(saved, dict):
+            print(f"Ignoring settings file {self.path}: not a JSON object", file=sys.stderr)
+            return
+        for key, raw in saved.items():
+            try:
+                self._raw[key], self._values[key] = self._load(key, raw)
+            except ValueError as e:
+                # One bad value shouldn't cost the user all their other settings
+                print(f"Using the default for {e}", file=sys.stderr)
+
+    def _load(self, key, raw):
+        return load_value(key, raw, self.fields)
+
+    # ---------- Reading ----------
+
+    def __getitem__(self, key):
+        return self._raw[key]
+
+    def __contains__(self, key):
+        return key in self._raw
+
+    def get(self, key, default=None):
+        return self._raw.get(key, default)
+
+    def value(self, key):
+        """The parsed, typed value of `key` (e.g. a time for "start_time")."""
+        return self._values[key]
+
+    def as_dict(self):
+        with self._lock:
+            return dict(self._raw)
+
+    # ---------- Changing ----------
+
+    def update(self, changes=None, **kwargs):
+        """Validate and apply raw values; returns the set of keys that changed.
+
+        Raises ValueError naming the first invalid setting, in which case
+        nothing is changed.
+        """
+        changes = dict(changes or {}, **kwargs)
+        loaded = {key: self._load(key, raw) for key, raw in changes.items()}
+        with self._lock:
+            changed = {key for key, (raw, _value) in loaded.items() if self._raw.get(key) != raw}
+            for key in changed:
+                self._raw[key], self._values[key] = loaded[key]
+            if changed:
+                self._schedule_save()
+        if changed:
+            for callback, keys in list(self._subscribers):
+                if keys is None or keys & changed:
+                    callback(changed)
+        return changed
+
+    def __setitem__(self, key, raw):
+        self.update({key: raw})
+
+    def subscribe(self, callback, keys=None):
+        """Call callback(changed keys) after an update() touching any of `keys` (None = all)."""
+        entry = (callback, None if keys is None else frozenset(keys))
+        self._subscribers.append(entry)
+        return lambda: self._subscribers.remove(entry)
+
+    # ---------- Saving ----------
+
+    def _schedule_save(self):
+        self._dirty = True
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.save_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """Write pending changes now (no-op when there are none)."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            with metrics.timer("settings_save"):
+                write_settings_file(self.path, dict(self._raw))
+
+    def close(self):
+        self.flush()
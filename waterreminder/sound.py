@@ -0,0 +1,167 @@
+"""Reminder sound playback.
+
+One long-lived worker thread owns the audio backend and is fed through a
+queue, so a reminder never has to spawn a thread or touch the disk.
+Decoded sample buffers are kept in an LRU cache capped by size, and the
+selected sound is decoded ahead of time whenever the selection changes
+(or on warm(); the first play() decodes it otherwise).
+"""
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+from .metrics import metrics
+
+DEFAULT_SOUND = "cute-gugu-gaga.mp3"
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class SoundCache:
+    """LRU of decoded buffers keyed by path, validated against mtime/size."""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, path, stamp):
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        if entry[0] != stamp:
+            self.discard(path)
+            return None
+        self._entries.move_to_end(path)
+        return entry[1]
+
+    def peek(self, path):
+        """Cached handle without re-checking the file (None if not cached)."""
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        self._entries.move_to_end(path)
+        return entry[1]
+
+    def put(self, path, stamp, handle, nbytes):
+        self.discard(path)
+        if nbytes > self.max_bytes:
+            return  # too big to keep; it is played uncached
+        self._entries[path] = (stamp, handle, nbytes)
+        self.used_bytes += nbytes
+        while self.used_bytes > self.max_bytes:
+            _path, (_stamp, _handle, size) = self._entries.popitem(last=False)
+            self.used_bytes -= size
+
+    def discard(self, path):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self.used_bytes -= entry[2]
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class SoundPlayer:
+    def __init__(self, get_backend, sound_dir, preferred=None, max_cache_bytes=DEFAULT_CACHE_BYTES):
+        """get_backend: returns the sound backend; called from the worker only."""
+        self._get_backend = get_backend
+        self.sound_dir = sound_dir
+        self.cache = SoundCache(max_cache_bytes)
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+        self._candidates = []
+        # No decoding yet: importing the backend and decoding would slow down startup
+        self.select(preferred, warm=False)
+
+    # ---------- Tk-thread API ----------
+
+    def select(self, preferred, warm=True):
+        """Set the preferred sound (falling back to the bundled one) and pre-decode it."""
+        names = [preferred or DEFAULT_SOUND]
+        if DEFAULT_SOUND not in names:
+            names.append(DEFAULT_SOUND)
+        self._candidates = [os.path.join(self.sound_dir, n) for n in names]
+        if warm:
+            self.warm()
+
+    def warm(self):
+        """Decode the selected sound in the background so the next play() is instant."""
+        self._submit(("warm", list(self._candidates), time.perf_counter()))
+
+    def play(self):
+        self._submit(("play", list(self._candidates), time.perf_counter()))
+
+    def close(self):
+        if self._worker is not None:
+            self._queue.put(None)
+
+    # ---------- Worker ----------
+
+    def _submit(self, job):
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="audio", daemon=True)
+                self._worker.start()
+        self._queue.put(job)
+
+    def _run(self):
+        backend = None
+        resolved = None  # candidate that loaded on the last warm-up
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            kind, candidates, submitted = job
+            if backend is None:
+                backend = self._get_backend()
+
+            if kind == "play":
+                # Playing trusts the warm cache; files are re-checked on (re)select
+                handle = self.cache.peek(resolved) if resolved in candidates else None
+                if handle is not None:
+                    try:
+                        backend.play_decoded(handle)
+                        metrics.observe("sound_latency", time.perf_counter() - submitted)
+                        continue
+                    except Exception:
+                        self.cache.discard(resolved)
+
+            resolved = None
+            for path in candidates:
+                handle = self._load(backend, path)
+                if handle is None:
+                    continue
+                if kind == "play":
+                    try:
+                        backend.play_decoded(handle)
+                    except Exception:
+                        self.cache.discard(path)
+                        continue
+                    metrics.observe("sound_latency", time.perf_counter() - submitted)
+                resolved = path
+                break
+
+    def _load(self, backend, path):
+        stamp = _stamp(path)
+        if stamp is None:
+            self.cache.discard(path)
+            return None
+        handle = self.cache.get(path, stamp)
+        if handle is None:
+            try:
+                handle, nbytes = backend.decode(path)
+            except Exception:
+                return None
+            self.cache.put(path, stamp, handle, nbytes)
+        return handle
@@ -0,0 +1,253 @@
+"""SQLite intake log (WAL mode).
+
+One `events` table, indexed on (user, timestamp):
+
+    id         INTEGER PRIMARY KEY, insertion order
+    user       "local" for the desktop app
+    timestamp  "YYYY-MM-DD HH:MM:SS" ('' if the entry has none)
+    type       event type, e.g. "drink"
+    amount     litres (NULL if absent)
+    line       the entry exactly as it reads in water_intake_log.txt
+
+`line` keeps the store lossless and lets the log view show rows without
+re-serializing them; the other columns are what queries filter and sum on.
+WAL lets the service, exporters and the app read while one of them writes.
+
+Each append is committed on its own by default, so an acknowledged drink
+survives a crash or SIGTERM. With batch_size > 1 (bulk writers) appends
+are buffered and written in one transaction once `batch_size` entries
+are pending, before any read, and on close(); migrate_lines() inserts in
+large transactions of its own.
+A read-only store (read_only=True) opens the file with mode=ro and never
+creates, migrates or writes anything.
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, timedelta
+from urllib.request import pathname2url
+
+DEFAULT_USER = "local"
+DEFAULT_BATCH_SIZE = 1  # commit every append
+ITER_PAGE_SIZE = 10_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    user TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    type TEXT,
+    amount REAL,
+    line TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_user_timestamp ON events (user, timestamp);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('generation', 0);
+"""
+
+
+def _row_for(user, line):
+    """(user, timestamp, type, amount, line) for one raw JSONL line."""
+    try:
+        entry = json.loads(line)
+    except json.JSONDecodeError:
+        entry = None
+    if not isinstance(entry, dict):
+        return user, "", None, None, line
+    amount = entry.get("amount")
+    try:
+        amount = None if amount is None else float(amount)
+    except (TypeError, ValueError):
+        amount = None
+    return user, str(entry.get("timestamp", "")), entry.get("type"), amount, line
+
+
+def _day_bounds(start, end):
+    """Timestamp bounds [lo, hi) for an inclusive day range (None = open-ended)."""
+    lo = f"{start} 00:00:00" if start is not None else "0"
+    if end is None:
+        return lo, "9"
+    next_day = date.fromisoformat(str(end)) + timedelta(days=1)
+    return lo, f"{next_day} 00:00:00"
+
+
+class SqliteLog:
+    def __init__(self, path, user=DEFAULT_USER, batch_size=DEFAULT_BATCH_SIZE, read_only=False):
+        self.path = path
+        self.user = user
+        self.batch_size = batch_size
+        self._pending = []
+        self._lock = threading.RLock()
+        if read_only:
+            uri = "file:" + pathname2url(os.path.abspath(path)) + "?mode=ro"
+            self._db = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            return
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._db.close()
+
+    # ---------- Writing ----------
+
+    def append(self, entry):
+        self.append_line(json.dumps(entry, ensure_ascii=False))
+
+    def append_line(self, line):
+        with self._lock:
+            self._pending.append(_row_for(self.user, line))
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        with self._lock:
+            if self._pending:
+                rows, self._pending = self._pending, []
+                self._insert(rows)
+
+    def _insert(self, rows):
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO events (user, timestamp, type, amount, line) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def clear(self):
+        with self._lock:
+            self._pending = []
+            with self._db:
+                self._db.execute("DELETE FROM events WHERE user = ?", (self.user,))
+                self._db.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+
+    # ---------- Queries ----------
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            self.flush()
+            return self._db.execute(sql, params).fetchall()
+
+    def __len__(self):
+        return self._query("SELECT count(*) FROM events WHERE user = ?", (self.user,))[0][0]
+
+    def total_for_day(self, day):
+        lo, hi = _day_bounds(day, day)
+        return self._query(
+            "SELECT coalesce(sum(amount), 0) FROM events"
+            " WHERE user = ? AND timestamp >= ? AND timestamp < ? AND type IN ('drink', 'day_summary')",
+            (self.user, lo, hi)
+        )[0][0]
+
+    def day_progress(self, day):
+        """(total litres, drink count, last drink timestamp or None) for one day."""
+        lo, hi = _day_bounds(day, day)
+        total, count, last = self._query(
+            "SELECT coalesce(sum(amount), 0), count(*), max(timestamp) FROM events"
+            " WHERE user = ? AND timestamp >= ? AND timestamp < ? AND type = 'drink'",
+            (self.user, lo, hi)
+        )[0]
+        return total, count, last
+
+    def last_events(self, n):
+        """The newest n entries as dicts, oldest first."""
+        rows = self._query(
+            "SELECT line FROM events WHERE user = ? AND timestamp > ''"
+            " ORDER BY timestamp DESC, id DESC LIMIT ?",
+            (self.user, n)
+        )
+        return [json.loads(line) for (line,) in reversed(rows)]
+
+    def daily_totals(self, start=None, end=None):
+        lo, hi = _day_bounds(start, end)
+        rows = self._query(
+            "SELECT substr(timestamp, 1, 10), sum(amount) FROM events"
+            " WHERE user = ? AND timestamp >= ? AND timestamp < ? AND type IN ('drink', 'day_summary')"
+            " GROUP BY substr(timestamp, 1, 10)",
+            (self.user, lo, hi)
+        )
+        return dict(rows)
+
+    def iter_range(self, start=None, end=None, page_size=ITER_PAGE_SIZE):
+        """Entries of the inclusive day range, fetched `page_size` rows at a time."""
+        lo, hi = _day_bounds(start, end)
+        last_ts, last_id = lo, 0
+        while True:
+            rows = self._query(
+                "SELECT timestamp, id, line FROM events"
+                " WHERE user = ? AND timestamp >= ? AND timestamp < ? AND (timestamp, id) > (?, ?)"
+                " ORDER BY timestamp, id LIMIT ?",
+                (self.user, last_ts, hi, last_ts, last_id, page_size)
+            )
+            for _ts, _id, line in rows:
+                entry = json.loads(line)
+                if isinstance(entry, dict):
+                    yield entry
+            if len(rows) < page_size:
+                return
+            last_ts, last_id = rows[-1][0], rows[-1][1]
+
+    # ---------- Log view ----------
+
+    def generation(self):
+        """Bumped by every clear(), so readers can tell they have to start over."""
+        return self._query("SELECT value FROM meta WHERE key = 'generation'")[0][0]
+
+    def count_after(self, last_id):
+        """(number of rows with id > last_id, their max id)."""
+        return tuple(self._query(
+            "SELECT count(*), max(id) FROM events WHERE user = ? AND id > ?", (self.user, last_id)
+        )[0])
+
+    def lines_after(self, last_id, limit=-1):
+        """[(id, line)] in insertion order for ids > last_id."""
+        return self._query(
+            "SELECT id, line FROM events WHERE user = ? AND id > ? ORDER BY id LIMIT ?",
+            (self.user, last_id, limit)
+        )
+
+    def lines_at(self, offset, limit):
+        """[(id, line)] for rows offset..offset+limit in insertion order."""
+        return self._query(
+            "SELECT id, line FROM events WHERE user = ? ORDER BY id LIMIT ? OFFSET ?",
+            (self.user, limit, offset)
+        )
+
+    def line_source(self):
+        from .log_index import SqliteLineSource
+        return SqliteLineSource(self)
+
+
+# ---------- JSONL migration ----------
+
+def migrate_lines(lines, log, chunk_size=50_000):
+    """Import raw JSONL lines into a SqliteLog in large transactions.
+
+    Every non-blank line is kept verbatim. Returns the number imported.
+    """
+    log.flush()
+    count = 0
+    rows = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        rows.append(_row_for(log.user, line))
+        if len(rows) >= chunk_size:
+            log._insert(rows)
+            count += len(rows)
+            rows = []
+    if rows:
+        log._insert(rows)
+        count += len(rows)
+    return count
+
+
+def migrate_jsonl(src_path, log):
+    """One-shot import of a flat JSONL log into a SqliteLog."""
+    with open(src_path, "r", encoding="utf-8") as f:
+        return migrate_lines(f, log)
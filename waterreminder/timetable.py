@@ -0,0 +1,114 @@
+"""Daily reminder timetable.
+
+The active windows from the settings are expanded once (per settings
+change or date rollover) into sorted arrays of window bounds and reminder
+slots, so "is this time inside the schedule?" and "what is the next slot
+after t?" are binary searches instead of string parsing.
+
+A window whose end is earlier than its start runs overnight
+(22:00-06:00 = 22:00 today until 06:00 tomorrow); start == end means the
+whole day. Both ends are inclusive, like the original start/end check.
+"""
+import bisect
+from datetime import datetime, timedelta
+
+
+def parse_hhmm(text):
+    if not isinstance(text, str):
+        raise TypeError(f"expected an HH:MM string, not {text!r}")
+    return datetime.strptime(text.strip(), "%H:%M").time()
+
+
+def parse_window(window):
+    """Accept "HH:MM-HH:MM" or a [start, end] pair; return (time, time)."""
+    if isinstance(window, str):
+        start, sep, end = window.partition("-")
+        if not sep:
+            raise ValueError(f"reminder window {window!r} is not HH:MM-HH:MM")
+    else:
+        start, end = window
+    return parse_hhmm(start), parse_hhmm(end)
+
+
+def windows_from_settings(settings):
+    windows = settings.get("reminder_windows") or [[settings["start_time"], settings["end_time"]]]
+    return [parse_window(w) for w in windows]
+
+
+class Timetable:
+    def __init__(self, windows, interval):
+        """windows: list of (start time, end time); interval: timedelta between slots."""
+        self.windows = list(windows)
+        self.interval = interval
+        self.day = None
+        self.slots = []
+        self._starts = []
+        self._ends = []
+
+    # ---------- Building ----------
+
+    def build(self, day):
+        """Expand the windows for `day`.
+
+        Windows starting the day before (overnight spill-over) and the two
+        days after are included, so any query made during `day` finds its
+        next slot without a rebuild.
+        """
+        spans = []
+        for offset in range(-1, 3):
+            d = day + timedelta(days=offset)
+            for start, end in self.windows:
+                begin = datetime.combine(d, start)
+                finish = datetime.combine(d, end)
+                if finish <= begin:
+                    finish += timedelta(days=1)
+                    if end == start:
+                        finish -= timedelta(minutes=1)
+                spans.append((begin, finish))
+        spans.sort()
+
+        slots = set()
+        for begin, finish in spans:
+            t = begin
+            while t <= finish:
+                slots.add(t)
+                t += self.interval
+
+        # Merge overlapping windows for the "is active" lookup
+        merged = []
+        for begin, finish in spans:
+            if merged and begin <= merged[-1][1] + timedelta(minutes=1):
+                if finish > merged[-1][1]:
+                    merged[-1][1] = finish
+            else:
+                merged.append([begin, finish])
+
+        self.day = day
+        self.slots = sorted(slots)
+        self._starts = [m[0] for m in merged]
+        self._ends = [m[1] for m in merged]
+
+    def ensure(self, t):
+        """Rebuild if `t` falls on a different day than the one built."""
+        if self.day != t.date():
+            self.build(t.date())
+
+    # ---------- Queries ----------
+
+    def is_active(self, t):
+        self.ensure(t)
+        t = t.replace(second=0, microsecond=0)
+        i = bisect.bisect_right(self._starts, t) - 1
+        return i >= 0 and t <= self._ends[i]
+
+    def next_slot(self, t):
+        """First reminder slot strictly after `t`, or None if there are no windows."""
+        self.ensure(t)
+        i = bisect.bisect_right(self.slots, t)
+        return self.slots[i] if i < len(self.slots) else None
+
+    def next_reminder(self, deadline):
+        """Keep `deadline` if it is inside a window, otherwise defer to the next slot."""
+        if self.is_active(deadline):
+            return deadline
+        return self.next_slot(deadline)
@@ -0,0 +1,67 @@
+"""Thread-safe bridge from worker threads to the Tk thread.
+
+Tk may only be touched from the thread running its mainloop. Other
+threads (the tray icon, in particular) never call into Tk: they post
+commands to a queue, and the Tk thread drains it from an `after` timer.
+The timer only runs while the bridge is started, i.e. while another
+thread can actually post something (the tray icon is up).
+"""
+import queue
+
+
+class UiBridge:
+    def __init__(self, widget, poll_ms=100):
+        """widget: any Tk widget; its after() drives the drain."""
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self._queue = queue.SimpleQueue()
+        self._after_id = None
+        self.running = False
+
+    # ---------- Any thread ----------
+
+    def post(self, fn, *args):
+        self._queue.put((fn, args))
+
+    def command(self, fn):
+        """A callback for another thread that runs fn() on the Tk thread.
+
+        The (icon, item) signature is what pystray passes to menu actions.
+        """
+        def post_command(icon=None, item=None):
+            self.post(fn)
+        return post_command
+
+    # ---------- Tk thread ----------
+
+    def start(self):
+        self.running = True
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.poll_ms, self._poll)
+
+    def stop(self):
+        self.running = False
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def close(self):
+        self.stop()
+
+    def drain(self):
+        """Run every queued command; returns how many ran."""
+        ran = 0
+        while True:
+            try:
+                fn, args = self._queue.get_nowait()
+            except queue.Empty:
+                return ran
+            fn(*args)
+            ran += 1
+
+    def _poll(self):
+        self._after_id = None
+        self.drain()
+        # A drained command (e.g. showing the window) may have stopped us
+        if self.running and self._after_id is None:
+            self._after_id = self.widget.after(self.poll_ms, self._poll)
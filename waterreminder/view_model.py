@@ -0,0 +1,55 @@
+"""Dirty-flag view model for the Tk window.
+
+State changes only mark fields dirty. The first mark schedules a single
+flush on the next idle callback, and the flush re-renders the dirty
+fields and touches a widget only when its value actually changed. Any
+number of changes between two frames costs one pass.
+"""
+from .metrics import metrics
+
+
+class ViewModel:
+    def __init__(self, schedule_idle):
+        """schedule_idle(fn): run fn once the event loop is idle (Tk after_idle)."""
+        self._schedule_idle = schedule_idle
+        self._fields = {}
+        self._dirty = set()
+        self._applied = {}
+        self._pending = False
+        self.flushes = 0
+
+    def bind(self, name, widget, render, option="text"):
+        """Keep `widget[option]` equal to render()."""
+        def apply():
+            value = render()
+            if self._applied.get(name) != value:
+                widget.config(**{option: value})
+                self._applied[name] = value
+        self._fields[name] = apply
+        self._dirty.add(name)
+
+    def bind_action(self, name, action):
+        """Run action() on flush whenever `name` is dirty."""
+        self._fields[name] = action
+        self._dirty.add(name)
+
+    def invalidate(self, *names):
+        self._dirty.update(names)
+        if not self._pending:
+            self._pending = True
+            self._schedule_idle(self.flush)
+
+    def invalidate_all(self):
+        self.invalidate(*self._fields)
+
+    def flush(self):
+        self._pending = False
+        if not self._dirty:
+            return
+        dirty = self._dirty
+        self._dirty = set()
+        with metrics.timer("ui_flush"):
+            for name, apply in self._fields.items():
+                if name in dirty:
+                    apply()
+        self.flushes += 1